@@ -1,7 +1,24 @@
-import sys, time, random, constants, subprocess
+import sys, time, random, constants, signal, subprocess
 from pathlib import Path
 
+runner = None
+stopSignal = None
+
+
+# Docker sends SIGTERM to this process only, the running bot gets it too so it can save its checkpoint
+# The main loop exits once the bot has stopped
+def stop(signalNumber, frame):
+    global stopSignal
+    stopSignal = signalNumber
+    if runner is None:
+        sys.exit(128 + signalNumber)
+    runner.send_signal(signal.SIGTERM)
+
+
 def main(base_path):
+    global runner
+    signal.signal(signal.SIGTERM, stop)
+
     configs_path = Path(f"{base_path}/configs")
     config_files = sorted(configs_path.glob('*_config.py'))
 
@@ -10,8 +27,16 @@ def main(base_path):
         # Copy the current config file to config.py
         subprocess.run(["cp", "-f", str(config_file), f"{base_path}/config.py"], check=True)
 
-        # Run the LinkedIn Easy Apply bot
-        subprocess.run(["python", f"{base_path}/runner.py"], check=True)
+        # Run the LinkedIn Easy Apply bot, a run that stopped early continues from its checkpoint
+        for attempt in range(constants.runMaxRestarts + 1):
+            runner = subprocess.Popen(["python", f"{base_path}/runner.py"])
+            returnCode = runner.wait()
+            runner = None
+            if stopSignal is not None:
+                sys.exit(128 + stopSignal)
+            if returnCode == 0:
+                break
+            print(f"The run with {config_file.name} stopped early (exit code {returnCode}), attempt {attempt + 1} of {constants.runMaxRestarts + 1}.")
 
         # Wait for a specified number of seconds or implement a random wait time
         sleep_time = random.uniform(constants.botSleepInBetweenSearchesBottom, constants.botSleepInBetweenSearchesTop)
@@ -0,0 +1,34 @@
+# Measures how long the fuzzy matcher takes to resolve one question label against thousands of answer keys.
+# Run from the repository root: python -m benchmarks.fuzzyQuestionMatching
+import argparse
+import random
+import string
+import time
+
+from utils.fuzzyQuestionMatcher import FuzzyQuestionMatcher
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    arguments = parser.parse_args()
+
+    generator = random.Random(0)
+    keys = ["Python", "Desired salary", "Notice period"] + ["".join(generator.choice(string.ascii_lowercase + " ")
+        for _ in range(generator.randint(5, 40))) for _ in range(arguments.keys)]
+
+    start = time.perf_counter()
+    matcher = FuzzyQuestionMatcher(keys)
+    buildTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(arguments.lookups):
+        matcher.getBestMatch("How many years of work experience do you have with Python?", 0.7)
+    lookupTime = (time.perf_counter() - start) / arguments.lookups
+
+    print(f"{len(keys)} keys: built in {buildTime * 1000:.1f} ms, {lookupTime * 1000:.3f} ms per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Load test of the local reference backend: concurrent workers send the calls the bot makes for a search page
+# and the throughput and latency percentiles are compared with and without connection pooling.
+# Run from the repository root: python -m benchmarks.localBackendLoadTest
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import constants
+import local_backend.client as client
+import models
+import utils.jobPayload as jobPayload
+from local_backend.server import LocalBackendServer
+
+
+def searchPage(worker: int, page: int) -> list:
+    return [models.JobForVerification(linkedinJobId=f"{worker}-{page}-{index}", title=f"Engineer {index}", company=f"Company {index}", workplaceType="Remote")
+        for index in range(25)]
+
+
+def runWorker(worker: int, pages: int, latencies: list):
+    for page in range(pages):
+        jobs = searchPage(worker, page)
+        calls = [
+            lambda : client.verify_jobs(jobs),
+            lambda : client.update_jobs([jobPayload.encodeJob(models.Job(linkedin_job_id=job.linkedinJobId, title=job.title, company=job.company,
+                location="Berlin", description="Description " * 200, workplace_type=job.workplaceType, posted_date="2024-01-01",
+                applicants_at_time_of_applying="10"), compressAbove = constants.backendCompressDescriptionsAbove) for job in jobs]),
+            lambda : client.applied_to_jobs([job.linkedinJobId for job in jobs[0:5]]),
+            lambda : client.attached_resumes_to_jobs([(job.linkedinJobId, "resume.pdf") for job in jobs[0:5]]),
+        ]
+        for call in calls:
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+
+
+def measure(url: str, workers: int, pages: int, poolSize: int) -> dict:
+    client.configure(url, poolSize = poolSize)
+    latencies = []
+    threads = [threading.Thread(target=runWorker, args=(worker, pages, latencies)) for worker in range(workers)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "connections": client.getClient().connectionsOpened,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=20)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = LocalBackendServer("127.0.0.1", 0, os.path.join(directory, "backend.sqlite3"))
+        server.startInBackground()
+        try:
+            # A pool of size 0 closes every connection after its request, like a client without keep-alive
+            for name, poolSize in [("Without pooling", 0), ("With pooling", arguments.workers)]:
+                result = measure(server.getUrl(), arguments.workers, arguments.pages, poolSize)
+                print(f"{name}: {result['requests']} requests in {result['elapsed']:.2f} s " +
+                    f"({result['requests'] / result['elapsed']:.0f} requests/s), {result['connections']} connections, " +
+                    f"p50 {result['p50'] * 1000:.1f} ms, p99 {result['p99'] * 1000:.1f} ms")
+        finally:
+            client.getClient().close()
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
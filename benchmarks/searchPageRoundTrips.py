@@ -0,0 +1,50 @@
+# Compares the number of WebDriver round trips needed to read one search results page
+# with the per-element and the batched job card extraction (live and snapshot backends).
+# Run from the repository root: python -m benchmarks.searchPageRoundTrips
+import time
+
+import constants
+from linkedin import Linkedin
+from utils.driverCommandCounter import DriverCommandCounter
+from utils.jobDataExtractor import createJobDataExtractor
+
+
+def measure(processor: Linkedin, batched: bool, backend: str = "live"):
+    constants.batchedJobCardExtraction = batched
+    processor.driverHelper.extractor = createJobDataExtractor(processor.driver, backend)
+
+    with DriverCommandCounter(processor.driver) as counter:
+        start = time.perf_counter()
+        jobs = processor.getJobsForVerificationFromSearchPage()
+        elapsed = time.perf_counter() - start
+
+    return jobs, counter, elapsed
+
+
+def main():
+    processor = Linkedin()
+    processor.goToEasyApplyJobsSearchPage()
+    initialMode = constants.batchedJobCardExtraction
+    initialExtractor = processor.driverHelper.extractor
+
+    try:
+        perElementJobs, perElementCounter, perElementTime = measure(processor, batched = False)
+        batchedJobs, batchedCounter, batchedTime = measure(processor, batched = True)
+        snapshotJobs, snapshotCounter, snapshotTime = measure(processor, batched = True, backend = "snapshot")
+    finally:
+        constants.batchedJobCardExtraction = initialMode
+        processor.driverHelper.extractor = initialExtractor
+
+    print(f"Per-element extraction: {len(perElementJobs)} jobs, {perElementCounter.total()} round trips, {perElementTime:.2f} s")
+    print(f"    {dict(perElementCounter.commands)}")
+    print(f"Batched extraction:     {len(batchedJobs)} jobs, {batchedCounter.total()} round trips, {batchedTime:.2f} s")
+    print(f"    {dict(batchedCounter.commands)}")
+    print(f"Snapshot extraction:    {len(snapshotJobs)} jobs, {snapshotCounter.total()} round trips, {snapshotTime:.2f} s")
+    print(f"    {dict(snapshotCounter.commands)}")
+    print(f"Same jobs extracted: {perElementJobs == batchedJobs}, {perElementJobs == snapshotJobs}")
+
+    processor.driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -34,10 +34,17 @@ sort = ["Recent"]
 blacklistCompanies = ["Crossover", "Jobot", "EPAM Anywhere", "BairesDev"]
 #Blaclist keywords in title - ex:["manager", ".Net"]
 blackListTitles = []
+#Optional! Blacklist companies and titles matching regular expressions (case insensitive) - ex:[r"^senior\b", r"\(contract\)"]
+blacklistCompanyPatterns = []
+blackListTitlePatterns = []
 #Follow companies after sucessfull application True - yes, False - no
 followCompanies = False
 # One keyword which is unique to one of your CV's. This is used to select the correct CV. ex: ["Android"]
 distinctCVKeyword = ["Scientist"]
 
+# Save the answers you type in (ex: in the VNC image) or that Linkedin pre-fills, they are used for the same questions later
+# Reading the answers costs one more round trip per application step, so only turn it on when someone fills in the steps
+harvestAnswers = False
+
  # Testing & Debugging features
 displayWarnings = True
@@ -15,6 +15,12 @@ slow = 5
 botSleepInBetweenActionsBottom = 4
 botSleepInBetweenActionsTop = 12
 
+# Actions waiting for a page condition continue as soon as it is met, but not before the minimum pacing floor
+botMinimumPacingBottom = 1
+botMinimumPacingTop = 3
+botWaitForConditionTimeout = 15
+botConditionPollInterval = 0.25
+
 botSleepInBetweenBatchesBottom = 10
 botSleepInBetweenBatchesTop = 70
 batchSize = 10
@@ -24,6 +30,98 @@ botSleepInBetweenSearchesTop = 180
 
 numberOfDefaultPagesInApplication = 2
 
+# Logging - levels: "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR"
+consoleLogLevel = "INFO"
+fileLogLevel = "INFO"
+# Rotating JSONL log file, leave empty to log only to the console
+logFilePath = "data/logs/bot.jsonl"
+logFileMaxBytes = 5 * 1024 * 1024
+logFileBackupCount = 5
+# Share of messages of a type that are logged - ex: {"DEBUG": 0.1} keeps every 10th debug message
+logSampleRates = {}
+logMessageMaxLength = 1000
+logFieldMaxLength = 200
+
+# Local SQLite memory of seen jobs and their outcomes, leave empty to disable
+localStateStorePath = "data/jobs.sqlite3"
+# Jobs that already have one of these outcomes are not opened again - ex: ["applied", "blacklisted", "already_applied", "unanswered_questions"]
+# Jobs skipped for "unanswered_questions" are opened again once additionalQuestions.yaml (or the answer matching) changed
+skipJobsWithOutcomes = ["applied", "blacklisted", "already_applied", "unanswered_questions"]
+# Searches sorted by "Recent" remember the newest job they have seen and stop paging at the jobs seen in earlier runs
+incrementalSearches = True
+
+# Backend updates are sent in batches every backendBatchWindow seconds, at the end of a search page or when the batch is full
+backendBatchWindow = 10
+backendMaxBatchSize = 50
+# Seconds to wait before retrying a failed batch, doubled after every failure up to the maximum
+backendRetryBackoff = 2
+backendMaxRetryBackoff = 60
+# Seconds to wait for queued backend updates when the bot stops
+backendCloseTimeout = 30
+# Job descriptions larger than this many bytes are sent zlib compressed, 0 never compresses
+backendCompressDescriptionsAbove = 2048
+# Descriptions with the same content hash as the last one sent for the job are left out
+backendSkipUnchangedDescriptions = True
+# Backend updates are logged here before they are sent and replayed on the next start if they were not delivered
+backendOutboxPath = "data/backend_outbox.jsonl"
+# Updates the backend rejects (ex: HTTP 400) or that failed this many times while it was reachable are moved here
+backendDeadLetterPath = "data/backend_dead_letters.jsonl"
+backendMaxAttempts = 10
+# The reference backend in local_backend is used when no backend module can be imported and this url
+# (or the LOCAL_BACKEND_URL environment variable) is set, ex: "http://127.0.0.1:8765". Empty disables it.
+localBackendUrl = ""
+localBackendPoolSize = 4
+localBackendTimeout = 10
+
+# Answers to the application questions, compiled on the first question and cached until the file changes
+additionalQuestionsPath = "additionalQuestions.yaml"
+answerEngineCachePath = "data/additionalQuestions.cache"
+# Questions without any known keyword are answered by the closest keyword when it scores at least this much (0 to 1), 0 disables it
+fuzzyAnswerThreshold = 0.7
+# Keywords only used when no other keyword matches the question, ex: the default for skills that are not listed
+fallbackAnswerKeywords = ["Years of experience"]
+# Answers harvested from the application steps and the questions the bot could not answer, leave empty to disable
+answerStorePath = "data/answers.sqlite3"
+# Resolved answers of the application form steps seen before, keyed by the questions of the step, leave empty to not save them
+formCachePath = "data/form_cache.json"
+formCacheMaxEntries = 500
+# A step that still failed without an empty required question is skipped this many times, then it is filled in again
+formCacheUnknownFailureSkips = 5
+
+# Harvested jobs are applied to from the highest priority down, the priority adds up these weighted scores from 0 to 1:
+# recency halves every jobPriorityRecencyHalfLife hours since posting, applicants halves every jobPriorityApplicantsHalfLife
+# applicants, workplaceType comes from jobPriorityWorkplaceTypes and titleMatch is the share of the words of the best
+# matching config.jobTitles or config.keywords entry found in the title. A score that is not known counts as 0.5.
+# With every weight at 0 the jobs are applied to in the order the searches found them.
+jobPriorityWeights = {"recency": 0.4, "applicants": 0.3, "workplaceType": 0.1, "titleMatch": 0.2}
+jobPriorityRecencyHalfLife = 24
+jobPriorityApplicantsHalfLife = 50
+jobPriorityWorkplaceTypes = {"Remote": 1.0, "Hybrid": 0.6, "On-site": 0.3}
+
+# Where a run is, saved after every job so a restarted run continues from there, one file per config. Empty disables it.
+runCheckpointDirectory = "data/checkpoints"
+# allConfigsRunner restarts a config whose run stopped early this many times before moving on to the next config
+runMaxRestarts = 3
+# A job that was being processed when the run stopped is processed again first, until it was started this many times
+runMaxJobAttempts = 2
+# The queue of the run checkpoint is saved again after this many jobs, the jobs taken in between are saved after every job
+runCheckpointQueueInterval = 25
+
+# Results files are appended to and flushed to disk at most every this many seconds
+resultsFileSyncInterval = 5
+
+# Read and fill in all questions of an application step with two execute_script calls instead of querying every question
+batchedFormFilling = True
+# Give up on an application as soon as a step has required questions without an answer, instead of clicking through to the error
+# Not done with config.harvestAnswers, since the questions can still be answered by hand then
+abortOnUnansweredRequiredQuestions = True
+# Read all job cards of a search results page with one execute_script call instead of querying every card
+batchedJobCardExtraction = True
+# Read all properties of a job page with one execute_script call instead of one lookup per property
+batchedJobPageExtraction = True
+# Backend used by the batched extraction - ex: "live" (execute_script in the browser) or "snapshot" (lxml over page_source)
+extractionBackend = "live"
+
 
 # Webdriver Elements 
 jobsPageUrl = "https://www.linkedin.com/jobs"
@@ -37,6 +135,8 @@ resumeNameElementClassName = "jobs-document-upload-redesign-card__file-name"
 
 # CSS Selectors
 buttonDismissCSS = "button[aria-label='Dismiss']"
+# The "Discard" button of the dialog asking whether to save the application after dismissing it
+buttonDiscardApplicationCSS = "button[data-control-name='discard_application_confirm_btn'], button[data-test-dialog-secondary-btn]"
 buttonDocumentUploadCSS = "label.jobs-document-upload__upload-button"
 buttonEasyApplyCSS = "button[aria-label*='Easy Apply']"
 buttonNextPageCSS = "button[aria-label='Continue to next step']"
@@ -55,6 +155,8 @@ errorMessageForNecessaryFiledCSS = "div.artdeco-inline-feedback.artdeco-inline-f
 headerJobTitleCSS = "h1.t-24.t-bold.inline"
 
 followCheckboxCSS = "label[for='follow-company-checkbox']"
+# Set by the bot on the question groups of the application form to find them again
+formFieldIdAttribute = "data-easy-apply-bot-field"
 
 inputRadioCSS = "input[type='radio']"
 inputSingleLineTextCSS = "input.artdeco-text-input--input"
@@ -63,6 +165,7 @@ inputTextAreaCSS = "textarea"
 jobCardCompanyNameCSS = "div.artdeco-entity-lockup__subtitle span"
 jobCardContainerCSS = "li[data-occludable-job-id]"
 jobCardDescriptionCSS = "ul.job-card-container__metadata-wrapper"
+jobCardFooterItemCSS = "li.job-card-container__footer-item"
 jobCardIdAttribute = "data-occludable-job-id"
 
 jobCardTitleLinkCSS = "a.job-card-list__title--link"
@@ -73,9 +176,12 @@ jobCardTitleLinkCSS = "a.job-card-list__title--link"
 # jobCardTitleLabelCSS = "[aria-label*='job title']"
 
 labelQuestionCSS = "label.artdeco-text-input--label"
+legendQuestionCSS = "legend"
 
 profilePhotoCSS = "img.global-nav__me-photo.evi-image.ember-view"
 
+selectDropdownCSS = "select"
+
 spanCSS = "span"
 
 
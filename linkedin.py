@@ -1,5 +1,5 @@
+from dataclasses import asdict
 from typing import List, Optional
-import re
 
 from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
@@ -14,11 +14,17 @@ import config
 import constants
 import models
 import repository_wrapper
+import utils.blacklistMatcher as blacklistMatcher
+from utils.blacklistMatcher import BlacklistMatcher
+from utils.formFingerprintCache import getFormCache
 import utils.file as resultFileWriter
+import utils.jobPriority as jobPriority
+from utils.jobQueue import JobQueue
 import utils.linkedinUrlHelper as urlHelper
-from utils.linkedinWebDriverHelper import WebDriverHelper
+from utils.linkedinWebDriverHelper import PageConditions, WebDriverHelper
 import utils.logger as logger
 from utils.logger import MessageTypes
+from utils.runCheckpoint import APPLY_PHASE, HARVEST_PHASE, RunCheckpoint, RunCursor, getConfigHash
 import utils.sleeper as sleeper
 import utils.utils as utils
 
@@ -62,7 +68,9 @@ class Linkedin:
             try:    
                 sleeper.interact(lambda : self.driver.find_element(By.ID, constants.usernameID).send_keys(config.email))
                 sleeper.interact(lambda : self.driver.find_element(By.ID, constants.passwordID).send_keys(config.password))
-                sleeper.interact(lambda : self.driver.find_element(By.XPATH, constants.buttonSubmitLoginXPATH).click())
+                sleeper.interact(lambda : self.driver.find_element(By.XPATH, constants.buttonSubmitLoginXPATH).click(),
+                    self.driverHelper.getCondition(PageConditions.LOGGED_IN))
+                self.driverHelper.invalidateElementCache()
                 self.driverHelper.checkIfLoggedIn()
             except Exception as e:
                 logger.logDebugMessage("❌ Couldn't login to Linkedin by using Chrome. Please check your Linkedin credentials on config files line 7 and 8. If error continue you can define Chrome profile or run the bot on Firefox", MessageTypes.ERROR, e)
@@ -70,66 +78,217 @@ class Linkedin:
         repository_wrapper.init()
 
 
-    def startApplying(self):
+    # A run first harvests the jobs of every search into one queue, then applies to them, so a job returned by
+    # several overlapping searches is opened once. Returns whether the run went through all its searches and jobs.
+    # A run that stopped early, ex: on an exception or SIGTERM, continues from its checkpoint the next time.
+    def startApplying(self) -> bool:
+        isCompleted = False
+        checkpoint = RunCheckpoint(constants.runCheckpointDirectory, getConfigHash(config.__file__))
+        cursor = checkpoint.load()
+        if cursor is not None:
+            logger.logDebugMessage(f"Resuming the run in the {cursor.phase} phase", MessageTypes.INFO,
+                fields = {"search": cursor.searchIndex + 1, "page": cursor.page + 1})
+        else:
+            cursor = RunCursor()
+
         try:
-            jobCounter = models.JobCounter()
+            jobQueue = cursor.getJobQueue(jobPriority.getJobPriority)
 
-            urlData = urlHelper.generateSearchUrls()
+            if cursor.phase == HARVEST_PHASE:
+                self.harvestJobs(jobQueue, cursor, checkpoint)
+                cursor.phase = APPLY_PHASE
+                checkpoint.save(cursor)
 
-            for url in urlData:        
-                self.goToUrl(url)
+            jobCounter = self.applyToQueuedJobs(jobQueue, cursor, checkpoint)
 
-                urlWords = urlHelper.urlToKeywords(url)
-                
-                try:
-                    totalJobs = self.wait.until(EC.presence_of_element_located((By.XPATH, '//small'))).text # TODO - fix finding total jobs
-                    # totalJobs = self.driver.find_element(By.XPATH,'//small').text 
+            # Only searches whose jobs were all processed move their watermark
+            for searchUrl, newestJobId in cursor.searchWatermarks.items():
+                repository_wrapper.set_search_watermark(searchUrl, newestJobId)
 
-                    totalSearchResultPages = utils.jobsToPages(totalJobs)
+            logger.logDebugMessage(f"Applied to {jobCounter.applied} jobs out of {jobCounter.total}.", MessageTypes.SUCCESS)
+            isCompleted = True
+            checkpoint.clear()
 
-                    lineToWrite = "\n Search keyword: " + urlWords[0] + ", Location: " + urlWords[1] + ", Found " + str(totalJobs)
-                    resultFileWriter.displayWriteResults(lineToWrite)
+        except Exception as e:
+            logger.logDebugMessage("Unhandled exception in StartApplying", MessageTypes.ERROR, e, True)           
+            resultFileWriter.captureScreenshot(self.driver, "unhandeled_exception.png")
+            resultFileWriter.captureHtml(self.driver, "page_source_at_unhandled_exception.html")           
 
-                    for searchResultPage in range(totalSearchResultPages):
-                        currentSearchResultPageJobs = constants.jobsPerPage * searchResultPage
-                        url = url + "&start=" + str(currentSearchResultPageJobs)
-                        self.goToUrl(url)
+        finally:
+            # Also reached on SIGTERM (see runner.py), the last checkpoint is written before the process exits
+            if not isCompleted:
+                checkpoint.save(cursor)
+                logger.logDebugMessage(f"Run stopped in the {cursor.phase} phase, it continues from there on the next start", MessageTypes.WARNING,
+                    fields = {"search": cursor.searchIndex + 1, "page": cursor.page + 1, "queued_jobs": cursor.getQueuedJobCount()})
+            self.finishRun()
 
-                        jobsForVerification = self.getJobsForVerificationFromSearchPage()
-                        verifiedJobs = repository_wrapper.verify_jobs(jobsForVerification)
+        return isCompleted
 
-                        for job in verifiedJobs:
-                            jobCounter = self.processJob(jobID=job.linkedinJobId, jobCounter=jobCounter)
-                                    
-                except TimeoutException:
-                    logger.logDebugMessage("0 jobs found for: " + urlWords[0] + " in " + urlWords[1], MessageTypes.ERROR)
 
-                logger.logDebugMessage("Category: " + urlWords[0] + " in " + urlWords[1]+ " applied: " + str(jobCounter.applied) +
-                    " jobs out of " + str(jobCounter.total) + ".", MessageTypes.SUCCESS)
+    # Queues the new jobs of every search, a job found by an earlier search is not queued again
+    def harvestJobs(self, jobQueue: JobQueue, cursor: RunCursor, checkpoint: RunCheckpoint):
+        urlData = urlHelper.generateSearchUrls()
 
-        except Exception as e:
-            logger.logDebugMessage("Unhandled exception in StartApplying", MessageTypes.ERROR, e, True)           
-            resultFileWriter.captureScreenshot(self.driver, "unhandeled_exception.png")
-            resultFileWriter.captureHtml(self.driver, "page_source_at_unhandled_exception.html")           
+        for searchIndex, url in enumerate(urlData):
+            if searchIndex < cursor.searchIndex:
+                continue
+            if searchIndex > cursor.searchIndex:
+                cursor.searchIndex, cursor.page, cursor.pageAttempts, cursor.newestJobId = searchIndex, 0, 0, None
+
+            # Like a job, a search result page the run stopped on every time is given up after a few attempts.
+            # The first page is opened with the search itself, so when it keeps failing the whole search is skipped.
+            if cursor.pageAttempts >= constants.runMaxJobAttempts:
+                logger.logDebugMessage(f"Skipping search result page {cursor.page + 1} of search {searchIndex + 1}, " +
+                    f"the run stopped on it {cursor.pageAttempts} times", MessageTypes.WARNING)
+                cursor.pageAttempts = 0
+                if cursor.page == 0:
+                    continue
+                cursor.page += 1
+            # Saved before the search is opened, so a stop from here on counts as an attempt at the page
+            cursor.pageAttempts += 1
+            checkpoint.save(cursor)
+
+            self.goToUrl(url, PageConditions.SEARCH_RESULTS_LOADED)
+
+            urlWords = urlHelper.urlToKeywords(url)
+            queuedJobs = len(jobQueue)
+            duplicates = jobQueue.duplicates
+            
+            try:
+                totalJobs = self.wait.until(EC.presence_of_element_located((By.XPATH, '//small'))).text # TODO - fix finding total jobs
+                # totalJobs = self.driver.find_element(By.XPATH,'//small').text 
+
+                totalSearchResultPages = utils.jobsToPages(totalJobs)
+
+                lineToWrite = "\n Search keyword: " + urlWords[0] + ", Location: " + urlWords[1] + ", Found " + str(totalJobs)
+                resultFileWriter.displayWriteResults(lineToWrite, {"keyword": urlWords[0], "location": urlWords[1], "found": totalJobs})
+
+                searchUrl = urlHelper.getCanonicalSearchUrl(url)
+                incrementalSearch = constants.incrementalSearches and urlHelper.isSortedByRecent(url)
+                watermark = repository_wrapper.get_search_watermark(searchUrl) if incrementalSearch else None
+
+                seenJobIds = set()
+                for searchResultPage in range(cursor.page, totalSearchResultPages):
+                    # The first page is the one already open
+                    if searchResultPage > 0:
+                        self.goToUrl(urlHelper.getSearchResultPageUrl(url, searchResultPage), PageConditions.SEARCH_RESULTS_LOADED)
+
+                    jobCards = self.getJobCardsFromSearchPage()
+                    newJobIds = {jobCard.linkedinJobId for jobCard in jobCards if jobCard.linkedinJobId} - seenJobIds
+                    # Past the last page LinkedIn shows no cards or the last page again
+                    if not newJobIds:
+                        logger.logDebugMessage(f"No new jobs on search result page {searchResultPage + 1}, moving on to the next search",
+                            MessageTypes.INFO)
+                        break
+                    seenJobIds.update(newJobIds)
+                    cursor.newestJobId = max(filter(None, [cursor.newestJobId] + [utils.jobIdToNumber(jobId) for jobId in newJobIds]), default = None)
+
+                    jobsForVerification = self.getJobsForVerificationFromSearchPage(jobCards)
+                    jobQueue.addAll(repository_wrapper.verify_jobs(jobsForVerification))
+
+                    # A restarted run continues with the next page, which is opened right away
+                    cursor.page, cursor.pageAttempts = searchResultPage + 1, 1
+                    cursor.setJobQueue(jobQueue)
+                    checkpoint.save(cursor)
+
+                    # The next pages only have jobs seen in earlier runs
+                    if watermark is not None and utils.reachedJobIdWatermark([jobCard.linkedinJobId for jobCard in jobCards], watermark):
+                        logger.logDebugMessage(f"Reached the jobs seen in earlier runs on search result page {searchResultPage + 1}",
+                            MessageTypes.INFO)
+                        break
+
+                if incrementalSearch and cursor.newestJobId is not None:
+                    cursor.searchWatermarks[searchUrl] = max(cursor.newestJobId, cursor.searchWatermarks.get(searchUrl, 0))
+                                
+            except TimeoutException:
+                logger.logDebugMessage("0 jobs found for: " + urlWords[0] + " in " + urlWords[1], MessageTypes.ERROR)
+
+            logger.logDebugMessage("Category: " + urlWords[0] + " in " + urlWords[1] + " queued: " + str(len(jobQueue) - queuedJobs) +
+                " jobs, " + str(jobQueue.duplicates - duplicates) + " found by an earlier search.", MessageTypes.SUCCESS)
+
+        cursor.searchIndex = len(urlData)
+
+
+    def applyToQueuedJobs(self, jobQueue: JobQueue, cursor: RunCursor, checkpoint: RunCheckpoint) -> models.JobCounter:
+        jobCounter = cursor.getJobCounter()
+        logger.logDebugMessage(f"Applying to {len(jobQueue)} queued jobs, the highest priority first", MessageTypes.INFO,
+            fields = {"duplicates_skipped": jobQueue.duplicates, "reprioritized": jobQueue.reprioritized})
+
+        # A job interrupted when the run stopped comes first: the watermarks already cover it, so the searches
+        # of the next runs would not find it again. A job that stops the run every time is given up after a few attempts.
+        interruptedJob = cursor.getCurrentJob()
+        while (job := interruptedJob or jobQueue.pop()) is not None:
+            isInterruptedJob = job is interruptedJob
+            attempts = cursor.getCurrentJobAttempts() + 1 if isInterruptedJob else 1
+            interruptedJob = None
+            if attempts > constants.runMaxJobAttempts:
+                logger.logDebugMessage(f"Giving up on job {job.linkedinJobId}, the run stopped on it {attempts - 1} times", MessageTypes.WARNING)
+                cursor.setCurrentJob(None)
+                continue
+
+            # Saved before the job is opened, so a stop during the job counts as an attempt
+            cursor.setCurrentJob(job, attempts)
+            if not isInterruptedJob:
+                cursor.takenJobIds.append(job.linkedinJobId)
+            if len(cursor.takenJobIds) >= constants.runCheckpointQueueInterval:
+                cursor.setJobQueue(jobQueue)
+            checkpoint.save(cursor)
+
+            jobCounter = self.processJob(jobID=job.linkedinJobId, jobCounter=jobCounter)
+
+            cursor.setCurrentJob(None)
+            cursor.setJobCounter(jobCounter)
+            checkpoint.save(cursor)
+
+            # The backend updates are sent in batches of a search page worth of jobs
+            if jobCounter.total % constants.jobsPerPage == 0:
+                repository_wrapper.flush()
+
+        return jobCounter
+
+
+    # Nothing will pause anymore, so the work queued for the pauses is done now
+    def finishRun(self):
+        sleeper.runPendingTasks()
+        repository_wrapper.close()
+        # Results are only appended to the structured file during the run
+        resultFileWriter.writeResultsTables()
+
+        pauseStats = sleeper.getPauseStats()
+        logger.logDebugMessage(f"Used {pauseStats['usedSeconds']:.0f}s of {pauseStats['pausedSeconds']:.0f}s paused " +
+            f"for {pauseStats['tasks']} background task(s)", MessageTypes.INFO)
+
+        elementCacheStats = self.driverHelper.getElementCacheStats()
+        logger.logDebugMessage(f"Element cache saved {elementCacheStats['hits']} round trips " +
+            f"({elementCacheStats['misses']} lookups, hit rate {elementCacheStats['hitRate']:.0%})", MessageTypes.INFO)
+
+        formCache = getFormCache()
+        formCache.save()
+        formCacheStats = formCache.getStats()
+        logger.logDebugMessage(f"Form cache: {formCacheStats['hits']} of {formCacheStats['hits'] + formCacheStats['misses']} form steps seen before " +
+            f"(hit rate {formCacheStats['hitRate']:.0%}, {formCacheStats['entries']} cached, {formCacheStats['evictions']} evicted)", MessageTypes.INFO)
 
 
     def goToJobsSearchPage(self):
         searchUrl = urlHelper.getGeneralSearchUrl()
-        self.goToUrl(searchUrl)
+        self.goToUrl(searchUrl, PageConditions.SEARCH_RESULTS_LOADED)
 
 
     def goToEasyApplyJobsSearchPage(self):
         searchUrl = urlHelper.getEasyApplySearchUrl()
-        self.goToUrl(searchUrl)
+        self.goToUrl(searchUrl, PageConditions.SEARCH_RESULTS_LOADED)
 
     
-    def goToUrl(self, url: str):
-        sleeper.interact(lambda : self.driver.get(url))
+    # Without a condition the bot sleeps for the whole pause in between actions after the page is requested
+    def goToUrl(self, url: str, condition: PageConditions = None):
+        self.driverHelper.invalidateElementCache()
+        waitCondition = self.driverHelper.getCondition(condition) if condition else None
+        sleeper.interact(lambda : self.driver.get(url), waitCondition)
         
 
     def goToJobPage(self, jobID: str):
         jobPage = 'https://www.linkedin.com/jobs/view/' + jobID
-        self.goToUrl(jobPage)
+        self.goToUrl(jobPage, PageConditions.JOB_DETAIL_LOADED)
         return jobPage
 
 
@@ -139,11 +298,11 @@ class Linkedin:
         sleeper.sleepInBetweenBatches(jobCounter.total)
 
         jobProperties = self.getJobPropertiesFromJobPage(jobID)
+        # Queued before the application, so the backend gets the job before it is marked as applied
         repository_wrapper.update_job(jobProperties)
         if self.isJobBlacklisted(company = jobProperties.company, title = jobProperties.title): 
             jobCounter.skipped_blacklisted += 1
-            lineToWrite = self.getLogTextForJobProperties(jobProperties, jobCounter) + " | " + "* 🤬 Blacklisted Job, skipped!: " + str(jobPage)
-            resultFileWriter.displayWriteResults(lineToWrite)
+            self.recordJobResult(jobPage, jobProperties, jobCounter, models.JobOutcome.SKIPPED_BLACKLISTED, "* 🤬 Blacklisted Job, skipped!: ")
             return jobCounter
 
         jobCounter = self.handleJobPost(
@@ -154,71 +313,116 @@ class Linkedin:
         return jobCounter
     
     
-    def getJobsForVerificationFromSearchPage(self) -> List[models.JobForVerification]:
-        jobsListItems = self.driverHelper.getJobsListFromSearchPage()
+    # jobCards are read from the current page when they were not read already
+    def getJobsForVerificationFromSearchPage(self, jobCards: List[models.JobCard] = None) -> List[models.JobForVerification]:
         jobsForVerification = []
+        if jobCards is None:
+            jobCards = self.getJobCardsFromSearchPage()
 
-        for jobItem in jobsListItems:
-            if self.driverHelper.exists(jobItem, By.XPATH, constants.appliedTextXPATH):
+        for jobCard in jobCards:
+            if jobCard.applied:
                 logger.logDebugMessage("Not adding a job as already applied", MessageTypes.INFO)
                 continue
 
-            jobTitle = self.getJobTitleFromJobCardInSearchResults(jobItem)
-            if not jobTitle:
+            if not jobCard.title:
                 logger.logDebugMessage("Could not extract job title from job card", MessageTypes.WARNING)
                 continue
 
-            if self.isTitleBlacklisted(jobTitle):
-                logger.logDebugMessage(f"Not adding job as title '{jobTitle}' is blacklisted", MessageTypes.INFO)
+            if self.isTitleBlacklisted(jobCard.title):
+                logger.logDebugMessage(lambda : f"Not adding job as title '{jobCard.title}' is blacklisted", MessageTypes.INFO)
                 continue
 
-            companyName = self.getCompanyNameFromJobCardInSearchResults(jobItem)
-            if not companyName:
+            if not jobCard.company:
                 logger.logDebugMessage("Could not extract company name from job card", MessageTypes.WARNING)
                 continue
 
-            if self.isCompanyBlacklisted(companyName):
-                logger.logDebugMessage(f"Not adding job as company '{companyName}' is blacklisted", MessageTypes.INFO)
+            if self.isCompanyBlacklisted(jobCard.company):
+                logger.logDebugMessage(lambda : f"Not adding job as company '{jobCard.company}' is blacklisted", MessageTypes.INFO)
                 continue
 
-            jobId = jobItem.get_attribute(constants.jobCardIdAttribute)
-            if not jobId:
+            if not jobCard.linkedinJobId:
                 logger.logDebugMessage("Could not extract job ID from job card", MessageTypes.WARNING)
                 continue
 
-            workPlaceType = self.getWorkplaceTypeFromJobCardInSearchResults(jobItem)
-
             jobsForVerification.append(models.JobForVerification(
-                linkedinJobId = jobId.split(":")[-1],
-                title = jobTitle,
-                company = companyName,
-                workplaceType = workPlaceType))
+                linkedinJobId = jobCard.linkedinJobId,
+                title = jobCard.title,
+                company = jobCard.company,
+                workplaceType = jobCard.workplaceType,
+                postedDate = jobCard.postedDate,
+                applicants = jobCard.applicants))
 
         return jobsForVerification
 
 
+    def getJobCardsFromSearchPage(self) -> List[models.JobCard]:
+        if constants.batchedJobCardExtraction:
+            rawJobCards = self.driverHelper.getRawJobCardsFromSearchPage()
+            return [self.getJobCardFromRawJobCard(rawJobCard) for rawJobCard in rawJobCards]
+
+        jobsListItems = self.driverHelper.getJobsListFromSearchPage()
+        return [self.getJobCardFromJobItem(jobItem) for jobItem in jobsListItems]
+
+
+    # Parses the result of the batched job cards script the same way as the per-element getters below
+    def getJobCardFromRawJobCard(self, rawJobCard: dict) -> models.JobCard:
+        jobId = rawJobCard.get("id")
+        title = rawJobCard.get("title")
+        company = rawJobCard.get("company")
+        workplaceType = rawJobCard.get("workplaceType")
+        footer = rawJobCard.get("footer") or []
+
+        return models.JobCard(
+            linkedinJobId = jobId.split(":")[-1] if jobId else None,
+            title = title.strip() if title is not None else None,
+            company = utils.getFirstStringBeforeSeparators(company) if company is not None else None,
+            workplaceType = self.verifyWorkPlaceType(utils.extractTextWithinParentheses(workplaceType)) if workplaceType is not None else "",
+            applied = bool(rawJobCard.get("applied")),
+            postedDate = utils.extractPostedDate(" · ".join(footer)),
+            applicants = utils.extractJobCardApplicants(footer))
+
+
+    def getJobCardFromJobItem(self, jobItem) -> models.JobCard:
+        if self.driverHelper.exists(jobItem, By.XPATH, constants.appliedTextXPATH):
+            return models.JobCard(applied = True)
+
+        jobId = jobItem.get_attribute(constants.jobCardIdAttribute)
+        footer = [footerItem.text for footerItem in self.driverHelper.findAll(jobItem, By.CSS_SELECTOR, constants.jobCardFooterItemCSS)]
+
+        return models.JobCard(
+            linkedinJobId = jobId.split(":")[-1] if jobId else None,
+            title = self.getJobTitleFromJobCardInSearchResults(jobItem),
+            company = self.getCompanyNameFromJobCardInSearchResults(jobItem),
+            workplaceType = self.getWorkplaceTypeFromJobCardInSearchResults(jobItem),
+            postedDate = utils.extractPostedDate(" · ".join(footer)),
+            applicants = utils.extractJobCardApplicants(footer))
+
+
     def getCompanyNameFromJobCardInSearchResults(self, jobItem) -> Optional[str]:
-        elements = jobItem.find_elements(By.CSS_SELECTOR, constants.jobCardCompanyNameCSS)
-        if elements and len(elements) > 0:
-            return utils.getFirstStringBeforeSeparators(elements[0].text)
+        element = self.driverHelper.find(jobItem, By.CSS_SELECTOR, constants.jobCardCompanyNameCSS)
+        if element is not None:
+            return utils.getFirstStringBeforeSeparators(element.text)
         
         return None
 
 
     def getJobTitleFromJobCardInSearchResults(self, jobItem) -> Optional[str]:
-        if (not self.driverHelper.exists(jobItem, By.CSS_SELECTOR, constants.jobCardTitleLinkCSS)):
+        element = self.driverHelper.find(jobItem, By.CSS_SELECTOR, constants.jobCardTitleLinkCSS)
+        if element is None:
             return None
         
-        element = jobItem.find_element(By.CSS_SELECTOR, constants.jobCardTitleLinkCSS)
         return element.get_attribute("aria-label").strip()
 
 
     def getWorkplaceTypeFromJobCardInSearchResults(self, jobItem) -> str:
-        if not self.driverHelper.exists(jobItem, By.CSS_SELECTOR, constants.jobCardDescriptionCSS):
+        jobCard = self.driverHelper.find(jobItem, By.CSS_SELECTOR, constants.jobCardDescriptionCSS)
+        if jobCard is None:
             return ""
         
-        jobCard = jobItem.find_element(By.CSS_SELECTOR, constants.jobCardDescriptionCSS)
-        descriptionSpan = jobCard.find_element(By.CSS_SELECTOR, constants.spanCSS)
+        descriptionSpan = self.driverHelper.find(jobCard, By.CSS_SELECTOR, constants.spanCSS)
+        if descriptionSpan is None:
+            return ""
+
         workplace_type = utils.extractTextWithinParentheses(descriptionSpan.text)
         return self.verifyWorkPlaceType(workplace_type)
 
@@ -230,13 +434,27 @@ class Linkedin:
             textToWrite = textToWrite + " | " + "blacklisted"
 
         return textToWrite
+
+
+    # Writes the result line and the same result as a structured record to the results files
+    # and remembers the outcome, so the job is not opened again in the next runs
+    def recordJobResult(self, jobPage, jobProperties: models.Job, jobCounter: models.JobCounter, outcome: models.JobOutcome, resultText: str,
+            details: dict = None):
+        lineToWrite = self.getLogTextForJobProperties(jobProperties, jobCounter) + " | " + resultText + str(jobPage)
+        record = asdict(jobProperties)
+        # The description is stored by the backend, it would only bloat the results file
+        del record["description"]
+        record.update({"number": jobCounter.total, "result": outcome.value, "link": str(jobPage)})
+        record.update(details or {})
+        resultFileWriter.displayWriteResults(lineToWrite, record)
+
+        repository_wrapper.record_job_outcome(jobProperties, outcome)
         
 
     def handleJobPost(self, jobPage, jobProperties: models.Job, jobCounter: models.JobCounter):
         if not self.driverHelper.isEasyApplyButtonDisplayed():
             jobCounter.skipped_already_applied += 1
-            lineToWrite = self.getLogTextForJobProperties(jobProperties, jobCounter) + " | " + "* 🥳 Already applied! Job: " + str(jobPage)
-            resultFileWriter.displayWriteResults(lineToWrite)
+            self.recordJobResult(jobPage, jobProperties, jobCounter, models.JobOutcome.SKIPPED_ALREADY_APPLIED, "* 🥳 Already applied! Job: ")
             return jobCounter
         
         self.driverHelper.clickEasyApplyButton()
@@ -246,6 +464,9 @@ class Linkedin:
         
         # Now, the easy apply popup should be open
         if self.driverHelper.isSubmitButtonDisplayed():
+            blockingQuestions = self.handleApplicationStep(jobProperties)
+            if blockingQuestions:
+                return self.cannotApply(jobPage, jobProperties, jobCounter, blockingQuestions)
             jobCounter = self.handleSubmitPage(jobPage, jobProperties, jobCounter)
         elif self.driverHelper.isNextButtonDisplayed():
             jobCounter = self.handleMultiplePages(jobPage, jobProperties, jobCounter)
@@ -254,6 +475,14 @@ class Linkedin:
 
 
     def getJobPropertiesFromJobPage(self, jobID: str) -> models.Job: 
+        if constants.batchedJobPageExtraction:
+            jobPageDetails = self.getJobPageDetailsFromJobPage()
+            missingFields = jobPageDetails.missingFields()
+            if missingFields:
+                logger.logDebugMessage(f"in getting {', '.join(missingFields)} from job page", MessageTypes.WARNING)
+
+            return jobPageDetails.toJob(jobID)
+
         jobTitle = self.getJobTitleFromJobPage()
         jobCompany = self.getJobCompanyFromJobPage()
         jobLocation = ""
@@ -263,8 +492,8 @@ class Linkedin:
         jobDescription = self.getJobDescriptionFromJobPage()
 
         # First, find the container that holds all the elements.
-        if self.driverHelper.exists(self.driverHelper.driver, By.XPATH, constants.divWithJobPagePrimaryDescriptionXPATH):
-            primary_description_div = self.driver.find_element(By.XPATH, constants.divWithJobPagePrimaryDescriptionXPATH)
+        primary_description_div = self.driverHelper.find(self.driver, By.XPATH, constants.divWithJobPagePrimaryDescriptionXPATH)
+        if primary_description_div is not None:
             jobLocation = self.getJobLocationFromJobPage(primary_description_div)
             jobPostedDate = self.getJobPostedDateFromJobPage(primary_description_div)
             numberOfApplicants = self.getNumberOfApplicantsFromJobPage(primary_description_div)
@@ -283,6 +512,33 @@ class Linkedin:
         )
     
 
+    # Parses the result of the batched job page script the same way as the per-element getters below
+    def getJobPageDetailsFromJobPage(self) -> models.JobPageDetails:
+        rawDetails = self.driverHelper.getRawJobPageDetails()
+        jobPageDetails = models.JobPageDetails()
+
+        if rawDetails.get("title") is not None:
+            jobPageDetails.title = rawDetails["title"].strip()
+
+        if rawDetails.get("company") is not None:
+            jobPageDetails.company = rawDetails["company"].strip()
+
+        if rawDetails.get("workplaceType") is not None:
+            firstSpanText = rawDetails["workplaceType"].strip().split('\n')[0]
+            jobPageDetails.workplace_type = self.verifyWorkPlaceType(firstSpanText)
+
+        if rawDetails.get("description") is not None:
+            jobPageDetails.description = rawDetails["description"]
+
+        if rawDetails.get("primaryDescription") is not None:
+            jobPageDetails.posted_date = utils.extractPostedDate(rawDetails["primaryDescription"])
+            jobPageDetails.applicants_at_time_of_applying = utils.extractNumberOfApplicants(rawDetails.get("primaryDescriptionSpans") or [])
+            if rawDetails.get("location") is not None:
+                jobPageDetails.location = rawDetails["location"].strip()
+
+        return jobPageDetails
+
+
     def getJobTitleFromJobPage(self) -> str:
         jobTitle = ""
 
@@ -298,9 +554,9 @@ class Linkedin:
     def getJobCompanyFromJobPage(self) -> str:
         jobCompany = ""
 
-        if self.driverHelper.exists(self.driverHelper.driver, By.XPATH, constants.divWithJobCompanyXPATH):
-            # Inside this container, find the company name link.
-            jobCompanyElement = self.driver.find_element(By.XPATH, constants.divWithJobCompanyXPATH)
+        # Inside this container, find the company name link.
+        jobCompanyElement = self.driverHelper.find(self.driver, By.XPATH, constants.divWithJobCompanyXPATH)
+        if jobCompanyElement is not None:
             jobCompany = jobCompanyElement.text.strip()
             
         else:
@@ -326,10 +582,7 @@ class Linkedin:
 
         try:
             primary_description_text = primary_description_div.text  # Get all text from the div
-            # Regex pattern to find patterns like '6 hours ago', '2 days ago', etc.
-            match = re.search(r'\b\d+\s+(seconds?|minutes?|hours?|days?|weeks?|months?)\s+ago\b', primary_description_text)
-            if match:
-                jobPostedDate = match.group(0)  # The whole matched text is the date
+            jobPostedDate = utils.extractPostedDate(primary_description_text)
 
         except Exception as e:
             logger.logDebugMessage("Error in getting jobPostedDate", MessageTypes.WARNING, e)
@@ -343,13 +596,7 @@ class Linkedin:
         try:
             # Find all spans with the class 'tvm__text--low-emphasis'
             primaryDescriptionSpans = primary_description_div.find_elements(By.XPATH, constants.numberOfApplicantsSpanXPATH)
-            # Loop through all found spans in reverse order because the number of applicants is usually the last one
-            for span in reversed(primaryDescriptionSpans):
-                span_text = span.text.strip()
-                # Check if the text contains the keyword 'appl' (from 'applicants' or 'applications') and a number 
-                if 'appl' in span_text.lower() and any(char.isdigit() for char in span_text):
-                    jobApplications = span_text
-                    break
+            jobApplications = utils.extractNumberOfApplicants([span.text for span in primaryDescriptionSpans])
 
         except Exception as e:
             logger.logDebugMessage("in getting jobApplications", MessageTypes.WARNING, e)
@@ -393,42 +640,50 @@ class Linkedin:
         return jobDescription
     
 
-    def isJobBlacklisted(self, company: str, title: str, blacklistedCompanies: List[str] = config.blacklistCompanies, blacklistedTitles: List[str] = config.blackListTitles):
-        is_blacklisted = self.isCompanyBlacklisted(company, blacklistedCompanies)
-        if is_blacklisted:
-            return True
+    # The blacklists from config.py are used unless other blacklists are passed
+    def isJobBlacklisted(self, company: str, title: str, blacklistedCompanies: List[str] = None, blacklistedTitles: List[str] = None):
+        return self.isCompanyBlacklisted(company, blacklistedCompanies) or self.isTitleBlacklisted(title, blacklistedTitles)
+    
 
-        is_blacklisted = self.isTitleBlacklisted(title, blacklistedTitles)
-        if is_blacklisted:
-            return True
+    def isCompanyBlacklisted(self, company: str, blacklistedCompanies: List[str] = None):
+        if blacklistedCompanies is None:
+            return blacklistMatcher.getConfigMatcher().isCompanyBlacklisted(company)
 
-        return False
+        return BlacklistMatcher(companies = blacklistedCompanies).isCompanyBlacklisted(company)
     
 
-    def isCompanyBlacklisted(self, company: str, blacklistedCompanies: List[str] = config.blacklistCompanies):
-        return any(blacklistedCompany.strip().lower() == company.lower() for blacklistedCompany in blacklistedCompanies)
-    
+    def isTitleBlacklisted(self, title: str, blacklistedTitles: List[str] = None):
+        if blacklistedTitles is None:
+            return blacklistMatcher.getConfigMatcher().isTitleBlacklisted(title)
 
-    def isTitleBlacklisted(self, title: str, blacklistedTitles: List[str] = config.blackListTitles):
-        return any(blacklistedTitle.strip().lower() in title.lower() for blacklistedTitle in blacklistedTitles)
+        return BlacklistMatcher(titles = blacklistedTitles).isTitleBlacklisted(title)
 
     
     def handleMultiplePages(self, jobPage, jobProperties: models.Job, jobCounter: models.JobCounter):
+        # Every step is scanned before Next is clicked, a step with questions that cannot be answered ends the application there
+        blockingQuestions = self.handleApplicationStep(jobProperties)
+        if blockingQuestions:
+            return self.cannotApply(jobPage, jobProperties, jobCounter, blockingQuestions)
+
         while True:
+            self.driverHelper.harvestAnswers()
             self.driverHelper.clickNextButton()
             if self.driverHelper.isQuestionsUnansweredErrorMessageDisplayed():
-                # TODO Change the logic when answering to questions is implemented
+                self.driverHelper.markLastFormStepBlocked()
                 jobCounter = self.cannotApply(jobPage, jobProperties, jobCounter)
                 return jobCounter
-            self.handleApplicationStep(jobProperties)
+            blockingQuestions = self.handleApplicationStep(jobProperties)
+            if blockingQuestions:
+                return self.cannotApply(jobPage, jobProperties, jobCounter, blockingQuestions)
             if not self.driverHelper.isNextButtonDisplayed():
                 break
 
         if self.driverHelper.isLastApplicationStepDisplayed():
+            self.driverHelper.harvestAnswers()
             self.driverHelper.clickReviewApplicationButton()
 
         if self.driverHelper.isQuestionsUnansweredErrorMessageDisplayed():
-            # TODO Change the logic when answering to questions is implemented
+            self.driverHelper.markLastFormStepBlocked()
             jobCounter = self.cannotApply(jobPage, jobProperties, jobCounter)
             return jobCounter
 
@@ -437,11 +692,17 @@ class Linkedin:
         return jobCounter
     
 
-    def cannotApply(self, jobPage, jobProperties: models.Job, jobCounter: models.JobCounter) -> models.JobCounter:
+    # blockingQuestions are the questions without an answer when they are known
+    # The application is discarded, so the next job starts without an open modal
+    def cannotApply(self, jobPage, jobProperties: models.Job, jobCounter: models.JobCounter, blockingQuestions: List[str] = None) -> models.JobCounter:
         jobCounter.skipped_unanswered_questions += 1
-        # TODO Instead of except, output which questions need to be answered
-        lineToWrite = self.getLogTextForJobProperties(jobProperties, jobCounter) + " | " + "* 🥵 Couldn't apply to this job! Extra info needed. Link: " + str(jobPage)
-        resultFileWriter.displayWriteResults(lineToWrite)
+        self.driverHelper.discardApplication()
+
+        resultText = "* 🥵 Couldn't apply to this job! Extra info needed. Link: "
+        if blockingQuestions:
+            resultText = f"* 🥵 Couldn't apply to this job! Extra info needed for: {' / '.join(blockingQuestions)}. Link: "
+        self.recordJobResult(jobPage, jobProperties, jobCounter, models.JobOutcome.SKIPPED_UNANSWERED_QUESTIONS, resultText,
+            {"blocking_questions": blockingQuestions or []})
 
         return jobCounter
         
@@ -461,20 +722,21 @@ class Linkedin:
             sleeper.interact(lambda : self.driverHelper.clickButton(followCompany))
 
         if self.driverHelper.isReviewApplicationStepDisplayed():
+            self.driverHelper.harvestAnswers()
             self.driverHelper.clickSubmitApplicationButton()
             if self.driverHelper.isApplicationSubmittedDialogDisplayed():
                 repository_wrapper.applied_to_job(jobProperties)
-                lineToWrite = self.getLogTextForJobProperties(jobProperties, jobCounter) + " | " + "* 🥳 Just Applied to this job: " + str(jobPage)
-                resultFileWriter.displayWriteResults(lineToWrite)
+                self.recordJobResult(jobPage, jobProperties, jobCounter, models.JobOutcome.APPLIED, "* 🥳 Just Applied to this job: ")
 
                 jobCounter.applied += 1
 
         return jobCounter
 
 
-    def handleApplicationStep(self, jobProperties: models.Job):
+    # Returns the questions that block the application
+    def handleApplicationStep(self, jobProperties: models.Job) -> List[str]:
         self.driverHelper.chooseResumeIfPossible(jobProperties)
-        # self.driverHelper.handleQuestions(jobProperties)
+        return self.driverHelper.handleQuestions(jobProperties)
 
 
     def find_jobs_from_search_page(self) -> list[models.JobForVerification]:
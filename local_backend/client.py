@@ -0,0 +1,173 @@
+# Backend module for repository_wrapper talking to the local reference backend over HTTP
+# Connections are kept alive and reused from a pool, so every call does not pay for a new TCP connection
+import http.client
+import json
+import os
+import queue
+import threading
+from dataclasses import asdict
+from typing import List, Tuple
+from urllib.parse import urlsplit
+
+import constants
+import models
+
+
+# The backend answered with an error status, the dispatcher gives up on calls rejected with a 4xx status
+class BackendRequestError(Exception):
+
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+class PooledHttpClient:
+
+
+    def __init__(self, baseUrl: str, poolSize: int = 4, timeout: float = 10):
+        url = urlsplit(baseUrl)
+        if url.scheme != "http" or not url.hostname:
+            raise ValueError(f"Unsupported backend url: {baseUrl}")
+
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.timeout = timeout
+        # A pool size of 0 closes every connection after its request
+        self.poolSize = poolSize
+        self.idleConnections = queue.LifoQueue(maxsize=max(poolSize, 1))
+        self.lock = threading.Lock()
+        self.connectionsOpened = 0
+
+
+    def postJson(self, path: str, body: dict) -> dict:
+        return self.request("POST", path, body)
+
+
+    def request(self, method: str, path: str, body: dict = None) -> dict:
+        content = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        connection, reused = self.__acquire()
+        try:
+            response = self.__send(connection, method, path, content, headers)
+        except (http.client.HTTPException, ConnectionError):
+            connection.close()
+            if not reused:
+                raise
+            # The server closed an idle connection, retry once on a new one
+            connection, reused = self.__newConnection(), False
+            try:
+                response = self.__send(connection, method, path, content, headers)
+            except Exception:
+                connection.close()
+                raise
+        except Exception:
+            connection.close()
+            raise
+
+        status, responseBody = response
+        self.__release(connection)
+
+        if status >= 400:
+            raise BackendRequestError(f"{method} {path} failed with {status}: {responseBody.get('error', '')}", status)
+        return responseBody
+
+
+    def close(self):
+        while True:
+            try:
+                self.idleConnections.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+    def __send(self, connection: http.client.HTTPConnection, method: str, path: str, content: bytes, headers: dict) -> Tuple[int, dict]:
+        connection.request(method, path, body=content, headers=headers)
+        response = connection.getresponse()
+        # The body is always read so the connection can be reused
+        return response.status, json.loads(response.read() or b"{}")
+
+
+    def __acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        try:
+            return self.idleConnections.get_nowait(), True
+        except queue.Empty:
+            return self.__newConnection(), False
+
+
+    def __newConnection(self) -> http.client.HTTPConnection:
+        with self.lock:
+            self.connectionsOpened += 1
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+
+    def __release(self, connection: http.client.HTTPConnection):
+        if self.poolSize <= 0:
+            connection.close()
+            return
+        try:
+            self.idleConnections.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+
+__client = None
+
+
+def getBackendUrl() -> str:
+    return os.getenv("LOCAL_BACKEND_URL") or constants.localBackendUrl
+
+
+def getClient() -> PooledHttpClient:
+    global __client
+    if __client is None:
+        __client = PooledHttpClient(getBackendUrl(), poolSize = constants.localBackendPoolSize, timeout = constants.localBackendTimeout)
+    return __client
+
+
+# Points the module at another backend, ex: a server started on a free port in tests
+def configure(baseUrl: str, poolSize: int = None, timeout: float = None):
+    global __client
+    if __client is not None:
+        __client.close()
+    __client = PooledHttpClient(baseUrl, poolSize = constants.localBackendPoolSize if poolSize is None else poolSize,
+        timeout = timeout or constants.localBackendTimeout)
+
+
+# The functions below have the names and signatures repository_wrapper expects from a backend module
+
+
+def verify_jobs(jobs: List[models.JobForVerification]) -> List[models.JobForVerification]:
+    response = getClient().postJson("/jobs/verify", {"jobs": [asdict(job) for job in jobs]})
+    return [models.JobForVerification(**job) for job in response["jobs"]]
+
+
+def update_job_with_job_properties(job: models.Job) -> models.Job:
+    getClient().postJson("/jobs", {"job": asdict(job)})
+    return job
+
+
+def update_jobs_with_job_properties(jobs: List[models.Job]):
+    getClient().postJson("/jobs/bulk", {"jobs": [asdict(job) for job in jobs]})
+
+
+# Takes the payloads of utils.jobPayload.encodeJob
+def update_jobs(payloads: List[dict]):
+    getClient().postJson("/jobs/upsert", {"jobs": payloads})
+
+
+def applied_to_job(linkedinJobId: str):
+    applied_to_jobs([linkedinJobId])
+
+
+def applied_to_jobs(linkedinJobIds: List[str]):
+    getClient().postJson("/jobs/applied", {"linkedin_job_ids": list(linkedinJobIds)})
+
+
+def attached_resume_to_job(linkedinJobId: str, resume: str):
+    attached_resumes_to_jobs([(linkedinJobId, resume)])
+
+
+def attached_resumes_to_jobs(resumes: List[Tuple[str, str]]):
+    getClient().postJson("/jobs/resumes", {"resumes": [{"linkedin_job_id": jobId, "resume": resume} for jobId, resume in resumes]})
@@ -0,0 +1,174 @@
+# Reference backend for repository_wrapper, served over HTTP on localhost and backed by SQLite
+# Run from the repository root: python -m local_backend.server --port 8765 --database data/local_backend.sqlite3
+import argparse
+import json
+import threading
+import time
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import models
+import utils.jobPayload as jobPayload
+from utils.jobStateStore import JOB_COLUMNS, JobStateStore
+
+
+# The local state store plus the resumes attached to jobs
+class LocalBackendStore(JobStateStore):
+
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        with self.lock, self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    linkedin_job_id TEXT PRIMARY KEY,
+                    resume TEXT NOT NULL,
+                    attached_at REAL NOT NULL
+                )""")
+
+
+    # Only the columns present in the fields are updated, ex: the description is kept when it was left out as unchanged
+    def upsertJobs(self, jobsFields: list):
+        now = time.time()
+
+        with self.lock, self.connection:
+            for fields in jobsFields:
+                columns = ["linkedin_job_id", "first_seen", "last_seen"] + [column for column in JOB_COLUMNS if column in fields]
+                values = [fields["linkedin_job_id"], now, now] + [fields[column] for column in columns[3:]]
+                self.connection.execute(f"""
+                    INSERT INTO jobs ({", ".join(columns)}) VALUES ({", ".join("?" for _ in columns)})
+                    ON CONFLICT (linkedin_job_id) DO UPDATE SET
+                        {", ".join(f"{column} = excluded.{column}" for column in columns[2:])}""", values)
+
+
+    def attachResume(self, linkedinJobId: str, resume: str):
+        with self.lock, self.connection:
+            self.connection.execute("""
+                INSERT INTO resumes (linkedin_job_id, resume, attached_at) VALUES (?, ?, ?)
+                ON CONFLICT (linkedin_job_id) DO UPDATE SET resume = excluded.resume, attached_at = excluded.attached_at""",
+                (linkedinJobId, resume, time.time()))
+
+
+    def getResume(self, linkedinJobId: str):
+        with self.lock:
+            row = self.connection.execute("SELECT resume FROM resumes WHERE linkedin_job_id = ?", (linkedinJobId,)).fetchone()
+        return row[0] if row else None
+
+
+class LocalBackendRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps the connections of the pooled client open
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, Nagle's algorithm would hold the body back for the delayed ACK
+    disable_nagle_algorithm = True
+
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.__sendJson(200, {"status": "ok"})
+        else:
+            self.__sendJson(404, {"error": f"Unknown path: {self.path}"})
+
+
+    def do_POST(self):
+        try:
+            body = self.__readJson()
+            match self.path:
+                case "/jobs/verify":
+                    self.__sendJson(200, {"jobs": self.__verifyJobs(body["jobs"])})
+                case "/jobs":
+                    self.server.store.saveJob(models.Job(**body["job"]))
+                    self.__sendJson(200, {"job": body["job"]})
+                case "/jobs/bulk":
+                    for job in body["jobs"]:
+                        self.server.store.saveJob(models.Job(**job))
+                    self.__sendJson(200, {"updated": len(body["jobs"])})
+                case "/jobs/upsert":
+                    self.server.store.upsertJobs([jobPayload.decodeJob(job) for job in body["jobs"]])
+                    self.__sendJson(200, {"updated": len(body["jobs"])})
+                case "/jobs/applied":
+                    for linkedinJobId in body["linkedin_job_ids"]:
+                        self.server.store.setOutcome(linkedinJobId, models.JobOutcome.APPLIED)
+                    self.__sendJson(200, {"updated": len(body["linkedin_job_ids"])})
+                case "/jobs/resumes":
+                    for resume in body["resumes"]:
+                        self.server.store.attachResume(resume["linkedin_job_id"], resume["resume"])
+                    self.__sendJson(200, {"updated": len(body["resumes"])})
+                case _:
+                    self.__sendJson(404, {"error": f"Unknown path: {self.path}"})
+        except (KeyError, TypeError, ValueError) as e:
+            self.__sendJson(400, {"error": str(e)})
+
+
+    # Jobs that were already applied to are not returned, same as the local state store does for the bot
+    def __verifyJobs(self, jobs: list) -> list:
+        jobsForVerification = [models.JobForVerification(**job) for job in jobs]
+        appliedJobIds = self.server.store.getJobIdsWithOutcome([job.linkedinJobId for job in jobsForVerification], [models.JobOutcome.APPLIED])
+        newJobs = [job for job in jobsForVerification if job.linkedinJobId not in appliedJobIds]
+        self.server.store.markSeen(newJobs)
+        return [asdict(job) for job in newJobs]
+
+
+    def __readJson(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+
+    def __sendJson(self, status: int, body: dict):
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+    def log_message(self, format, *args):
+        # Requests are not logged, the load test sends thousands of them
+        pass
+
+
+class LocalBackendServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+    def __init__(self, host: str, port: int, databasePath: str):
+        super().__init__((host, port), LocalBackendRequestHandler)
+        self.store = LocalBackendStore(databasePath)
+
+
+    def getUrl(self) -> str:
+        host, port = self.server_address[0:2]
+        return f"http://{host}:{port}"
+
+
+    # Serves from a background thread, ex: in tests and benchmarks
+    def startInBackground(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="LocalBackendServer", daemon=True)
+        thread.start()
+        return thread
+
+
+    def server_close(self):
+        super().server_close()
+        self.store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reference backend for the EasyApplyJobsBot")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database", default="data/local_backend.sqlite3")
+    arguments = parser.parse_args()
+
+    server = LocalBackendServer(arguments.host, arguments.port, arguments.database)
+    print(f"Local backend listening on {server.getUrl()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
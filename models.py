@@ -1,4 +1,6 @@
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import List, Optional
 
 
 @dataclass
@@ -13,21 +15,75 @@ class Job:
     linkedin_job_id: str = ""
 
 
+# Properties read from a job page in one go, None marks a property whose element was not found
+@dataclass
+class JobPageDetails:
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    workplace_type: Optional[str] = None
+    posted_date: Optional[str] = None
+    applicants_at_time_of_applying: Optional[str] = None
+
+    def missingFields(self) -> List[str]:
+        return [field for field, value in asdict(self).items() if value is None]
+
+    def toJob(self, linkedinJobId: str) -> Job:
+        fields = {field: value or "" for field, value in asdict(self).items()}
+        return Job(**fields, linkedin_job_id = linkedinJobId)
+
+
+# postedDate and applicants are the texts of the job card, ex: "2 days ago" and "Be an early applicant", empty when not shown
 @dataclass
 class JobForVerification:
     linkedinJobId: str
     title: str
     company: str
     workplaceType: str
+    postedDate: str = ""
+    applicants: str = ""
 
     def to_dict(self):
         return asdict(self)
 
 
+# Properties of a job card on the search results page, None when the property was not found
+@dataclass
+class JobCard:
+    linkedinJobId: Optional[str] = None
+    title: Optional[str] = None
+    company: Optional[str] = None
+    workplaceType: str = ""
+    applied: bool = False
+    postedDate: str = ""
+    applicants: str = ""
+
+
+# A question of an application step, read in one go with all the others of the step
+# inputType is "text", "textarea", "radio" or "select", None for a question the bot cannot fill in
+@dataclass
+class FormField:
+    fieldId: str
+    label: Optional[str] = None
+    inputType: Optional[str] = None
+    options: List[str] = field(default_factory=list)
+    value: str = ""
+    required: bool = False
+
+
+# Result of processing a job, also used as the result in the results files
+class JobOutcome(str, Enum):
+    APPLIED = "applied"
+    SKIPPED_BLACKLISTED = "blacklisted"
+    SKIPPED_ALREADY_APPLIED = "already_applied"
+    SKIPPED_UNANSWERED_QUESTIONS = "unanswered_questions"
+
+
 @dataclass
 class JobCounter:
-    total = 0
-    applied = 0
-    skipped_blacklisted = 0
-    skipped_already_applied = 0
-    skipped_unanswered_questions = 0
\ No newline at end of file
+    total: int = 0
+    applied: int = 0
+    skipped_blacklisted: int = 0
+    skipped_already_applied: int = 0
+    skipped_unanswered_questions: int = 0
\ No newline at end of file
@@ -0,0 +1,15 @@
+import sys
+
+import utils.file as resultFileWriter
+
+
+# The results are only appended to the structured .jsonl file of the day during a run, this renders the text table
+# of a day (today by default) into its .txt file and prints it, ex: python3 renderResults.py 20240131
+def main():
+    day = sys.argv[1] if len(sys.argv) > 1 else None
+    resultFileWriter.writeResultsTable(day)
+    print(resultFileWriter.renderResults(day), end="")
+
+
+if __name__ == "__main__":
+    main()
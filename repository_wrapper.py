@@ -1,17 +1,128 @@
 import utils.utils as utils, models
+import constants
 import utils.logger as logger
+import utils.jobPayload as jobPayload
 from utils.logger import MessageTypes
-from typing import List
+from utils.backendDispatcher import BackendDispatcher
+from utils.backendOutbox import BackendOutbox
+from utils.answerEngine import getAnswerEngine, getAnswersVersion
+from utils.jobStateStore import JobStateStore
+from utils.answerStore import AnswerStore, normalizeQuestionKey
+from dataclasses import asdict
+from typing import List, Optional
 from dotenv import load_dotenv
 
 initialized = False
 backend_api = None
+state_store = None
+answer_store = None
+# Questions without an answer already sent to the backend in this run, used without an answer store
+posted_unanswered_questions = set()
+# Backend updates are sent in batches from a background thread, only verify_jobs is called directly
+dispatcher = None
 
 
 def init():
-    global initialized, backend_api
+    global initialized, backend_api, state_store, answer_store, dispatcher
     logger.logDebugMessage("Initializing repository wrapper...")
+    state_store = init_state_store()
+    answer_store = init_answer_store()
     initialized, backend_api = import_backend_module()
+    if initialized:
+        dispatcher = BackendDispatcher(send_batch, batchWindow = constants.backendBatchWindow, maxBatchSize = constants.backendMaxBatchSize,
+            retryBackoff = constants.backendRetryBackoff, maxRetryBackoff = constants.backendMaxRetryBackoff, outbox = init_outbox(),
+            firstOperations = ["update_job", "update_jobs"], maxAttempts = constants.backendMaxAttempts)
+
+
+def init_outbox():
+    if not constants.backendOutboxPath:
+        return None
+
+    try:
+        return BackendOutbox(constants.backendOutboxPath, constants.backendDeadLetterPath)
+    except Exception as e:
+        logger.logDebugMessage("Could not open backend outbox, updates that fail will be lost", MessageTypes.WARNING, e)
+        return None
+
+
+# Sends the queued updates now, ex: at the end of a search page
+def flush():
+    if dispatcher is not None:
+        dispatcher.flush()
+
+
+# Delivers the queued updates before the bot stops
+def close():
+    if dispatcher is not None:
+        dispatcher.close(timeout = constants.backendCloseTimeout)
+        metrics = dispatcher.getMetrics()
+        logger.logDebugMessage(f"Backend: {metrics['delivered']} of {metrics['submitted']} updates delivered in {metrics['batches']} batches, " +
+            f"average latency {metrics['averageLatency']:.1f}s, max latency {metrics['maxLatency']:.1f}s", MessageTypes.INFO)
+
+
+def get_dispatcher_metrics() -> dict:
+    return dispatcher.getMetrics() if dispatcher is not None else {}
+
+
+# Called from the dispatcher thread with every queued update of one operation
+# The backend module may offer bulk functions, otherwise the updates are sent one by one
+def send_batch(operation: str, payloads: List[dict]):
+    match operation:
+        case "update_job":
+            jobs = [models.Job(**payload) for payload in payloads]
+            if hasattr(backend_api, "update_jobs_with_job_properties"):
+                backend_api.update_jobs_with_job_properties(jobs)
+            else:
+                for job in jobs:
+                    backend_api.update_job_with_job_properties(job)
+        case "update_jobs":
+            backend_api.update_jobs(payloads)
+            # The backend has these descriptions now, unchanged ones are left out of the next upserts
+            save_sent_description_hashes(payloads)
+        case "post_question":
+            for payload in payloads:
+                backend_api.post_question(payload["question"], payload["answer"])
+        case "applied_to_job":
+            jobIds = [payload["linkedin_job_id"] for payload in payloads]
+            if hasattr(backend_api, "applied_to_jobs"):
+                backend_api.applied_to_jobs(jobIds)
+            else:
+                for jobId in jobIds:
+                    backend_api.applied_to_job(jobId)
+        case "attached_resume_to_job":
+            resumes = [(payload["linkedin_job_id"], payload["resume"]) for payload in payloads]
+            if hasattr(backend_api, "attached_resumes_to_jobs"):
+                backend_api.attached_resumes_to_jobs(resumes)
+            else:
+                for jobId, resume in resumes:
+                    backend_api.attached_resume_to_job(jobId, resume)
+        case _:
+            raise ValueError(f"Unknown backend operation: {operation}")
+
+
+# The local state store works with or without the backend module
+def init_state_store():
+    if not constants.localStateStorePath:
+        return None
+
+    try:
+        store = JobStateStore(constants.localStateStorePath)
+        logger.logDebugMessage(f"Using local state store {constants.localStateStorePath}", MessageTypes.SUCCESS)
+        return store
+    except Exception as e:
+        logger.logDebugMessage("Could not open local state store", MessageTypes.WARNING, e)
+        return None
+
+
+def init_answer_store():
+    if not constants.answerStorePath:
+        return None
+
+    try:
+        return AnswerStore(constants.answerStorePath)
+    except Exception as e:
+        logger.logDebugMessage("Could not open answer store", MessageTypes.WARNING, e)
+        return None
 
 
 def import_backend_module():
@@ -28,13 +139,41 @@ def import_backend_module():
     
     except ImportError as e:
         logger.logDebugMessage(f"Could not import backend module: {e}", MessageTypes.WARNING)
+        return import_local_backend_module()
+
+
+# Falls back to the reference backend in local_backend when its url is configured
+def import_local_backend_module():
+    import local_backend.client as local_backend_api
+
+    url = local_backend_api.getBackendUrl()
+    if not url:
+        return False, None
+
+    try:
+        local_backend_api.getClient().request("GET", "/health")
+        logger.logDebugMessage(f"Using local backend {url}", MessageTypes.SUCCESS)
+        return True, local_backend_api
+    except Exception as e:
+        logger.logDebugMessage(f"Could not reach local backend {url}", MessageTypes.WARNING, e)
         return False, None
     
 
-def verify_jobs(jobs: models.JobForVerification) -> List[models.JobForVerification]:
+def verify_jobs(jobs: List[models.JobForVerification]) -> List[models.JobForVerification]:
+    if state_store is not None:
+        try:
+            knownJobIds = state_store.getJobIdsWithOutcome([job.linkedinJobId for job in jobs], constants.skipJobsWithOutcomes, getAnswersVersion())
+            if knownJobIds:
+                logger.logDebugMessage(f"Skipping {len(knownJobIds)} jobs processed in previous runs", MessageTypes.INFO)
+                jobs = [job for job in jobs if job.linkedinJobId not in knownJobIds]
+            state_store.markSeen(jobs)
+        except Exception as e:
+            logger.logDebugMessage("Error verifying jobs in local state store", MessageTypes.ERROR, e)
+
     if initialized:
         try:
-            logger.logDebugMessage(f"Verifying jobs: {jobs}")
+            logger.logDebugMessage(lambda : f"Verifying {len(jobs)} jobs", MessageTypes.DEBUG,
+                fields = {"linkedin_job_ids": [job.linkedinJobId for job in jobs]})
             jobs = backend_api.verify_jobs(jobs)
         except Exception as e:
             logger.logDebugMessage(f"Error verifying jobs: {e}", MessageTypes.ERROR)
@@ -43,45 +182,145 @@ def verify_jobs(jobs: models.JobForVerification) -> List[models.JobForVerificati
     
 
 def update_job(job: models.Job):
+    return update_jobs([job])[0]
+
+
+# Saves the jobs and queues them for the backend, the dispatcher sends the queued jobs in bulk
+# Backend modules with update_jobs get compressed payloads without the descriptions they already have
+def update_jobs(jobs: List[models.Job]) -> List[models.Job]:
+    if not jobs:
+        return jobs
+
+    if state_store is not None:
+        try:
+            state_store.saveJobs(jobs)
+        except Exception as e:
+            logger.logDebugMessage("Error saving jobs in local state store", MessageTypes.ERROR, e)
+
     if initialized:
+        logger.logDebugMessage(lambda : f"Updating {len(jobs)} jobs", MessageTypes.DEBUG,
+            fields = {"linkedin_job_ids": [job.linkedin_job_id for job in jobs]})
+        if hasattr(backend_api, "update_jobs"):
+            for payload in encode_jobs(jobs):
+                dispatcher.submit("update_jobs", payload)
+        else:
+            for job in jobs:
+                dispatcher.submit("update_job", asdict(job))
+
+    return jobs
+
+
+def encode_jobs(jobs: List[models.Job]) -> List[dict]:
+    sentHashes = {}
+    if constants.backendSkipUnchangedDescriptions and state_store is not None:
         try:
-            logger.logDebugMessage(f"Updating job: {job}")
-            job = backend_api.update_job_with_job_properties(job)
+            sentHashes = state_store.getSentDescriptionHashes([job.linkedin_job_id for job in jobs])
         except Exception as e:
-            logger.logDebugMessage(f"Error updating job: {e}", MessageTypes.ERROR)
+            logger.logDebugMessage("Error reading sent descriptions from local state store", MessageTypes.WARNING, e)
 
-    return job
+    payloads = []
+    for job in jobs:
+        includeDescription = sentHashes.get(job.linkedin_job_id) != jobPayload.descriptionHash(job.description)
+        payloads.append(jobPayload.encodeJob(job, includeDescription, compressAbove = constants.backendCompressDescriptionsAbove))
 
-def attached_resume_to_job(job: models.Job, resume: str):
-    if initialized:
+    logger.logDebugMessage(lambda : f"Encoded {len(payloads)} jobs", MessageTypes.DEBUG, fields = {
+        "unchanged_descriptions": sum(1 for payload in payloads if "description" not in payload and "description_zlib" not in payload),
+        "compressed_descriptions": sum(1 for payload in payloads if "description_zlib" in payload)})
+    return payloads
+
+
+# Called once the backend acknowledged the payloads, a dropped upsert sends its description again
+def save_sent_description_hashes(payloads: List[dict]):
+    if state_store is not None:
         try:
-            logger.logDebugMessage(f"Attaching resume to job: {job}")
-            backend_api.attached_resume_to_job(job.linkedin_job_id, resume)
+            state_store.setSentDescriptionHashes({payload["linkedin_job_id"]: payload["description_hash"] for payload in payloads})
         except Exception as e:
-            logger.logDebugMessage(f"Error attaching resume to job: {e}", MessageTypes.ERROR)
+            logger.logDebugMessage("Error saving sent descriptions in local state store", MessageTypes.WARNING, e)
 
-def get_answer_by_question(question):
+
+def attached_resume_to_job(job: models.Job, resume: str):
     if initialized:
+        logger.logDebugMessage("Attaching resume to job", MessageTypes.DEBUG, fields = {"linkedin_job_id": job.linkedin_job_id, "resume": resume})
+        dispatcher.submit("attached_resume_to_job", {"linkedin_job_id": job.linkedin_job_id, "resume": resume})
+
+# Answers harvested for the same question come first, then additionalQuestions.yaml, the backend is only asked
+# when neither has an answer. section is one of answerEngine.SECTIONS: "inputField", "radio" or "dropdown"
+def get_answer_by_question(question, section = "inputField"):
+    answer = None
+    try:
+        if answer_store is not None:
+            answer = answer_store.getAnswer(question, section)
+
+        answerEngine = getAnswerEngine()
+        if answer is None and answerEngine is not None:
+            answer = answerEngine.getAnswer(question, section)
+    except Exception as e:
+        logger.logDebugMessage(f"Error getting answer for question: {e}", MessageTypes.ERROR)
+
+    if answer is None and initialized and hasattr(backend_api, "get_answer_by_question"):
         try:
-            logger.logDebugMessage(f"Getting answer for question: {question}")
-            # TODO: Implement this
+            logger.logDebugMessage("Getting answer for question", MessageTypes.DEBUG, fields = {"question": question})
+            answer = backend_api.get_answer_by_question(question)
         except Exception as e:
             logger.logDebugMessage(f"Error getting answer for question: {e}", MessageTypes.ERROR)
 
+    return answer
 
-def post_question(question):
-    if initialized:
+
+# Saves an answer harvested from an application step, or a question without an answer (answer None) for the user
+# to answer later. Returns whether a new or different answer was saved.
+# The backend only gets the new answers and the questions without an answer the first time they are seen.
+def post_question(question, answer = None, section = "inputField"):
+    isNewAnswer = False
+    isNewQuestion = False
+    if answer_store is not None:
         try:
-            logger.logDebugMessage(f"Posting question: {question} with answer:")
-            # TODO: Implement this
+            if answer is None:
+                isNewQuestion = answer_store.saveUnansweredQuestion(question, section)
+            else:
+                isNewAnswer = answer_store.saveAnswer(question, section, answer)
         except Exception as e:
-            logger.logDebugMessage(f"Error posting question: {e}", MessageTypes.ERROR)
+            logger.logDebugMessage(f"Error saving question: {e}", MessageTypes.ERROR)
+    elif answer is None:
+        questionKey = (normalizeQuestionKey(question), section)
+        isNewQuestion = questionKey not in posted_unanswered_questions
+        posted_unanswered_questions.add(questionKey)
+
+    if initialized and hasattr(backend_api, "post_question") and (isNewAnswer or isNewQuestion):
+        logger.logDebugMessage("Posting question", MessageTypes.DEBUG, fields = {"question": question})
+        dispatcher.submit("post_question", {"question": question, "answer": answer})
+
+    return isNewAnswer
 
 
 def applied_to_job(job: models.Job):
     if initialized:
+        logger.logDebugMessage("Marking job as applied", MessageTypes.DEBUG, fields = {"linkedin_job_id": job.linkedin_job_id, "title": job.title})
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": job.linkedin_job_id})
+
+
+def record_job_outcome(job: models.Job, outcome: models.JobOutcome):
+    if state_store is not None:
+        try:
+            state_store.setOutcome(job.linkedin_job_id, outcome, getAnswersVersion())
+        except Exception as e:
+            logger.logDebugMessage("Error saving job outcome in local state store", MessageTypes.ERROR, e)
+
+
+def get_search_watermark(searchUrl: str) -> Optional[int]:
+    if state_store is None:
+        return None
+
+    try:
+        return state_store.getSearchWatermark(searchUrl)
+    except Exception as e:
+        logger.logDebugMessage("Error reading search watermark from local state store", MessageTypes.WARNING, e)
+        return None
+
+
+def set_search_watermark(searchUrl: str, newestJobId: int):
+    if state_store is not None:
         try:
-            logger.logDebugMessage(f"Marking job as applied: {job}")
-            backend_api.applied_to_job(job.linkedin_job_id)
+            state_store.setSearchWatermark(searchUrl, newestJobId)
         except Exception as e:
-            logger.logDebugMessage(f"Error marking job as applied: {e}", MessageTypes.ERROR)
+            logger.logDebugMessage("Error saving search watermark in local state store", MessageTypes.WARNING, e)
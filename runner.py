@@ -1,10 +1,25 @@
+import signal
+import sys
 import time
 from linkedin import Linkedin
 import utils.logger as logger
 from utils.logger import MessageTypes
 
 
-start = time.time()
-Linkedin().startApplying()
-end = time.time()
-logger.logDebugMessage("---Took: " + str(round((time.time() - start)/60)) + " minute(s).")
+# docker stop sends SIGTERM, exiting through the exception lets the run save its checkpoint first
+def stop(signalNumber, frame):
+    raise SystemExit(128 + signalNumber)
+
+
+def main():
+    signal.signal(signal.SIGTERM, stop)
+
+    start = time.time()
+    isCompleted = Linkedin().startApplying()
+    logger.logDebugMessage("---Took: " + str(round((time.time() - start)/60)) + " minute(s).")
+    # allConfigsRunner restarts runs that stopped early
+    sys.exit(0 if isCompleted else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import os
+import tempfile
+from unittest import mock
+
+import pytest
+
+import constants
+import utils.logger as logger
+
+
+# Keeps the log file of the test run out of the working tree
+@pytest.fixture(scope="session", autouse=True)
+def logToTemporaryDirectory():
+    with tempfile.TemporaryDirectory() as directory:
+        with mock.patch.object(constants, "logFilePath", os.path.join(directory, "bot.jsonl")):
+            yield
+            logger.flush()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import time
+import unittest
+
+import constants
+from utils.answerEngine import AnswerEngine, loadAnswerEngine
+
+
+class TestAnswerEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = AnswerEngine({
+            "inputField": {"Years of experience": 0, "Desired salary": "5000", "Phone Number": 1234567890, "React": 3, "React Native": 2, "Java": 3, "ipt": 0, "Uk": 1},
+            "radio": {"Sponsor": "no", "Driver": True},
+            "dropdown": {"English": "Native"},
+        }, fallbackKeywords = ["Years of experience"])
+
+    def test_keyword_in_question_is_answered(self):
+        self.assertEqual(self.engine.getAnswer("Mobile phone number"), "1234567890")
+        self.assertEqual(self.engine.getAnswer("Will you require visa SPONSORSHIP?", "radio"), "no")
+        self.assertEqual(self.engine.getAnswer("Do you have a valid driver's license?", "radio"), "Yes")
+        self.assertEqual(self.engine.getAnswer("Proficiency in English?", "dropdown"), "Native")
+
+    def test_questions_are_only_answered_from_their_section(self):
+        self.assertIsNone(self.engine.getAnswer("Proficiency in English?", "inputField"))
+        self.assertIsNone(self.engine.getAnswer("Mobile phone number", "radio"))
+
+    def test_longest_whole_word_keyword_wins(self):
+        self.assertEqual(self.engine.getAnswer("Years of experience with React Native?"), "2")
+        self.assertEqual(self.engine.getAnswer("Years of experience with React?"), "3")
+        self.assertEqual(self.engine.getAnswer("Years of experience with JavaScript in the UK?"), "1")
+
+    def test_short_keyword_inside_longer_word_is_ignored(self):
+        self.assertEqual(self.engine.getAnswer("Experience with JavaScript?", fuzzyThreshold = 0), "3")
+        self.assertIsNone(self.engine.getAnswer("Are you in Ukraine?", fuzzyThreshold = 0))
+
+    def test_fallback_keyword_is_only_used_without_other_match(self):
+        self.assertEqual(self.engine.getAnswer("How many years of experience do you have with React?"), "3")
+        self.assertEqual(self.engine.getAnswer("How many years of experience do you have with Cobol?"), "0")
+
+    def test_shipped_answers_are_matched_by_whole_words(self):
+        engine = loadAnswerEngine(constants.additionalQuestionsPath, fallbackKeywords = constants.fallbackAnswerKeywords)
+
+        # "ui" inside "require" and the "Years of experience" default must not answer these
+        self.assertIsNone(engine.getAnswer("Do you require visa sponsorship?", fuzzyThreshold = 0))
+        self.assertEqual(engine.getAnswer("Do you require visa sponsorship?", "radio", fuzzyThreshold = 0), "no")
+        self.assertEqual(engine.getAnswer("How many years of experience with Python?", fuzzyThreshold = 0), "3")
+
+    def test_misspelled_question_is_fuzzy_matched(self):
+        self.assertEqual(self.engine.getAnswer("What is your desired salry?", fuzzyThreshold = 0.7), "5000")
+        self.assertIsNone(self.engine.getAnswer("What is your desired salry?", fuzzyThreshold = 0))
+
+    def test_compiled_engine_is_cached_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "questions.yaml")
+            cachePath = os.path.join(directory, "cache", "questions.cache")
+            with open(path, "w") as file:
+                file.write("inputField:\n  City: Berlin\n")
+
+            self.assertEqual(loadAnswerEngine(path, cachePath).getAnswer("City"), "Berlin")
+            self.assertTrue(os.path.exists(cachePath))
+
+            with open(path, "w") as file:
+                file.write("inputField:\n  City: Hamburg\n")
+            modifiedAt = time.time() + 10
+            os.utime(path, (modifiedAt, modifiedAt))
+
+            self.assertEqual(loadAnswerEngine(path, cachePath).getAnswer("City"), "Hamburg")
+
+    def test_corrupt_cache_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "questions.yaml")
+            cachePath = os.path.join(directory, "questions.cache")
+            with open(path, "w") as file:
+                file.write("radio:\n  Remote: \"yes\"\n")
+            with open(cachePath, "wb") as file:
+                file.write(b"not a pickle")
+
+            self.assertEqual(loadAnswerEngine(path, cachePath).getAnswer("Remote work?", "radio"), "yes")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest import mock
+
+import repository_wrapper
+from utils.answerStore import AnswerStore, normalizeQuestionKey
+
+
+class TestAnswerStore(unittest.TestCase):
+    def setUp(self):
+        self.store = AnswerStore(":memory:")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_question_keys_are_normalized(self):
+        self.assertEqual(normalizeQuestionKey("How many years of  Python experience?Required"), "how many years of python experience")
+        self.assertEqual(normalizeQuestionKey(" Experience with C++ / C#? "), "experience with c++ c#")
+
+    def test_same_question_is_answered_whatever_the_label_format(self):
+        self.assertTrue(self.store.saveAnswer("What is your notice period?Required", "inputField", "2 weeks"))
+
+        self.assertEqual(self.store.getAnswer("what is your notice period", "inputField"), "2 weeks")
+        self.assertIsNone(self.store.getAnswer("what is your notice period", "radio"))
+
+    def test_only_new_or_changed_answers_are_reported(self):
+        self.assertTrue(self.store.saveAnswer("City", "inputField", "Berlin"))
+        self.assertFalse(self.store.saveAnswer("City?", "inputField", "Berlin"))
+        self.assertTrue(self.store.saveAnswer("City", "inputField", "Hamburg"))
+
+        self.assertEqual(self.store.getAnswer("City", "inputField"), "Hamburg")
+
+    def test_unanswered_questions_are_kept_until_answered(self):
+        self.assertTrue(self.store.saveUnansweredQuestion("Favourite colour?", "inputField"))
+        self.assertFalse(self.store.saveUnansweredQuestion("Favourite colour", "inputField"))
+        self.store.saveAnswer("City", "inputField", "Berlin")
+        self.assertFalse(self.store.saveUnansweredQuestion("City", "inputField"))
+
+        self.assertEqual(self.store.getUnansweredQuestions(), [("Favourite colour?", "inputField", 2)])
+        self.assertIsNone(self.store.getAnswer("Favourite colour", "inputField"))
+        self.assertEqual(self.store.getAnswer("City", "inputField"), "Berlin")
+
+
+class TestPostingQuestions(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = mock.Mock()
+        patchers = [mock.patch.object(repository_wrapper, "initialized", True), mock.patch.object(repository_wrapper, "backend_api", mock.Mock()),
+            mock.patch.object(repository_wrapper, "dispatcher", self.dispatcher), mock.patch.object(repository_wrapper, "posted_unanswered_questions", set())]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_unanswered_question_is_sent_to_the_backend_once(self):
+        for answerStore in [AnswerStore(":memory:"), None]:
+            self.dispatcher.reset_mock()
+            with mock.patch.object(repository_wrapper, "answer_store", answerStore):
+                repository_wrapper.post_question("Favourite colour?", None)
+                repository_wrapper.post_question("Favourite colour", None)
+                repository_wrapper.post_question("Favourite colour?", None, "radio")
+
+            self.assertEqual([call.args[1]["question"] for call in self.dispatcher.submit.call_args_list], ["Favourite colour?", "Favourite colour?"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+from unittest.mock import patch
+
+import utils.linkedinScripts as scripts
+from utils.applicationFormDriver import ApplicationFormDriver, matchOption
+from utils.formFingerprintCache import FormFingerprintCache, FormStepResult
+from utils.linkedinWebDriverHelper import WebDriverHelper
+
+
+class FakeDriver:
+    def __init__(self, rawFields):
+        self.rawFields = rawFields
+        self.scriptCalls = []
+
+    def execute_script(self, script, *arguments):
+        self.scriptCalls.append((script, arguments))
+        if script == scripts.getApplicationFormSchemaScript:
+            return self.rawFields
+        return {answer["fieldId"]: True for answer in arguments[0]}
+
+
+class TestApplicationFormDriver(unittest.TestCase):
+    def setUp(self):
+        self.driver = FakeDriver([
+            {"fieldId": "0", "label": "Mobile phone number", "inputType": "text", "options": [], "value": "", "required": True},
+            {"fieldId": "1", "label": "City", "inputType": "text", "options": [], "value": "Berlin", "required": True},
+            {"fieldId": "2", "label": "Will you require sponsorship?", "inputType": "radio", "options": ["Yes", "No"], "value": "", "required": True},
+            {"fieldId": "3", "label": "Proficiency in English?", "inputType": "select",
+                "options": ["Select an option", "Conversational", "Native or bilingual"], "value": "", "required": False},
+            {"fieldId": "4", "label": "Favourite colour?", "inputType": "text", "options": [], "value": "", "required": False},
+        ])
+
+    def test_option_is_matched_exactly_then_by_prefix(self):
+        self.assertEqual(matchOption(["Yes", "No"], "no"), "No")
+        self.assertEqual(matchOption(["None", "Native or bilingual"], "Native"), "Native or bilingual")
+        self.assertIsNone(matchOption(["Yes", "No"], "Maybe"))
+        self.assertIsNone(matchOption(["Yes", "No"], ""))
+
+    def test_fields_are_read_in_one_call(self):
+        fields = ApplicationFormDriver(self.driver).readFields()
+
+        self.assertEqual(len(self.driver.scriptCalls), 1)
+        self.assertEqual([field.inputType for field in fields], ["text", "text", "radio", "select", "text"])
+        self.assertEqual(fields[2].options, ["Yes", "No"])
+        self.assertTrue(fields[0].required)
+
+    def test_step_is_filled_in_with_two_calls(self):
+        answers = {"Mobile phone number": "123", "Will you require sponsorship?": "no", "Proficiency in English?": "Native"}
+        with patch("repository_wrapper.get_answer_by_question", lambda question, section : answers.get(question)), \
+            patch("utils.sleeper.interact", lambda action, condition = None : action()), \
+            patch("utils.linkedinWebDriverHelper.getFormCache", lambda : FormFingerprintCache()):
+            self.assertEqual(WebDriverHelper(self.driver).handleQuestions(None), [])
+
+        self.assertEqual(len(self.driver.scriptCalls), 2)
+        script, arguments = self.driver.scriptCalls[1]
+        self.assertEqual(script, scripts.applyApplicationFormAnswersScript)
+        self.assertEqual(arguments[0], [
+            {"fieldId": "0", "inputType": "text", "value": "123"},
+            {"fieldId": "2", "inputType": "radio", "value": "No"},
+            {"fieldId": "3", "inputType": "select", "value": "Native or bilingual"}])
+
+    def test_step_with_unanswerable_required_questions_is_abandoned_before_filling_it_in(self):
+        formCache = FormFingerprintCache()
+        with patch("repository_wrapper.get_answer_by_question", lambda question, section : None), \
+            patch("utils.sleeper.runDuringNextPause", lambda task, taskName = None : None), \
+            patch("utils.linkedinWebDriverHelper.getFormCache", lambda : formCache):
+            self.assertEqual(WebDriverHelper(self.driver).handleQuestions(None), ["Mobile phone number", "Will you require sponsorship?"])
+            self.assertEqual(WebDriverHelper(self.driver).handleQuestions(None), ["Mobile phone number", "Will you require sponsorship?"])
+
+        self.assertEqual([script for script, _ in self.driver.scriptCalls], [scripts.getApplicationFormSchemaScript] * 2)
+        self.assertEqual(formCache.getStats()["hits"], 1)
+
+    def test_step_with_unanswerable_required_questions_is_left_open_when_harvesting_answers(self):
+        answers = {"Mobile phone number": "123"}
+        with patch("repository_wrapper.get_answer_by_question", lambda question, section : answers.get(question)), \
+            patch("utils.sleeper.interact", lambda action, condition = None : action()), \
+            patch("utils.sleeper.runDuringNextPause", lambda task, taskName = None : None), \
+            patch("utils.linkedinWebDriverHelper.getFormCache", lambda : FormFingerprintCache()), \
+            patch("config.harvestAnswers", True):
+            self.assertEqual(WebDriverHelper(self.driver).handleQuestions(None), [])
+
+        self.assertEqual([script for script, _ in self.driver.scriptCalls], [scripts.getApplicationFormSchemaScript, scripts.applyApplicationFormAnswersScript])
+
+    def test_form_blocked_before_is_rejected_without_filling_it_in(self):
+        formCache = FormFingerprintCache()
+        with patch("repository_wrapper.get_answer_by_question", lambda question, section : None), \
+            patch("utils.sleeper.interact", lambda action, condition = None : action()), \
+            patch("utils.sleeper.runDuringNextPause", lambda task, taskName = None : None), \
+            patch("utils.linkedinWebDriverHelper.getFormCache", lambda : formCache), \
+            patch("constants.abortOnUnansweredRequiredQuestions", False):
+            driverHelper = WebDriverHelper(self.driver)
+            self.assertEqual(driverHelper.handleQuestions(None), [])
+            driverHelper.markLastFormStepBlocked()
+
+            self.assertEqual(WebDriverHelper(self.driver).handleQuestions(None), ["Mobile phone number", "Will you require sponsorship?"])
+
+        self.assertEqual(len(self.driver.scriptCalls), 2)
+
+    def test_form_failing_without_empty_required_questions_is_only_skipped_a_few_times(self):
+        formCache = FormFingerprintCache()
+        answers = {"Mobile phone number": "12 34", "Will you require sponsorship?": "no"}
+        with patch("repository_wrapper.get_answer_by_question", lambda question, section : answers.get(question)), \
+            patch("utils.sleeper.interact", lambda action, condition = None : action()), \
+            patch("utils.sleeper.runDuringNextPause", lambda task, taskName = None : None), \
+            patch("utils.linkedinWebDriverHelper.getFormCache", lambda : formCache), \
+            patch("constants.formCacheUnknownFailureSkips", 1):
+            driverHelper = WebDriverHelper(self.driver)
+            self.assertEqual(driverHelper.handleQuestions(None), [])
+            # Ex: Linkedin rejected the format of the phone number, the empty optional questions are not to blame
+            driverHelper.markLastFormStepBlocked()
+
+            self.assertEqual(WebDriverHelper(self.driver).handleQuestions(None), ["unknown question"])
+            self.assertEqual(WebDriverHelper(self.driver).handleQuestions(None), [])
+
+        self.assertEqual([script for script, _ in self.driver.scriptCalls], [scripts.getApplicationFormSchemaScript, scripts.applyApplicationFormAnswersScript,
+            scripts.getApplicationFormSchemaScript, scripts.getApplicationFormSchemaScript, scripts.applyApplicationFormAnswersScript])
+
+    def test_failure_at_a_step_without_questions_does_not_skip_other_jobs(self):
+        formCache = FormFingerprintCache()
+        answers = {"Mobile phone number": "123", "Will you require sponsorship?": "no"}
+        with patch("repository_wrapper.get_answer_by_question", lambda question, section : answers.get(question)), \
+            patch("utils.sleeper.interact", lambda action, condition = None : action()), \
+            patch("utils.sleeper.runDuringNextPause", lambda task, taskName = None : None), \
+            patch("utils.linkedinWebDriverHelper.getFormCache", lambda : formCache):
+            driverHelper = WebDriverHelper(self.driver)
+            self.assertEqual(driverHelper.handleQuestions(None), [])
+            # Ex: the review step fails after the questions were filled in, neither step is to blame
+            self.driver.rawFields = []
+            self.assertEqual(driverHelper.handleQuestions(None), [])
+            driverHelper.markLastFormStepBlocked()
+
+            self.assertEqual(WebDriverHelper(self.driver).handleQuestions(None), [])
+            self.assertEqual(formCache.getStats()["entries"], 1)
+            self.assertEqual(formCache.getStats()["hits"], 0)
+
+    def test_values_not_filled_in_by_the_bot_are_harvested(self):
+        harvested = []
+        formCache = FormFingerprintCache()
+        formCache.put("other form", FormStepResult(answers = {"0": "123"}))
+        with patch("repository_wrapper.post_question", lambda question, answer, section : harvested.append((question, answer, section)) or True), \
+            patch("utils.linkedinWebDriverHelper.getFormCache", lambda : formCache), \
+            patch("config.harvestAnswers", True):
+            driverHelper = WebDriverHelper(self.driver)
+            driverHelper.lastFormStep = ("form", FormStepResult(answers = {"1": "Berlin"}), [])
+            self.driver.rawFields[4]["value"] = "Blue"
+            driverHelper.harvestAnswers()
+
+        self.assertEqual(harvested, [("Favourite colour?", "Blue", "inputField")])
+        self.assertEqual(formCache.getStats()["entries"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from utils.backendDispatcher import BackendDispatcher
+from utils.backendOutbox import BackendOutbox
+
+
+class TestBackendDispatcher(unittest.TestCase):
+    def test_calls_are_sent_in_batches_per_operation(self):
+        batches = []
+        dispatcher = BackendDispatcher(lambda operation, payloads : batches.append((operation, payloads)), batchWindow = 60)
+
+        dispatcher.submit("update_job", {"linkedin_job_id": "1"})
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "1"})
+        dispatcher.submit("update_job", {"linkedin_job_id": "2"})
+        self.assertTrue(dispatcher.flush(wait = True, timeout = 5))
+        dispatcher.close()
+
+        self.assertEqual(batches, [
+            ("update_job", [{"linkedin_job_id": "1"}, {"linkedin_job_id": "2"}]),
+            ("applied_to_job", [{"linkedin_job_id": "1"}])])
+        metrics = dispatcher.getMetrics()
+        self.assertEqual(metrics["delivered"], 3)
+        self.assertEqual(metrics["batches"], 1)
+        self.assertEqual(metrics["queueDepth"], 0)
+
+    def test_first_operations_are_sent_before_the_others(self):
+        batches = []
+        dispatcher = BackendDispatcher(lambda operation, payloads : batches.append((operation, payloads)), batchWindow = 60,
+            firstOperations = ["update_jobs"])
+
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "1"})
+        dispatcher.submit("update_jobs", {"linkedin_job_id": "2"})
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "2"})
+        self.assertTrue(dispatcher.flush(wait = True, timeout = 5))
+        dispatcher.close()
+
+        self.assertEqual(batches, [
+            ("update_jobs", [{"linkedin_job_id": "2"}]),
+            ("applied_to_job", [{"linkedin_job_id": "1"}, {"linkedin_job_id": "2"}])])
+
+    def test_full_batch_is_sent_without_waiting_for_window(self):
+        delivered = threading.Event()
+        dispatcher = BackendDispatcher(lambda operation, payloads : delivered.set(), batchWindow = 60, maxBatchSize = 2)
+
+        dispatcher.submit("update_job", {})
+        dispatcher.submit("update_job", {})
+
+        self.assertTrue(delivered.wait(5))
+        dispatcher.close()
+
+    def test_failed_batch_is_retried(self):
+        attempts = []
+
+        def sendBatch(operation, payloads):
+            attempts.append(list(payloads))
+            if len(attempts) == 1:
+                raise ConnectionError("Backend is down")
+
+        dispatcher = BackendDispatcher(sendBatch, batchWindow = 0, retryBackoff = 0.1)
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "1"})
+
+        self.assertTrue(dispatcher.flush(wait = True, timeout = 5))
+        dispatcher.close()
+        self.assertEqual(attempts, [[{"linkedin_job_id": "1"}], [{"linkedin_job_id": "1"}]])
+        self.assertEqual(dispatcher.getMetrics()["failedBatches"], 1)
+
+    def test_retries_of_an_old_batch_wait_for_the_backoff(self):
+        attemptTimes = []
+
+        def sendBatch(operation, payloads):
+            attemptTimes.append(time.monotonic())
+            if len(attemptTimes) <= 3:
+                raise ConnectionError("Backend is down")
+
+        dispatcher = BackendDispatcher(sendBatch, batchWindow = 0, retryBackoff = 0.1, maxRetryBackoff = 0.2)
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "1"})
+
+        self.assertTrue(dispatcher.flush(wait = True, timeout = 5))
+        dispatcher.close()
+        # The queued call is older than the backoff after the first failure, the retries are still spaced out
+        spacing = [later - earlier for earlier, later in zip(attemptTimes, attemptTimes[1:])]
+        self.assertEqual(len(spacing), 3)
+        for waited, backoff in zip(spacing, [0.1, 0.2, 0.2]):
+            self.assertGreaterEqual(waited, backoff * 0.9)
+
+    def test_operations_delivered_before_a_failure_are_not_sent_again(self):
+        batches = []
+
+        def sendBatch(operation, payloads):
+            batches.append(operation)
+            if batches == ["update_jobs", "applied_to_job"]:
+                raise ConnectionError("Backend is down")
+
+        dispatcher = BackendDispatcher(sendBatch, batchWindow = 0, retryBackoff = 0.1, firstOperations = ["update_jobs"])
+        dispatcher.submit("update_jobs", {"linkedin_job_id": "1"})
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "1"})
+        self.assertTrue(dispatcher.flush(wait = True, timeout = 5))
+        dispatcher.close()
+
+        self.assertEqual(batches, ["update_jobs", "applied_to_job", "applied_to_job"])
+        self.assertEqual(dispatcher.getMetrics()["delivered"], 2)
+
+    def test_call_failing_too_often_is_given_up_on(self):
+        attempts = []
+
+        def sendBatch(operation, payloads):
+            attempts.append(operation)
+            if operation == "post_question":
+                raise RuntimeError("Internal server error")
+
+        dispatcher = BackendDispatcher(sendBatch, batchWindow = 0, retryBackoff = 0.01, maxAttempts = 3)
+        dispatcher.submit("post_question", {"question": "City", "answer": None})
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "1"})
+        self.assertTrue(dispatcher.flush(wait = True, timeout = 5))
+        dispatcher.close()
+
+        self.assertEqual(attempts, ["post_question"] * 3 + ["applied_to_job"])
+        self.assertEqual(dispatcher.getMetrics()["deadLetters"], 1)
+
+
+class TestBackendOutbox(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "outbox.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_unacknowledged_entries_are_replayed(self):
+        outbox = BackendOutbox(self.path)
+        firstEntryId = outbox.record("update_job", {"linkedin_job_id": "1"})
+        outbox.record("applied_to_job", {"linkedin_job_id": "2"})
+        outbox.acknowledge([firstEntryId])
+        outbox.close()
+
+        reopenedOutbox = BackendOutbox(self.path)
+        self.assertEqual(reopenedOutbox.getUndeliveredEntries(), [(1, "applied_to_job", {"linkedin_job_id": "2"})])
+        reopenedOutbox.close()
+
+    def test_cut_off_last_line_is_ignored(self):
+        outbox = BackendOutbox(self.path)
+        outbox.record("update_job", {"linkedin_job_id": "1"})
+        outbox.close()
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write('{"id": 2, "operation": "upd')
+
+        reopenedOutbox = BackendOutbox(self.path)
+        self.assertEqual(len(reopenedOutbox.getUndeliveredEntries()), 1)
+        reopenedOutbox.close()
+
+    def test_dispatcher_replays_undelivered_updates(self):
+        def failingSend(operation, payloads):
+            raise ConnectionError("Backend is down")
+
+        dispatcher = BackendDispatcher(failingSend, batchWindow = 0, retryBackoff = 10, outbox = BackendOutbox(self.path))
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "1"})
+        dispatcher.close(timeout = 0.2)
+
+        batches = []
+        dispatcher = BackendDispatcher(lambda operation, payloads : batches.append((operation, payloads)), batchWindow = 0, outbox = BackendOutbox(self.path))
+        self.assertTrue(dispatcher.flush(wait = True, timeout = 5))
+        dispatcher.close()
+
+        self.assertEqual(batches, [("applied_to_job", [{"linkedin_job_id": "1"}])])
+        reopenedOutbox = BackendOutbox(self.path)
+        self.assertEqual(reopenedOutbox.getUndeliveredEntries(), [])
+        reopenedOutbox.close()
+
+    def test_rejected_calls_are_moved_to_the_dead_letters(self):
+        deadLetterPath = os.path.join(self.directory.name, "dead_letters.jsonl")
+        batches = []
+
+        def sendBatch(operation, payloads):
+            batches.append([payload["linkedin_job_id"] for payload in payloads])
+            if any(payload["linkedin_job_id"] == "bad" for payload in payloads):
+                raise ValueError("Invalid job id")
+
+        dispatcher = BackendDispatcher(sendBatch, batchWindow = 0, retryBackoff = 10, outbox = BackendOutbox(self.path, deadLetterPath))
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "1"})
+        dispatcher.submit("applied_to_job", {"linkedin_job_id": "bad"})
+        self.assertTrue(dispatcher.flush(wait = True, timeout = 5))
+        dispatcher.close()
+
+        # The rejected batch is split up so only the bad call is given up on, without waiting for a retry
+        self.assertEqual(batches, [["1", "bad"], ["1"], ["bad"]])
+        with open(deadLetterPath, encoding="utf-8") as file:
+            deadLetters = [json.loads(line) for line in file]
+        self.assertEqual([(deadLetter["operation"], deadLetter["payload"]) for deadLetter in deadLetters], [("applied_to_job", {"linkedin_job_id": "bad"})])
+        reopenedOutbox = BackendOutbox(self.path)
+        self.assertEqual(reopenedOutbox.getUndeliveredEntries(), [])
+        reopenedOutbox.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
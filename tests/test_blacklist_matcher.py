@@ -0,0 +1,59 @@
+import unittest
+
+from utils.blacklistMatcher import AhoCorasickAutomaton, BlacklistMatcher
+
+
+class TestBlacklistMatcher(unittest.TestCase):
+    def test_company_is_compared_for_equality(self):
+        matcher = BlacklistMatcher(companies = [" Crossover ", "EPAM Anywhere"])
+
+        self.assertTrue(matcher.isCompanyBlacklisted("crossover"))
+        self.assertTrue(matcher.isCompanyBlacklisted("EPAM Anywhere "))
+        self.assertFalse(matcher.isCompanyBlacklisted("Crossover Health"))
+        self.assertFalse(matcher.isCompanyBlacklisted(""))
+
+    def test_title_contains_blacklisted_keyword(self):
+        matcher = BlacklistMatcher(titles = ["Web Developer", ".Net", "manager"])
+
+        self.assertTrue(matcher.isTitleBlacklisted("Senior Web Developer"))
+        self.assertTrue(matcher.isTitleBlacklisted("C#/.NET Engineer"))
+        self.assertTrue(matcher.isTitleBlacklisted("Engineering Manager"))
+        self.assertFalse(matcher.isTitleBlacklisted("Data Engineer"))
+
+    def test_empty_blacklists_match_nothing(self):
+        matcher = BlacklistMatcher(companies = [""], titles = ["", "  "])
+
+        self.assertFalse(matcher.isCompanyBlacklisted("Google"))
+        self.assertFalse(matcher.isTitleBlacklisted("Data Engineer"))
+
+    def test_patterns(self):
+        matcher = BlacklistMatcher(companyPatterns = [r"^jobot"], titlePatterns = [r"\bsenior\b", r"\(contract\)"])
+
+        self.assertTrue(matcher.isCompanyBlacklisted("Jobot Consulting"))
+        self.assertTrue(matcher.isTitleBlacklisted("Senior Data Scientist"))
+        self.assertTrue(matcher.isTitleBlacklisted("Data Scientist (Contract)"))
+        self.assertFalse(matcher.isTitleBlacklisted("Seniority Analyst"))
+
+    def test_automaton_finds_overlapping_keywords(self):
+        automaton = AhoCorasickAutomaton(["devops", "ops engineer", "she", "hers"])
+
+        self.assertTrue(automaton.containsAny("cloud ops engineer"))
+        self.assertTrue(automaton.containsAny("ushers"))
+        self.assertTrue(automaton.containsAny("devop devops"))
+        self.assertFalse(automaton.containsAny("devop engineer"))
+
+    def test_automaton_matches_same_as_substring_search(self):
+        keywords = ["ab", "bc", "abcd", "c", "xyz"]
+        automaton = AhoCorasickAutomaton(keywords)
+
+        for text in ["", "a", "abd", "xbx", "zzabzz", "xyxyz", "bbbbc", "dddd"]:
+            self.assertEqual(automaton.containsAny(text), any(keyword in text for keyword in keywords), text)
+
+    def test_automaton_finds_every_occurrence(self):
+        automaton = AhoCorasickAutomaton(["he", "she", "hers"])
+
+        self.assertEqual(sorted(automaton.findAll("ushers she")), [(1, 1), (2, 0), (2, 2), (7, 1), (8, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
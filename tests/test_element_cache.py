@@ -0,0 +1,55 @@
+import unittest
+from selenium.webdriver.common.by import By
+
+from utils.linkedinWebDriverHelper import WebDriverHelper
+
+
+class FakeDriver:
+    def __init__(self, elements):
+        self.elements = elements
+        self.findElementsCalls = 0
+
+    def find_elements(self, by, value):
+        self.findElementsCalls += 1
+        return self.elements.get(value, [])
+
+
+class TestElementCache(unittest.TestCase):
+    def setUp(self):
+        self.driver = FakeDriver({"button.next": ["next-button"]})
+        self.driverHelper = WebDriverHelper(self.driver)
+
+    def test_find_returns_element_or_none(self):
+        self.assertEqual(self.driverHelper.find(self.driver, By.CSS_SELECTOR, "button.next"), "next-button")
+        self.assertIsNone(self.driverHelper.find(self.driver, By.CSS_SELECTOR, "button.submit"))
+
+    def test_repeated_lookups_are_served_from_cache(self):
+        self.assertTrue(self.driverHelper.exists(self.driver, By.CSS_SELECTOR, "button.next"))
+        self.assertEqual(self.driverHelper.find(self.driver, By.CSS_SELECTOR, "button.next"), "next-button")
+        self.assertTrue(self.driverHelper.exists(self.driver, By.CSS_SELECTOR, "button.next"))
+
+        self.assertEqual(self.driver.findElementsCalls, 1)
+        stats = self.driverHelper.getElementCacheStats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertAlmostEqual(stats["hitRate"], 2 / 3)
+
+    def test_missing_elements_are_looked_up_again(self):
+        self.assertFalse(self.driverHelper.exists(self.driver, By.CSS_SELECTOR, "button.submit"))
+        # The button appears after typing, without a navigation or click invalidating the cache
+        self.driver.elements["button.submit"] = ["submit-button"]
+
+        self.assertTrue(self.driverHelper.exists(self.driver, By.CSS_SELECTOR, "button.submit"))
+        self.assertEqual(self.driver.findElementsCalls, 2)
+
+    def test_invalidating_cache_repeats_lookup(self):
+        self.assertTrue(self.driverHelper.exists(self.driver, By.CSS_SELECTOR, "button.next"))
+        self.driver.elements["button.next"] = []
+        self.driverHelper.invalidateElementCache()
+
+        self.assertFalse(self.driverHelper.exists(self.driver, By.CSS_SELECTOR, "button.next"))
+        self.assertEqual(self.driver.findElementsCalls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
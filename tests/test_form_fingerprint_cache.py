@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from models import FormField
+from utils.formFingerprintCache import FormFingerprintCache, FormStepResult, fingerprintForm
+
+
+class TestFormFingerprintCache(unittest.TestCase):
+    def test_fingerprint_depends_on_questions_only(self):
+        fields = [FormField(fieldId = "0", label = "Phone number", inputType = "text"),
+            FormField(fieldId = "1", label = "Sponsorship?", inputType = "radio", options = ["Yes", "No"])]
+        sameQuestions = [FormField(fieldId = "0", label = " phone  NUMBER", inputType = "text", value = "123"),
+            FormField(fieldId = "1", label = "Sponsorship?", inputType = "radio", options = ["Yes", "No"], required = True)]
+        otherQuestions = [FormField(fieldId = "0", label = "Phone number", inputType = "textarea")] + fields[1:]
+
+        self.assertEqual(fingerprintForm(fields), fingerprintForm(sameQuestions))
+        self.assertNotEqual(fingerprintForm(fields), fingerprintForm(otherQuestions))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = FormFingerprintCache(maxEntries = 2)
+        cache.put("a", FormStepResult())
+        cache.put("b", FormStepResult())
+        cache.get("a")
+        cache.put("c", FormStepResult())
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.getStats(), {"hits": 2, "misses": 1, "hitRate": 2 / 3, "entries": 2, "evictions": 1})
+
+    def test_cache_is_saved_and_discarded_for_other_answers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "forms", "cache.json")
+            cache = FormFingerprintCache(path, version = "1")
+            cache.put("a", FormStepResult(answers = {"0": "123"}, unansweredRequiredLabels = ["City"], outcome = "blocked"))
+            cache.save()
+
+            self.assertEqual(FormFingerprintCache(path, version = "1").get("a"),
+                FormStepResult(answers = {"0": "123"}, unansweredRequiredLabels = ["City"], outcome = "blocked"))
+            self.assertIsNone(FormFingerprintCache(path, version = "2").get("a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import random
+import string
+import unittest
+
+from utils.fuzzyQuestionMatcher import FuzzyQuestionMatcher, characterNgrams
+
+
+class TestFuzzyQuestionMatcher(unittest.TestCase):
+    def setUp(self):
+        self.keys = ["Python", "Desired salary", "Notice period", "Phone Number", "Typescript"]
+        self.matcher = FuzzyQuestionMatcher(self.keys)
+
+    def test_key_inside_longer_label_scores_high(self):
+        index, score = self.matcher.getBestMatch("How many years of work experience do you have with Python?", 0.7)
+
+        self.assertEqual(self.keys[index], "Python")
+        self.assertAlmostEqual(score, 1, places = 5)
+
+    def test_misspelled_key_is_matched(self):
+        index, _ = self.matcher.getBestMatch("What is your desired salry?", 0.7)
+
+        self.assertEqual(self.keys[index], "Desired salary")
+
+    def test_unrelated_label_is_below_threshold(self):
+        self.assertIsNone(self.matcher.getBestMatch("Completely unrelated words here", 0.7))
+        self.assertIsNone(FuzzyQuestionMatcher([]).getBestMatch("Python", 0.7))
+
+    def test_scores_match_naive_sum_over_postings(self):
+        label = "years with python and typescript, notice"
+        scores = self.matcher.getScores(label)
+
+        for keyIndex in range(len(self.keys)):
+            expected = sum(float(self.matcher.postingWeights[position])
+                for ngram in characterNgrams(label, 3) if ngram in self.matcher.vocabulary
+                for position in range(self.matcher.postingOffsets[self.matcher.vocabulary[ngram]], self.matcher.postingOffsets[self.matcher.vocabulary[ngram] + 1])
+                if self.matcher.postingKeys[position] == keyIndex)
+            self.assertAlmostEqual(scores[keyIndex], expected, places = 5)
+
+    # The timing of this case is measured by benchmarks/fuzzyQuestionMatching.py
+    def test_key_is_found_among_thousands_of_keys(self):
+        generator = random.Random(0)
+        keys = self.keys + ["".join(generator.choice(string.ascii_lowercase + " ") for _ in range(generator.randint(5, 40))) for _ in range(5000)]
+        matcher = FuzzyQuestionMatcher(keys)
+
+        index, score = matcher.getBestMatch("How many years of work experience do you have with Python?", 0.7)
+
+        self.assertEqual(keys[index], "Python")
+        self.assertAlmostEqual(score, 1, places = 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
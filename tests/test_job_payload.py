@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+import models
+import repository_wrapper
+import utils.jobPayload as jobPayload
+from utils.jobStateStore import JobStateStore
+
+
+class TestJobPayload(unittest.TestCase):
+    def setUp(self):
+        self.job = models.Job(linkedin_job_id="1", title="Engineer", company="Company", location="Berlin",
+            description="Description", workplace_type="Remote", posted_date="2024-01-01", applicants_at_time_of_applying="10")
+
+    def test_small_description_is_sent_as_is(self):
+        payload = jobPayload.encodeJob(self.job, compressAbove = 1024)
+
+        self.assertEqual(payload["description"], "Description")
+        self.assertEqual(payload["description_hash"], jobPayload.descriptionHash("Description"))
+        self.assertEqual(jobPayload.decodeJob(payload)["description"], "Description")
+
+    def test_large_description_is_compressed(self):
+        self.job.description = "Long description with ünicode " * 500
+        payload = jobPayload.encodeJob(self.job, compressAbove = 1024)
+
+        self.assertNotIn("description", payload)
+        self.assertLess(len(payload["description_zlib"]), len(self.job.description))
+        self.assertEqual(models.Job(**jobPayload.decodeJob(payload)), self.job)
+
+    def test_unchanged_description_is_left_out(self):
+        payload = jobPayload.encodeJob(self.job, includeDescription = False)
+
+        self.assertNotIn("description", payload)
+        self.assertNotIn("description_zlib", payload)
+        self.assertNotIn("description", jobPayload.decodeJob(payload))
+
+
+class TestSentDescriptions(unittest.TestCase):
+    def setUp(self):
+        self.job = models.Job(linkedin_job_id="1", title="Engineer", company="Company", location="Berlin",
+            description="Description", workplace_type="Remote", posted_date="2024-01-01", applicants_at_time_of_applying="10")
+        self.store = JobStateStore(":memory:")
+        self.backend = mock.Mock()
+        patchers = [mock.patch.object(repository_wrapper, "state_store", self.store), mock.patch.object(repository_wrapper, "backend_api", self.backend)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_description_is_sent_again_until_the_backend_accepts_it(self):
+        self.backend.update_jobs.side_effect = ConnectionError("Backend is down")
+        payloads = repository_wrapper.encode_jobs([self.job])
+        with self.assertRaises(ConnectionError):
+            repository_wrapper.send_batch("update_jobs", payloads)
+
+        self.assertIn("description", repository_wrapper.encode_jobs([self.job])[0])
+
+        self.backend.update_jobs.side_effect = None
+        repository_wrapper.send_batch("update_jobs", payloads)
+
+        self.assertNotIn("description", repository_wrapper.encode_jobs([self.job])[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
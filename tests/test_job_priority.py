@@ -0,0 +1,38 @@
+import unittest
+
+from models import JobForVerification
+import utils.jobPriority as jobPriority
+
+
+class TestJobPriority(unittest.TestCase):
+    def test_posted_date_to_hours(self):
+        self.assertEqual(jobPriority.postedDateToHours("3 days ago"), 72)
+        self.assertEqual(jobPriority.postedDateToHours("Reposted 2 weeks ago"), 336)
+        self.assertEqual(jobPriority.postedDateToHours("30 minutes ago"), 0.5)
+        self.assertIsNone(jobPriority.postedDateToHours(""))
+
+    def test_applicants_to_number(self):
+        self.assertEqual(jobPriority.applicantsToNumber("Over 100 applicants"), 100)
+        self.assertEqual(jobPriority.applicantsToNumber("1,204 applicants"), 1204)
+        self.assertEqual(jobPriority.applicantsToNumber("Be an early applicant"), 0)
+        self.assertIsNone(jobPriority.applicantsToNumber(""))
+
+    def test_title_match_is_the_best_share_of_matched_words(self):
+        job = JobForVerification("1", "Senior Data Scientist (Python)", "Acme", "")
+
+        self.assertEqual(jobPriority.getTitleMatchScore(job, ["data scientist", "python developer"]), 1.0)
+        self.assertEqual(jobPriority.getTitleMatchScore(job, ["data engineer", "python developer"]), 0.5)
+        self.assertEqual(jobPriority.getTitleMatchScore(job, []), 0.0)
+
+    def test_fresh_job_with_few_applicants_comes_first(self):
+        freshJob = JobForVerification("1", "Data Scientist", "Acme", "Remote", postedDate = "2 hours ago", applicants = "Be an early applicant")
+        oldJob = JobForVerification("2", "Data Scientist", "Acme", "Remote", postedDate = "3 weeks ago", applicants = "Over 100 applicants")
+        unknownJob = JobForVerification("3", "Data Scientist", "Acme", "Remote")
+
+        self.assertGreater(jobPriority.getJobPriority(freshJob), jobPriority.getJobPriority(unknownJob))
+        self.assertGreater(jobPriority.getJobPriority(unknownJob), jobPriority.getJobPriority(oldJob))
+        self.assertTrue(0 <= jobPriority.getJobPriority(oldJob) <= jobPriority.getJobPriority(freshJob) <= 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from models import JobForVerification
+from utils.jobQueue import JobQueue
+
+
+class TestJobQueue(unittest.TestCase):
+    def test_job_found_by_several_searches_is_queued_once(self):
+        jobQueue = JobQueue()
+        firstSearch = [JobForVerification("1", "Data Scientist", "Acme", "Remote"), JobForVerification("2", "Data Engineer", "Globex", "")]
+        secondSearch = [JobForVerification("2", "Data Engineer", "Globex", ""), JobForVerification("3", "ML Engineer", "Initech", "Hybrid")]
+
+        self.assertEqual(jobQueue.addAll(firstSearch), 2)
+        self.assertEqual(jobQueue.addAll(secondSearch), 1)
+
+        self.assertEqual(len(jobQueue), 3)
+        self.assertEqual(jobQueue.duplicates, 1)
+        self.assertEqual([jobQueue.pop().linkedinJobId for _ in range(3)], ["1", "2", "3"])
+        self.assertIsNone(jobQueue.pop())
+
+    def test_popped_job_is_not_queued_again(self):
+        jobQueue = JobQueue()
+        jobQueue.add(JobForVerification("1", "Data Scientist", "Acme", "Remote"))
+        jobQueue.pop()
+
+        self.assertFalse(jobQueue.add(JobForVerification("1", "Data Scientist", "Acme", "Remote")))
+        self.assertEqual(len(jobQueue), 0)
+
+    def test_restored_queue_keeps_seen_jobs(self):
+        jobQueue = JobQueue()
+        jobQueue.addAll([JobForVerification("1", "Data Scientist", "Acme", "Remote"), JobForVerification("2", "Data Engineer", "Globex", "")])
+        jobQueue.pop()
+        content = jobQueue.toDict()
+
+        restoredQueue = JobQueue([JobForVerification(**job) for job in content["jobs"]], content["seenJobIds"])
+
+        self.assertEqual(len(restoredQueue), 1)
+        self.assertFalse(restoredQueue.add(JobForVerification("1", "Data Scientist", "Acme", "Remote")))
+        self.assertEqual(restoredQueue.pop().linkedinJobId, "2")
+
+    def test_highest_priority_job_is_taken_first(self):
+        jobQueue = JobQueue(priority = lambda job : len(job.applicants))
+        jobQueue.addAll([JobForVerification("1", "Data Scientist", "Acme", "", applicants = "a"),
+            JobForVerification("2", "Data Engineer", "Globex", "", applicants = "aaa"),
+            JobForVerification("3", "ML Engineer", "Initech", "", applicants = "aa"),
+            JobForVerification("4", "Data Analyst", "Hooli", "", applicants = "aa")])
+
+        self.assertEqual([jobQueue.pop().linkedinJobId for _ in range(4)], ["2", "3", "4", "1"])
+
+    def test_job_found_again_is_reprioritized(self):
+        jobQueue = JobQueue(priority = lambda job : 1.0 if job.postedDate else 0.0)
+        jobQueue.addAll([JobForVerification("1", "Data Scientist", "Acme", "Remote"), JobForVerification("2", "Data Engineer", "Globex", "")])
+
+        self.assertFalse(jobQueue.add(JobForVerification("2", "Data Engineer", "Globex", "", postedDate = "1 hour ago")))
+        self.assertFalse(jobQueue.add(JobForVerification("1", "Data Scientist", "Acme", "")))
+
+        self.assertEqual(len(jobQueue), 2)
+        self.assertEqual((jobQueue.duplicates, jobQueue.reprioritized), (2, 1))
+        firstJob = jobQueue.pop()
+        self.assertEqual((firstJob.linkedinJobId, firstJob.postedDate), ("2", "1 hour ago"))
+        # What the new card does not show is kept
+        self.assertEqual(jobQueue.pop().workplaceType, "Remote")
+        self.assertIsNone(jobQueue.pop())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from models import Job, JobForVerification, JobOutcome
+from utils.jobStateStore import JobStateStore
+
+
+class TestJobStateStore(unittest.TestCase):
+    def setUp(self):
+        self.store = JobStateStore(":memory:")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_jobs_with_outcome_are_known(self):
+        self.store.markSeen([
+            JobForVerification(linkedinJobId = "1", title = "Data Scientist", company = "Acme", workplaceType = "Remote"),
+            JobForVerification(linkedinJobId = "2", title = "Data Engineer", company = "Globex", workplaceType = "")])
+        self.store.setOutcome("1", JobOutcome.APPLIED)
+        self.store.setOutcome("3", JobOutcome.SKIPPED_BLACKLISTED)
+
+        knownJobIds = self.store.getJobIdsWithOutcome(["1", "2", "3", "4"], ["applied", "blacklisted"])
+
+        self.assertEqual(knownJobIds, {"1", "3"})
+
+    def test_only_requested_outcomes_are_known(self):
+        self.store.setOutcome("1", JobOutcome.SKIPPED_UNANSWERED_QUESTIONS)
+
+        self.assertEqual(self.store.getJobIdsWithOutcome(["1"], [JobOutcome.APPLIED]), set())
+        self.assertEqual(self.store.getJobIdsWithOutcome(["1"], []), set())
+        self.assertEqual(self.store.getJobIdsWithOutcome([], [JobOutcome.APPLIED]), set())
+
+    def test_jobs_skipped_for_unanswered_questions_are_known_until_the_answers_change(self):
+        self.store.setOutcome("1", JobOutcome.SKIPPED_UNANSWERED_QUESTIONS, "answers 1")
+        self.store.setOutcome("2", JobOutcome.SKIPPED_BLACKLISTED, "answers 1")
+        outcomes = [JobOutcome.SKIPPED_UNANSWERED_QUESTIONS, JobOutcome.SKIPPED_BLACKLISTED]
+
+        self.assertEqual(self.store.getJobIdsWithOutcome(["1", "2"], outcomes, "answers 1"), {"1", "2"})
+        self.assertEqual(self.store.getJobIdsWithOutcome(["1", "2"], outcomes, "answers 2"), {"2"})
+        self.assertEqual(self.store.getJobIdsWithOutcome(["1", "2"], outcomes), {"1", "2"})
+
+    def test_store_without_answers_versions_is_upgraded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "jobs.sqlite3")
+            connection = sqlite3.connect(path)
+            connection.execute("""CREATE TABLE jobs (linkedin_job_id TEXT PRIMARY KEY, outcome TEXT, first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL, outcome_at REAL, title TEXT NOT NULL DEFAULT '', company TEXT NOT NULL DEFAULT '',
+                location TEXT NOT NULL DEFAULT '', description TEXT NOT NULL DEFAULT '', workplace_type TEXT NOT NULL DEFAULT '',
+                posted_date TEXT NOT NULL DEFAULT '', applicants_at_time_of_applying TEXT NOT NULL DEFAULT '')""")
+            connection.execute("INSERT INTO jobs (linkedin_job_id, outcome, first_seen, last_seen) VALUES ('1', 'unanswered_questions', 0, 0)")
+            connection.commit()
+            connection.close()
+
+            store = JobStateStore(path)
+            # Skipped before the versions were kept, so with other answers
+            self.assertEqual(store.getJobIdsWithOutcome(["1"], [JobOutcome.SKIPPED_UNANSWERED_QUESTIONS], "answers 1"), set())
+            store.setOutcome("1", JobOutcome.SKIPPED_UNANSWERED_QUESTIONS, "answers 1")
+            self.assertEqual(store.getJobIdsWithOutcome(["1"], [JobOutcome.SKIPPED_UNANSWERED_QUESTIONS], "answers 1"), {"1"})
+            store.close()
+
+    def test_saving_job_keeps_outcome(self):
+        self.store.setOutcome("1", JobOutcome.APPLIED)
+        self.store.saveJob(Job(title = "Data Scientist", company = "Acme", linkedin_job_id = "1"))
+
+        self.assertEqual(self.store.getOutcome("1"), JobOutcome.APPLIED)
+        self.assertIsNone(self.store.getOutcome("2"))
+        row = self.store.connection.execute("SELECT title, company FROM jobs WHERE linkedin_job_id = '1'").fetchone()
+        self.assertEqual(row, ("Data Scientist", "Acme"))
+
+    def test_sent_description_hashes_are_remembered(self):
+        self.store.setSentDescriptionHashes({"1": "a", "2": "b"})
+        self.store.setSentDescriptionHashes({"2": "c"})
+
+        self.assertEqual(self.store.getSentDescriptionHashes(["1", "2", "3"]), {"1": "a", "2": "c"})
+        self.assertEqual(self.store.getSentDescriptionHashes([]), {})
+
+    def test_search_watermark_only_moves_forward(self):
+        self.assertIsNone(self.store.getSearchWatermark("search"))
+
+        self.store.setSearchWatermark("search", 20)
+        self.store.setSearchWatermark("search", 10)
+        self.store.setSearchWatermark("other search", 5)
+
+        self.assertEqual(self.store.getSearchWatermark("search"), 20)
+        self.assertEqual(self.store.getSearchWatermark("other search"), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
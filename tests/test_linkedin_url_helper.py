@@ -0,0 +1,29 @@
+import unittest
+
+import constants
+import utils.linkedinUrlHelper as urlHelper
+
+
+class TestLinkedinUrlHelper(unittest.TestCase):
+    searchUrl = "https://www.linkedin.com/jobs/search/?f_AL=true&keywords=python&location=Berlin&sortBy=DD"
+
+    def test_first_page_is_the_search_url(self):
+        self.assertEqual(urlHelper.getSearchResultPageUrl(self.searchUrl, 0), self.searchUrl)
+
+    def test_page_url_has_a_single_start(self):
+        pageUrl = urlHelper.getSearchResultPageUrl(self.searchUrl, 2)
+        self.assertEqual(pageUrl, self.searchUrl + "&start=" + str(2 * constants.jobsPerPage))
+        self.assertEqual(pageUrl.count("&start="), 1)
+
+    def test_start_of_an_earlier_page_is_replaced(self):
+        previousPageUrl = urlHelper.getSearchResultPageUrl(self.searchUrl, 1)
+        pageUrl = urlHelper.getSearchResultPageUrl(previousPageUrl, 3)
+        self.assertEqual(pageUrl, self.searchUrl + "&start=" + str(3 * constants.jobsPerPage))
+        self.assertEqual(urlHelper.getSearchResultPageUrl(previousPageUrl, 0), self.searchUrl)
+
+    def test_keywords_are_kept(self):
+        pageUrl = urlHelper.getSearchResultPageUrl(self.searchUrl, 5)
+        self.assertEqual(urlHelper.urlToKeywords(pageUrl), ["python", "Berlin"])
+
+if __name__ == '__main__':
+    unittest.main()
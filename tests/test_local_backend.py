@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import local_backend.client as client
+import models
+import utils.jobPayload as jobPayload
+from local_backend.server import LocalBackendServer
+from utils.backendDispatcher import isPermanentError
+
+
+class TestLocalBackend(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = LocalBackendServer("127.0.0.1", 0, os.path.join(self.directory.name, "backend.sqlite3"))
+        self.server.startInBackground()
+        client.configure(self.server.getUrl(), poolSize = 2)
+
+    def tearDown(self):
+        client.getClient().close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def createJob(self, linkedinJobId: str) -> models.Job:
+        return models.Job(linkedin_job_id=linkedinJobId, title="Engineer", company="Company", location="Berlin",
+            description="Description", workplace_type="Remote", posted_date="2024-01-01", applicants_at_time_of_applying="10")
+
+    def test_applied_jobs_are_not_returned_by_verify_jobs(self):
+        jobs = [models.JobForVerification(linkedinJobId=jobId, title="Engineer", company="Company", workplaceType="Remote") for jobId in ["1", "2"]]
+        self.assertEqual(client.verify_jobs(jobs), jobs)
+
+        client.applied_to_job("1")
+
+        self.assertEqual(client.verify_jobs(jobs), jobs[1:])
+        self.assertEqual(self.server.store.getOutcome("1"), models.JobOutcome.APPLIED)
+
+    def test_jobs_and_resumes_are_stored(self):
+        client.update_job_with_job_properties(self.createJob("1"))
+        client.update_jobs_with_job_properties([self.createJob("2"), self.createJob("3")])
+        client.attached_resume_to_job("2", "resume.pdf")
+
+        rows = self.server.store.connection.execute("SELECT linkedin_job_id, title FROM jobs ORDER BY linkedin_job_id").fetchall()
+        self.assertEqual(rows, [("1", "Engineer"), ("2", "Engineer"), ("3", "Engineer")])
+        self.assertEqual(self.server.store.getResume("2"), "resume.pdf")
+
+    def test_upsert_keeps_description_left_out_as_unchanged(self):
+        job = self.createJob("1")
+        job.description = "Long description " * 500
+        client.update_jobs([jobPayload.encodeJob(job, compressAbove = 1024)])
+
+        job.title = "Senior Engineer"
+        client.update_jobs([jobPayload.encodeJob(job, includeDescription = False)])
+
+        row = self.server.store.connection.execute("SELECT title, description FROM jobs WHERE linkedin_job_id = '1'").fetchone()
+        self.assertEqual(row, ("Senior Engineer", job.description))
+
+    def test_connections_are_reused(self):
+        for _ in range(10):
+            client.applied_to_jobs(["1"])
+
+        self.assertEqual(client.getClient().connectionsOpened, 1)
+
+    def test_invalid_request_raises(self):
+        with self.assertRaises(client.BackendRequestError) as raised:
+            client.getClient().postJson("/jobs", {"job": {"unknown": "field"}})
+
+        # The dispatcher gives up on the call instead of retrying it forever
+        self.assertEqual(raised.exception.status, 400)
+        self.assertTrue(isPermanentError(raised.exception))
+
+
+class FakeConnection:
+    opened = []
+
+    def __init__(self, *arguments, **keywordArguments):
+        self.closed = False
+        FakeConnection.opened.append(self)
+
+    def request(self, method, path, body = None, headers = None):
+        raise ConnectionRefusedError("Backend is down")
+
+    def close(self):
+        self.closed = True
+
+
+class TestPooledHttpClient(unittest.TestCase):
+    def test_connections_are_closed_when_the_retry_fails(self):
+        pooledClient = client.PooledHttpClient("http://127.0.0.1:9", poolSize = 1)
+        # An idle connection the server closed, then the retry on a new connection fails as well
+        FakeConnection.opened = []
+        pooledClient.idleConnections.put_nowait(FakeConnection())
+
+        with mock.patch("http.client.HTTPConnection", FakeConnection), self.assertRaises(ConnectionRefusedError):
+            pooledClient.postJson("/jobs/applied", {"linkedin_job_ids": ["1"]})
+
+        self.assertEqual([connection.closed for connection in FakeConnection.opened], [True, True])
+        self.assertTrue(pooledClient.idleConnections.empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import constants
+import utils.logger as logger
+from utils.logger import MessageTypes
+
+
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.logFilePath = os.path.join(self.directory.name, "logs", "bot.jsonl")
+
+    def tearDown(self):
+        logger.flush()
+        self.directory.cleanup()
+
+    def test_message_is_not_built_below_level(self):
+        buildMessage = mock.Mock(return_value = "expensive message")
+
+        with mock.patch.object(constants, "consoleLogLevel", "WARNING"), mock.patch.object(constants, "fileLogLevel", "WARNING"):
+            logger.logDebugMessage(buildMessage, MessageTypes.DEBUG)
+
+        buildMessage.assert_not_called()
+
+    def test_message_is_built_when_logged(self):
+        buildMessage = mock.Mock(return_value = "expensive message")
+
+        with mock.patch.object(constants, "fileLogLevel", "DEBUG"), mock.patch.object(constants, "logFilePath", self.logFilePath):
+            logger.logDebugMessage(buildMessage, MessageTypes.DEBUG)
+
+        buildMessage.assert_called_once()
+
+    def test_sampling_keeps_every_nth_message(self):
+        buildMessage = mock.Mock(return_value = "sampled message")
+
+        with mock.patch.object(constants, "logSampleRates", {"DEBUG": 0.25}), mock.patch.object(constants, "fileLogLevel", "DEBUG"):
+            for _ in range(8):
+                logger.logDebugMessage(buildMessage, MessageTypes.DEBUG)
+
+        self.assertEqual(buildMessage.call_count, 2)
+
+    def test_file_is_opened_at_the_configured_path_when_first_written(self):
+        with mock.patch.object(constants, "logFilePath", self.logFilePath), mock.patch.object(constants, "fileLogLevel", "INFO"):
+            self.assertFalse(os.path.exists(self.logFilePath))
+            logger.logDebugMessage("debug message", MessageTypes.DEBUG)
+            logger.logDebugMessage("info message", MessageTypes.INFO, fields = {"jobId": 1})
+            logger.flush()
+
+        with open(self.logFilePath, encoding = "utf-8") as file:
+            entries = [json.loads(line) for line in file]
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["message"], "info message")
+        self.assertEqual(entries[0]["fields"], {"jobId": "1"})
+
+
+if __name__ == '__main__':
+    unittest.main()
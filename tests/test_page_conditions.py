@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+
+import constants
+from utils.linkedinWebDriverHelper import PageConditions, WebDriverHelper
+
+
+class FakeButton:
+    def __init__(self, driver, name, removes = ()):
+        self.driver = driver
+        self.name = name
+        self.removes = removes
+
+    def click(self):
+        self.driver.clicks.append(self.name)
+        for selector in self.removes:
+            self.driver.elements.pop(selector, None)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.elements = {constants.jobApplicationHeaderXPATH: ["header"]}
+        self.clicks = []
+
+    def find_elements(self, by, value):
+        return self.elements.get(value, [])
+
+
+class TestPageConditions(unittest.TestCase):
+    def setUp(self):
+        self.driver = FakeDriver()
+        self.driverHelper = WebDriverHelper(self.driver)
+        self.waits = []
+
+    # Records whether the condition of every interaction was met right after its action
+    def interact(self, action, condition = None):
+        result = action()
+        self.waits.append(condition() if condition is not None else None)
+        return result
+
+    def test_modal_closed_condition_waits_for_the_header_to_disappear(self):
+        modalClosed = self.driverHelper.getCondition(PageConditions.APPLICATION_MODAL_CLOSED)
+
+        self.assertFalse(modalClosed())
+        del self.driver.elements[constants.jobApplicationHeaderXPATH]
+        self.assertTrue(modalClosed())
+
+    def test_discarding_waits_for_the_modal_to_close(self):
+        self.driver.elements[constants.buttonDismissCSS] = [FakeButton(self.driver, "dismiss")]
+        self.driver.elements[constants.buttonDiscardApplicationCSS] = [FakeButton(self.driver, "discard", removes = [constants.jobApplicationHeaderXPATH])]
+
+        with patch("utils.sleeper.interact", self.interact):
+            self.driverHelper.discardApplication()
+
+        self.assertEqual(self.driver.clicks, ["dismiss", "discard"])
+        self.assertEqual(self.waits, [None, True])
+
+    def test_discarding_without_the_discard_dialog_only_dismisses(self):
+        # Linkedin closes an application without changes without asking whether to save it
+        self.driver.elements[constants.buttonDismissCSS] = [FakeButton(self.driver, "dismiss", removes = [constants.jobApplicationHeaderXPATH])]
+
+        with patch("utils.sleeper.interact", self.interact):
+            self.driverHelper.discardApplication()
+
+        self.assertEqual(self.driver.clicks, ["dismiss"])
+        self.assertEqual(self.waits, [None])
+        self.assertFalse(self.driverHelper.isApplicationPopupDisplayed())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from utils.resultsJournal import ResultsJournal
+
+
+class TestResultsJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal = ResultsJournal(self.directory.name, fsyncInterval = 0)
+        self.day = time.strftime("%Y%m%d")
+
+    def tearDown(self):
+        self.journal.close()
+        self.directory.cleanup()
+
+    def readLines(self, extension: str):
+        with open(self.journal.getFilePath(self.day, extension), encoding="utf-8") as file:
+            return file.read().splitlines()
+
+    def test_text_file_is_only_written_on_demand(self):
+        self.journal.append("1 | Data Scientist | Acme")
+        self.journal.close()
+        reopenedJournal = ResultsJournal(self.directory.name, fsyncInterval = 0)
+        reopenedJournal.append("2 | Data Engineer | Globex")
+        self.assertFalse(os.path.exists(reopenedJournal.getFilePath(self.day, ".txt")))
+
+        reopenedJournal.writeTable()
+        reopenedJournal.writeTable()
+        reopenedJournal.close()
+
+        lines = self.readLines(".txt")
+        self.assertEqual(len([line for line in lines if line.startswith("----")]), 2)
+        self.assertEqual(lines[2:], ["1 | Data Scientist | Acme", "2 | Data Engineer | Globex"])
+        self.assertEqual(reopenedJournal.getDays(), [self.day])
+
+    def test_structured_records_are_written(self):
+        self.journal.append("1 | Data Scientist | Acme", {"number": 1, "result": "applied"})
+
+        records = [json.loads(line) for line in self.readLines(".jsonl")]
+        self.assertEqual(records[0]["number"], 1)
+        self.assertEqual(records[0]["result"], "applied")
+        self.assertEqual(records[0]["line"], "1 | Data Scientist | Acme")
+        self.assertIn("time", records[0])
+
+    def test_rendering_table_from_structured_records(self):
+        self.journal.append("1 | Data Scientist | Acme")
+        self.journal.append("2 | Data Engineer | Globex")
+
+        self.assertEqual(self.journal.renderTable().splitlines()[2:], ["1 | Data Scientist | Acme", "2 | Data Engineer | Globex"])
+
+    def test_rendering_table_of_day_without_results(self):
+        table = self.journal.renderTable("19700101")
+
+        self.assertFalse(os.path.exists(self.journal.getFilePath("19700101", ".jsonl")))
+        self.assertEqual(len(table.splitlines()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+import json
+import os
+import signal
+import tempfile
+import unittest
+from unittest import mock
+
+import config
+import runner
+from linkedin import Linkedin
+from models import JobCounter, JobForVerification
+from utils.jobQueue import JobQueue
+from utils.runCheckpoint import APPLY_PHASE, HARVEST_PHASE, RunCheckpoint, RunCursor, getConfigHash
+
+
+class TestRunCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_saved_cursor_is_resumed(self):
+        jobCounter = JobCounter()
+        jobCounter.total = 7
+        jobCounter.applied = 3
+        jobQueue = JobQueue()
+        jobQueue.addAll([JobForVerification("1", "Data Scientist", "Acme", "Remote"), JobForVerification("2", "Data Engineer", "Globex", "")])
+        jobQueue.pop()
+        cursor = RunCursor(phase = APPLY_PHASE, searchIndex = 2, page = 4, searchWatermarks = {"search": 3912345678})
+        cursor.setJobCounter(jobCounter)
+        cursor.setJobQueue(jobQueue)
+
+        RunCheckpoint(self.directory.name, "config a").save(cursor)
+        resumedCursor = RunCheckpoint(self.directory.name, "config a").load()
+
+        self.assertEqual((resumedCursor.phase, resumedCursor.searchIndex, resumedCursor.page), (APPLY_PHASE, 2, 4))
+        self.assertEqual(resumedCursor.searchWatermarks, {"search": 3912345678})
+        self.assertEqual(resumedCursor.getJobCounter(), jobCounter)
+        resumedJobQueue = resumedCursor.getJobQueue()
+        self.assertEqual(resumedJobQueue.pop().linkedinJobId, "2")
+        self.assertFalse(resumedJobQueue.add(JobForVerification("1", "Data Scientist", "Acme", "Remote")))
+        checkpoint = RunCheckpoint(self.directory.name, "config a")
+        self.assertEqual(sorted(os.listdir(self.directory.name)), sorted(os.path.basename(path) for path in [checkpoint.path, checkpoint.queuePath]))
+
+    def test_fields_of_older_checkpoints_are_ignored(self):
+        checkpoint = RunCheckpoint(self.directory.name, "config a")
+        with open(checkpoint.path, "w") as file:
+            json.dump({"configHash": "config a", "cursor": {"searchIndex": 3, "position": 5}}, file)
+
+        cursor = checkpoint.load()
+
+        self.assertEqual((cursor.phase, cursor.searchIndex), (HARVEST_PHASE, 3))
+
+    def test_every_config_has_its_own_checkpoint(self):
+        RunCheckpoint(self.directory.name, "config a").save(RunCursor(searchIndex = 1))
+        RunCheckpoint(self.directory.name, "config b").save(RunCursor(searchIndex = 5))
+
+        self.assertEqual(RunCheckpoint(self.directory.name, "config a").load().searchIndex, 1)
+        self.assertEqual(RunCheckpoint(self.directory.name, "config b").load().searchIndex, 5)
+        self.assertIsNone(RunCheckpoint(self.directory.name, "config c").load())
+
+    def test_cleared_checkpoint_starts_from_the_first_search(self):
+        checkpoint = RunCheckpoint(self.directory.name, "config a")
+        checkpoint.save(RunCursor(searchIndex = 1))
+        checkpoint.clear()
+
+        self.assertFalse(os.path.exists(checkpoint.path))
+        self.assertIsNone(checkpoint.load())
+
+    def test_unreadable_checkpoint_is_ignored(self):
+        checkpoint = RunCheckpoint(self.directory.name, "config a")
+        with open(checkpoint.path, "w") as file:
+            file.write("{\"configHash\": ")
+
+        self.assertIsNone(checkpoint.load())
+
+    def test_disabled_checkpoint(self):
+        checkpoint = RunCheckpoint("", "config a")
+        checkpoint.save(RunCursor(searchIndex = 1))
+
+        self.assertIsNone(checkpoint.load())
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_config_hash_depends_on_the_content(self):
+        path = os.path.join(self.directory.name, "config.py")
+        with open(path, "w") as file:
+            file.write("keywords = ['python']")
+        firstHash = getConfigHash(path)
+        with open(path, "w") as file:
+            file.write("keywords = ['java']")
+
+        self.assertNotEqual(getConfigHash(path), firstHash)
+
+
+class TestStoppingRun(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = RunCheckpoint(self.directory.name, getConfigHash(config.__file__))
+        # A bot without a browser, the steps that need one are replaced by the tests
+        self.processor = Linkedin.__new__(Linkedin)
+        self.processor.driver = None
+        self.processor.finishRun = lambda : None
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sigterm_saves_the_checkpoint_before_exiting(self):
+        def harvestJobs(jobQueue, cursor, checkpoint):
+            cursor.searchIndex, cursor.page = 2, 3
+            os.kill(os.getpid(), signal.SIGTERM)
+            while True:
+                signal.pause()
+
+        self.processor.harvestJobs = harvestJobs
+        previousHandler = signal.signal(signal.SIGTERM, runner.stop)
+        try:
+            with mock.patch("constants.runCheckpointDirectory", self.directory.name), self.assertRaises(SystemExit) as stopped:
+                self.processor.startApplying()
+        finally:
+            signal.signal(signal.SIGTERM, previousHandler)
+
+        self.assertEqual(stopped.exception.code, 128 + signal.SIGTERM)
+        cursor = self.checkpoint.load()
+        self.assertEqual((cursor.phase, cursor.searchIndex, cursor.page), (HARVEST_PHASE, 2, 3))
+
+    def test_job_is_saved_as_taken_before_it_is_opened(self):
+        def processJob(jobID, jobCounter):
+            raise RuntimeError("Crashes every time")
+
+        self.processor.processJob = processJob
+        jobQueue = JobQueue([JobForVerification("1", "Data Scientist", "Acme", "Remote"), JobForVerification("2", "Data Engineer", "Globex", "")])
+        cursor = RunCursor(phase = APPLY_PHASE)
+        cursor.setJobQueue(jobQueue)
+
+        with self.assertRaises(RuntimeError):
+            self.processor.applyToQueuedJobs(jobQueue, cursor, self.checkpoint)
+
+        self.assertEqual([job.linkedinJobId for job in iter(self.checkpoint.load().getJobQueue().pop, None)], ["2"])
+
+    def test_queue_is_only_saved_again_every_few_jobs(self):
+        writtenPaths = []
+        write = RunCheckpoint._RunCheckpoint__write
+
+        def recordWrite(checkpoint, path, content):
+            writtenPaths.append(path)
+            write(checkpoint, path, content)
+
+        def processJob(jobID, jobCounter):
+            if jobID == "3":
+                raise SystemExit(128 + signal.SIGTERM)
+            return jobCounter
+
+        self.processor.processJob = processJob
+        jobQueue = JobQueue([JobForVerification(str(jobId), "Data Engineer", "Globex", "") for jobId in range(1, 6)])
+        cursor = RunCursor(phase = APPLY_PHASE)
+        cursor.setJobQueue(jobQueue)
+
+        with mock.patch("constants.runCheckpointQueueInterval", 2), mock.patch.object(RunCheckpoint, "_RunCheckpoint__write", recordWrite), \
+            self.assertRaises(SystemExit):
+            self.processor.applyToQueuedJobs(jobQueue, cursor, self.checkpoint)
+
+        # The first snapshot and the one taken after the second job, the cursor is saved before and after every job
+        self.assertEqual(writtenPaths.count(self.checkpoint.queuePath), 2)
+        self.assertEqual(writtenPaths.count(self.checkpoint.path), 5)
+        resumedCursor = self.checkpoint.load()
+        self.assertEqual(resumedCursor.getCurrentJob().linkedinJobId, "3")
+        self.assertEqual(resumedCursor.getQueuedJobCount(), 2)
+        self.assertEqual([job.linkedinJobId for job in iter(resumedCursor.getJobQueue().pop, None)], ["4", "5"])
+
+    def test_interrupted_job_is_processed_first_until_it_was_started_too_often(self):
+        openedJobIds = []
+
+        def processJob(jobID, jobCounter):
+            openedJobIds.append(jobID)
+            if jobID == "1":
+                raise SystemExit(128 + signal.SIGTERM)
+            return jobCounter
+
+        self.processor.processJob = processJob
+        jobQueue = JobQueue([JobForVerification("1", "Data Scientist", "Acme", "Remote"), JobForVerification("2", "Data Engineer", "Globex", "")])
+        cursor = RunCursor(phase = APPLY_PHASE)
+        cursor.setJobQueue(jobQueue)
+        attempts = []
+
+        with mock.patch("constants.runMaxJobAttempts", 2):
+            while True:
+                try:
+                    self.processor.applyToQueuedJobs(jobQueue, cursor, self.checkpoint)
+                    break
+                except SystemExit:
+                    # Every stopped run is resumed from its checkpoint, the watermarks cover job 1 so no search queues it again
+                    cursor = self.checkpoint.load()
+                    attempts.append(cursor.getCurrentJobAttempts())
+                    jobQueue = cursor.getJobQueue()
+
+        self.assertEqual(attempts, [1, 2])
+        self.assertEqual(openedJobIds, ["1", "1", "2"])
+        self.assertIsNone(cursor.getCurrentJob())
+
+    def test_search_page_failing_every_time_is_skipped(self):
+        searchUrls = ["https://www.linkedin.com/jobs/search/?keywords=Python&location=Berlin&",
+            "https://www.linkedin.com/jobs/search/?keywords=Java&location=Berlin&"]
+        openedUrls = []
+
+        def getJobCardsFromSearchPage():
+            # The second page of the first search cannot be read
+            if "Python" in openedUrls[-1] and "&start=" in openedUrls[-1]:
+                raise RuntimeError("Crashes every time")
+            return [mock.Mock(linkedinJobId = str(len(openedUrls)))]
+
+        self.processor.goToUrl = lambda url, condition = None : openedUrls.append(url)
+        self.processor.wait = mock.Mock(until = lambda condition : mock.Mock(text = "2"))
+        self.processor.getJobCardsFromSearchPage = getJobCardsFromSearchPage
+        self.processor.getJobsForVerificationFromSearchPage = lambda jobCards : []
+        cursor = RunCursor()
+        jobQueue = cursor.getJobQueue()
+        attempts = []
+
+        with mock.patch("utils.linkedinUrlHelper.generateSearchUrls", lambda : searchUrls), mock.patch("utils.file.displayWriteResults"), \
+            mock.patch("repository_wrapper.verify_jobs", lambda jobs : jobs), mock.patch("constants.runMaxJobAttempts", 2):
+            while True:
+                try:
+                    self.processor.harvestJobs(jobQueue, cursor, self.checkpoint)
+                    break
+                except RuntimeError:
+                    cursor = self.checkpoint.load()
+                    attempts.append((cursor.searchIndex, cursor.page, cursor.pageAttempts))
+                    jobQueue = cursor.getJobQueue()
+
+        self.assertEqual(attempts, [(0, 1, 1), (0, 1, 2)])
+        self.assertEqual([url.count("&start=") for url in openedUrls if "Python" in url], [0, 1, 0, 1, 0])
+        self.assertEqual(len([url for url in openedUrls if "Java" in url]), 2)
+        self.assertEqual(cursor.searchIndex, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import time
+import unittest
+
+import utils.sleeper as sleeper
+
+
+class TestSleeper(unittest.TestCase):
+    def test_wait_continues_when_condition_is_met(self):
+        start = time.monotonic()
+        conditionMet = sleeper.waitUntil(lambda : True, timeout = 5, bottom = 0, top = 0)
+
+        self.assertTrue(conditionMet)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_wait_respects_minimum_pacing_floor(self):
+        start = time.monotonic()
+        sleeper.waitUntil(lambda : True, timeout = 5, bottom = 0.3, top = 0.3)
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+    def test_wait_gives_up_after_timeout(self):
+        start = time.monotonic()
+        conditionMet = sleeper.waitUntil(lambda : False, timeout = 0.3, bottom = 0, top = 0)
+
+        self.assertFalse(conditionMet)
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+    def test_failing_condition_is_polled_again(self):
+        polls = []
+
+        def condition():
+            polls.append(1)
+            if len(polls) < 2:
+                raise Exception("Element is not rendered yet")
+            return True
+
+        self.assertTrue(sleeper.waitUntil(condition, timeout = 5, bottom = 0, top = 0))
+        self.assertEqual(len(polls), 2)
+
+    def test_queued_tasks_run_inside_the_pause(self):
+        tasksRun = []
+        sleeper.runDuringNextPause(lambda : tasksRun.append("first"))
+        sleeper.runDuringNextPause(lambda : tasksRun.append("second"))
+        statsBefore = sleeper.getPauseStats()
+
+        start = time.monotonic()
+        sleeper.waitUntil(lambda : True, timeout = 5, bottom = 0.2, top = 0.2)
+
+        self.assertEqual(tasksRun, ["first", "second"])
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        statsAfter = sleeper.getPauseStats()
+        self.assertEqual(statsAfter["tasks"] - statsBefore["tasks"], 2)
+        self.assertEqual(statsAfter["pauses"] - statsBefore["pauses"], 1)
+
+    def test_failing_task_does_not_stop_the_queue(self):
+        tasksRun = []
+        sleeper.runDuringNextPause(lambda : 1 / 0, "failing task")
+        sleeper.runDuringNextPause(lambda : tasksRun.append("after failure"))
+
+        sleeper.runPendingTasks()
+
+        self.assertEqual(tasksRun, ["after failure"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from utils.jobDataExtractor import JobDataExtractor
+from utils.snapshotJobDataExtractor import SnapshotJobDataExtractor
+
+
+SEARCH_PAGE_HTML = """
+<html><body><ul>
+    <li data-occludable-job-id="3901">
+        <a class="job-card-list__title--link" aria-label=" Data Scientist "></a>
+        <div class="artdeco-entity-lockup__subtitle"><span>Acme · Berlin</span></div>
+        <ul class="job-card-container__metadata-wrapper"><li><span>Berlin, Germany (Hybrid)</span></li></ul>
+        <ul><li class="job-card-container__footer-item"><time>2 days ago</time></li>
+            <li class="job-card-container__footer-item">Be an early applicant</li></ul>
+    </li>
+    <li data-occludable-job-id="3902">
+        <a class="job-card-list__title--link" aria-label="Data Engineer"></a>
+        <div class="artdeco-entity-lockup__subtitle"><span>Globex</span></div>
+        <ul><li><span>Applied</span></li></ul>
+    </li>
+    <li data-occludable-job-id="3903"></li>
+</ul></body></html>
+"""
+
+JOB_PAGE_HTML = """
+<html><body>
+    <h1 class="t-24 t-bold inline"> Machine Learning Engineer </h1>
+    <div class="job-details-jobs-unified-top-card__company-name"><a> Initech </a></div>
+    <div class="job-details-jobs-unified-top-card__primary-description-container"><div>
+        <span class="tvm__text tvm__text--low-emphasis">Warsaw, Poland</span>
+        <span class="tvm__text tvm__text--low-emphasis">3 days ago</span>
+        <span class="tvm__text tvm__text--low-emphasis">42 applicants</span>
+    </div></div>
+    <ul><li class="job-details-jobs-unified-top-card__job-insight"><span><span>Remote<br>Full-time</span></span></li></ul>
+    <div id="job-details"><p>About the job</p><p>Build   models.</p></div>
+</body></html>
+"""
+
+
+class TestSnapshotExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = SnapshotJobDataExtractor()
+
+    def test_getting_job_cards(self):
+        self.extractor.loadSnapshot(SEARCH_PAGE_HTML)
+        jobCards = self.extractor.getRawJobCards()
+
+        self.assertEqual(len(jobCards), 3)
+        self.assertEqual(jobCards[0], {
+            "id": "3901",
+            "applied": False,
+            "title": " Data Scientist ",
+            "company": "Acme · Berlin",
+            "workplaceType": "Berlin, Germany (Hybrid)",
+            "footer": ["2 days ago", "Be an early applicant"]})
+        self.assertTrue(jobCards[1]["applied"])
+        self.assertIsNone(jobCards[1]["workplaceType"])
+        self.assertIsNone(jobCards[2]["title"])
+        self.assertIsNone(jobCards[2]["company"])
+        self.assertEqual(jobCards[2]["footer"], [])
+
+    def test_getting_job_page_details(self):
+        self.extractor.loadSnapshot(JOB_PAGE_HTML)
+        details = self.extractor.getRawJobPageDetails()
+
+        self.assertEqual(details["title"], "Machine Learning Engineer")
+        self.assertEqual(details["company"], "Initech")
+        self.assertEqual(details["workplaceType"].split("\n")[0], "Remote")
+        self.assertEqual(details["description"], "About the job\nBuild models.")
+        self.assertEqual(details["location"], "Warsaw, Poland")
+        self.assertIn("3 days ago", details["primaryDescription"])
+        self.assertEqual(details["primaryDescriptionSpans"], ["Warsaw, Poland", "3 days ago", "42 applicants"])
+
+    def test_missing_elements_are_none(self):
+        self.extractor.loadSnapshot("<html><body></body></html>")
+        details = self.extractor.getRawJobPageDetails()
+
+        self.assertTrue(all(value is None for value in details.values()))
+        self.assertEqual(self.extractor.getRawJobCards(), [])
+
+    def test_backend_missing_a_method_cannot_be_created(self):
+        class CardsOnlyExtractor(JobDataExtractor):
+            def getRawJobCards(self):
+                return []
+
+        with self.assertRaises(TypeError):
+            CardsOnlyExtractor()
+
+
+if __name__ == '__main__':
+    unittest.main()
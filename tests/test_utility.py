@@ -20,5 +20,34 @@ class TestUtility(unittest.TestCase):
         self.assertFalse(utils.progressMatchesExpectedApplicationPage(0, 10, 1.0))
         self.assertFalse(utils.progressMatchesExpectedApplicationPage(10, 10, 99.0))
 
+    def test_extract_posted_date(self):
+        self.assertEqual(utils.extractPostedDate("Berlin, Germany · 6 hours ago · 40 applicants"), "6 hours ago")
+        self.assertEqual(utils.extractPostedDate("Reposted 2 weeks ago"), "2 weeks ago")
+        self.assertEqual(utils.extractPostedDate("Berlin, Germany"), "")
+
+    def test_extract_number_of_applicants(self):
+        self.assertEqual(utils.extractNumberOfApplicants(["Berlin", "1 day ago", " 87 applicants "]), "87 applicants")
+        self.assertEqual(utils.extractNumberOfApplicants(["Over 100 applicants", "Promoted"]), "Over 100 applicants")
+        self.assertEqual(utils.extractNumberOfApplicants(["Be an early applicant"]), "")
+
+    def test_extract_job_card_applicants(self):
+        self.assertEqual(utils.extractJobCardApplicants(["2 days ago", " Over 100 applicants "]), "Over 100 applicants")
+        self.assertEqual(utils.extractJobCardApplicants(["Be an early applicant"]), "Be an early applicant")
+        self.assertEqual(utils.extractJobCardApplicants(["Promoted"]), "")
+
+    def test_job_id_to_number(self):
+        self.assertEqual(utils.jobIdToNumber("3912345678"), 3912345678)
+        self.assertIsNone(utils.jobIdToNumber("urn:li:job:1"))
+        self.assertIsNone(utils.jobIdToNumber(None))
+
+    def test_reached_job_id_watermark(self):
+        self.assertTrue(utils.reachedJobIdWatermark(["30", "20", "15"], 20))
+        self.assertTrue(utils.reachedJobIdWatermark(["30", "15", "10", None], 20))
+        self.assertFalse(utils.reachedJobIdWatermark(["30", "10", "25"], 20))
+        self.assertFalse(utils.reachedJobIdWatermark([], 20))
+
+    def test_reposted_job_at_the_end_of_a_page_does_not_reach_the_watermark(self):
+        self.assertFalse(utils.reachedJobIdWatermark(["40", "35", "30", "25", "10"], 20))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
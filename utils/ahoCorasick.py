@@ -0,0 +1,78 @@
+from collections import deque
+from typing import Iterable, List, Tuple
+
+
+# Finds the keywords contained in a text in a single pass over the text,
+# no matter how many keywords there are
+class AhoCorasickAutomaton:
+
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = []
+        # Node 0 is the root, every node has its transitions, its failure link and the keywords ending in it
+        self.transitions = [{}]
+        self.failures = [0]
+        self.outputs = [[]]
+
+        for keyword in keywords:
+            if keyword:
+                self.__addKeyword(keyword)
+
+        self.__buildFailureLinks()
+
+
+    def containsAny(self, text: str) -> bool:
+        node = 0
+        for char in text:
+            node = self.__next(node, char)
+            if self.outputs[node]:
+                return True
+
+        return False
+
+
+    # Every occurrence as (start position in the text, index of the keyword in the order they were given)
+    def findAll(self, text: str) -> List[Tuple[int, int]]:
+        matches = []
+        node = 0
+        for position, char in enumerate(text):
+            node = self.__next(node, char)
+            for keywordIndex in self.outputs[node]:
+                matches.append((position - len(self.keywords[keywordIndex]) + 1, keywordIndex))
+
+        return matches
+
+
+    def __next(self, node: int, char: str) -> int:
+        while node and char not in self.transitions[node]:
+            node = self.failures[node]
+        return self.transitions[node].get(char, 0)
+
+
+    def __addKeyword(self, keyword: str):
+        node = 0
+        for char in keyword:
+            if char not in self.transitions[node]:
+                self.transitions.append({})
+                self.failures.append(0)
+                self.outputs.append([])
+                self.transitions[node][char] = len(self.transitions) - 1
+            node = self.transitions[node][char]
+
+        self.keywords.append(keyword)
+        self.outputs[node].append(len(self.keywords) - 1)
+
+
+    def __buildFailureLinks(self):
+        nodes = deque(self.transitions[0].values())
+
+        while nodes:
+            node = nodes.popleft()
+            for char, child in self.transitions[node].items():
+                failure = self.failures[node]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[child] = self.transitions[failure].get(char, 0)
+                # A keyword ending inside this one (ex: "dev" in "devops") is a match as well
+                self.outputs[child] = self.outputs[child] + self.outputs[self.failures[child]]
+                nodes.append(child)
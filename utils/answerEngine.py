@@ -0,0 +1,156 @@
+import os
+import pickle
+from typing import Dict, Iterable, Optional
+
+import yaml
+
+import constants
+import utils.logger as logger
+from utils.ahoCorasick import AhoCorasickAutomaton
+from utils.fuzzyQuestionMatcher import FuzzyQuestionMatcher
+from utils.logger import MessageTypes
+
+
+SECTIONS = ["inputField", "radio", "dropdown"]
+# Bump when the compiled form changes so old caches are rebuilt
+CACHE_VERSION = 3
+# Keywords found inside a longer word are ignored when shorter than this, ex: "ui" in "require"
+MINIMUM_PARTIAL_MATCH_LENGTH = 4
+
+
+def normalize(text) -> str:
+    return " ".join(str(text).lower().split()) if text is not None else ""
+
+
+def answerToText(answer) -> str:
+    # Unquoted yes/no are read as booleans by YAML
+    if isinstance(answer, bool):
+        return "Yes" if answer else "No"
+    return str(answer).strip()
+
+
+# The keys of every section of additionalQuestions.yaml are keywords searched for in the question label,
+# ex: "Python: 3" answers "How many years of work experience do you have with Python?".
+# Each section is compiled into one Aho-Corasick automaton, so a label is resolved in a single pass
+# over its text. When several keywords match, longer keywords win over shorter ones (ex: "React Native"
+# over "React"), then the keyword listed first.
+# Labels without any keyword as a whole word are scored against all keywords by a fuzzy matcher (ex: a typo),
+# then keywords inside longer words and last fallback keywords (ex: the "Years of experience" default) are used.
+class AnswerEngine:
+
+
+    def __init__(self, answers: Dict[str, dict], fallbackKeywords: Iterable[str] = ()):
+        fallbackKeywords = {normalize(keyword) for keyword in fallbackKeywords}
+        self.sections = {}
+        for section in SECTIONS:
+            keywords, sectionAnswers = [], []
+            for keyword, answer in (answers.get(section) or {}).items():
+                if normalize(keyword) and answer is not None:
+                    keywords.append(normalize(keyword))
+                    sectionAnswers.append(answerToText(answer))
+
+            isFallback = [keyword in fallbackKeywords for keyword in keywords]
+            fuzzyKeywordIndexes = [index for index, keyword in enumerate(keywords) if not isFallback[index]]
+            fuzzyMatcher = FuzzyQuestionMatcher(keywords[index] for index in fuzzyKeywordIndexes)
+            self.sections[section] = (AhoCorasickAutomaton(keywords), sectionAnswers, isFallback, fuzzyMatcher, fuzzyKeywordIndexes)
+
+
+    # fuzzyThreshold is the lowest score accepted from the fuzzy matcher (0 to 1), 0 disables it
+    def getAnswer(self, question: str, section: str = "inputField", fuzzyThreshold: float = None) -> Optional[str]:
+        automaton, answers, isFallback, fuzzyMatcher, fuzzyKeywordIndexes = self.sections[section]
+        text = normalize(question)
+        fuzzyThreshold = constants.fuzzyAnswerThreshold if fuzzyThreshold is None else fuzzyThreshold
+
+        bestScore, bestIndex = None, None
+        for start, keywordIndex in automaton.findAll(text):
+            keywordLength = len(automaton.keywords[keywordIndex])
+            isWholeWord = self.__isWholeWord(text, start, keywordLength)
+            if not isWholeWord and keywordLength < MINIMUM_PARTIAL_MATCH_LENGTH:
+                continue
+            score = (not isFallback[keywordIndex], isWholeWord, keywordLength, -keywordIndex)
+            if bestScore is None or score > bestScore:
+                bestScore, bestIndex = score, keywordIndex
+
+        if bestIndex is not None and bestScore[0] and bestScore[1]:
+            return answers[bestIndex]
+
+        if fuzzyThreshold > 0:
+            match = fuzzyMatcher.getBestMatch(text, fuzzyThreshold)
+            if match is not None:
+                keywordIndex = fuzzyKeywordIndexes[match[0]]
+                logger.logDebugMessage(lambda : f"Fuzzy matched '{question}' to '{automaton.keywords[keywordIndex]}'", MessageTypes.DEBUG,
+                    fields = {"confidence": round(match[1], 3)})
+                return answers[keywordIndex]
+
+        return answers[bestIndex] if bestIndex is not None else None
+
+
+    def __isWholeWord(self, text: str, start: int, length: int) -> bool:
+        end = start + length
+        return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+
+# Parsing the YAML and building the automatons is only done when the file changed since the cache was written
+def loadAnswerEngine(path: str, cachePath: str = None, fallbackKeywords: Iterable[str] = ()) -> AnswerEngine:
+    modifiedAt = os.stat(path).st_mtime_ns
+    fallbackKeywords = sorted(normalize(keyword) for keyword in fallbackKeywords)
+    cacheKey = (CACHE_VERSION, os.path.abspath(path), modifiedAt, tuple(fallbackKeywords))
+
+    if cachePath:
+        engine = __readCache(cachePath, cacheKey)
+        if engine is not None:
+            return engine
+
+    with open(path, encoding="utf-8") as file:
+        engine = AnswerEngine(yaml.safe_load(file) or {}, fallbackKeywords)
+
+    if cachePath:
+        __writeCache(cachePath, cacheKey, engine)
+    return engine
+
+
+def __readCache(cachePath: str, cacheKey: tuple) -> Optional[AnswerEngine]:
+    try:
+        with open(cachePath, "rb") as file:
+            cachedKey, engine = pickle.load(file)
+        return engine if cachedKey == cacheKey else None
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.logDebugMessage("Could not read the compiled answers, rebuilding them", MessageTypes.WARNING, e)
+        return None
+
+
+def __writeCache(cachePath: str, cacheKey: tuple, engine: AnswerEngine):
+    try:
+        os.makedirs(os.path.dirname(cachePath) or ".", exist_ok=True)
+        temporaryPath = cachePath + ".tmp"
+        with open(temporaryPath, "wb") as file:
+            pickle.dump((cacheKey, engine), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaryPath, cachePath)
+    except Exception as e:
+        logger.logDebugMessage("Could not cache the compiled answers", MessageTypes.WARNING, e)
+
+
+# Changes whenever the answers of the engine could change, ex: to discard answers cached elsewhere
+def getAnswersVersion() -> str:
+    try:
+        modifiedAt = os.stat(constants.additionalQuestionsPath).st_mtime_ns
+    except (OSError, TypeError, ValueError):
+        modifiedAt = 0
+    return f"{CACHE_VERSION}:{modifiedAt}:{constants.fuzzyAnswerThreshold}:{sorted(normalize(keyword) for keyword in constants.fallbackAnswerKeywords)}"
+
+
+__engine = None
+
+
+# The engine for constants.additionalQuestionsPath, loaded on the first question
+def getAnswerEngine() -> Optional[AnswerEngine]:
+    global __engine
+    if __engine is None and constants.additionalQuestionsPath:
+        try:
+            __engine = loadAnswerEngine(constants.additionalQuestionsPath, constants.answerEngineCachePath, constants.fallbackAnswerKeywords)
+        except Exception as e:
+            logger.logDebugMessage(f"Could not load answers from {constants.additionalQuestionsPath}", MessageTypes.WARNING, e)
+            __engine = AnswerEngine({})
+    return __engine
@@ -0,0 +1,96 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+
+# Labels of the same question differ in case, spacing, punctuation and the "Required" suffix Linkedin adds,
+# ex: "How many years of Python experience?Required" and "how many years of python experience"
+def normalizeQuestionKey(question: str) -> str:
+    text = (question or "").lower()
+    text = re.sub(r"\s*required\s*$", "", text)
+    text = re.sub(r"[^\w+#]+", " ", text)
+    return " ".join(text.split())
+
+
+# Answers entered by hand or pre-filled by Linkedin, harvested from the application steps, and the questions
+# the bot could not answer (without an answer), keyed by the normalized question and the section of the input
+class AnswerStore:
+
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS answers (
+                    question_key TEXT NOT NULL,
+                    section TEXT NOT NULL,
+                    question TEXT NOT NULL,
+                    answer TEXT,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    times_seen INTEGER NOT NULL DEFAULT 1,
+                    PRIMARY KEY (question_key, section)
+                )""")
+
+
+    # Returns whether the answer is new or different from the stored one
+    def saveAnswer(self, question: str, section: str, answer: str) -> bool:
+        key = normalizeQuestionKey(question)
+        if not key:
+            return False
+
+        now = time.time()
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT answer FROM answers WHERE question_key = ? AND section = ?", (key, section)).fetchone()
+            self.connection.execute("""
+                INSERT INTO answers (question_key, section, question, answer, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (question_key, section) DO UPDATE SET question = excluded.question, answer = excluded.answer,
+                    last_seen = excluded.last_seen, times_seen = times_seen + 1""",
+                (key, section, question, answer, now, now))
+
+        return row is None or row[0] != answer
+
+
+    # Keeps the question for the user to answer, without overwriting an answer. Returns whether it was not stored before
+    def saveUnansweredQuestion(self, question: str, section: str) -> bool:
+        key = normalizeQuestionKey(question)
+        if not key:
+            return False
+
+        now = time.time()
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT 1 FROM answers WHERE question_key = ? AND section = ?", (key, section)).fetchone()
+            self.connection.execute("""
+                INSERT INTO answers (question_key, section, question, answer, first_seen, last_seen) VALUES (?, ?, ?, NULL, ?, ?)
+                ON CONFLICT (question_key, section) DO UPDATE SET last_seen = excluded.last_seen, times_seen = times_seen + 1""",
+                (key, section, question, now, now))
+
+        return row is None
+
+
+    def getAnswer(self, question: str, section: str) -> Optional[str]:
+        with self.lock:
+            row = self.connection.execute("SELECT answer FROM answers WHERE question_key = ? AND section = ?",
+                (normalizeQuestionKey(question), section)).fetchone()
+        return row[0] if row else None
+
+
+    # The questions seen most often first
+    def getUnansweredQuestions(self) -> List[tuple]:
+        with self.lock:
+            return self.connection.execute("""
+                SELECT question, section, times_seen FROM answers WHERE answer IS NULL ORDER BY times_seen DESC""").fetchall()
+
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
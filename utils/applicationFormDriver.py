@@ -0,0 +1,70 @@
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+
+import constants
+import models
+import utils.linkedinScripts as scripts
+from utils.answerEngine import normalize
+
+
+# Answers are looked up in the section of additionalQuestions.yaml matching the input type
+ANSWER_SECTIONS = {"text": "inputField", "textarea": "inputField", "radio": "radio", "select": "dropdown"}
+
+
+# The option to choose for an answer: the exact option first, then the first option starting with the answer
+# (ex: "Native or bilingual" for "Native"), None when no option matches
+def matchOption(options: List[str], answer: str) -> Optional[str]:
+    for option in options:
+        if normalize(option) == normalize(answer):
+            return option
+    for option in options:
+        if normalize(answer) and normalize(option).startswith(normalize(answer)):
+            return option
+    return None
+
+
+# Reads all questions of an application step with one execute_script call and fills in all answers with another,
+# so a step costs two round trips no matter how many questions it has
+class ApplicationFormDriver:
+
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+
+
+    def readFields(self) -> List[models.FormField]:
+        rawFields = self.driver.execute_script(scripts.getApplicationFormSchemaScript,
+            constants.divWithQuestionsCSS,
+            constants.divWithQuestionGroupsCSS,
+            constants.labelQuestionCSS,
+            constants.legendQuestionCSS,
+            constants.inputSingleLineTextCSS,
+            constants.inputTextAreaCSS,
+            constants.inputRadioCSS,
+            constants.selectDropdownCSS,
+            constants.formFieldIdAttribute) or []
+
+        return [models.FormField(
+            fieldId = rawField["fieldId"],
+            label = rawField.get("label"),
+            inputType = rawField.get("inputType"),
+            options = rawField.get("options") or [],
+            value = rawField.get("value") or "",
+            required = bool(rawField.get("required"))) for rawField in rawFields]
+
+
+    # answers maps the fieldId to the value to type or the exact option to choose
+    # Returns whether each answer was applied, by fieldId
+    def applyAnswers(self, fields: List[models.FormField], answers: Dict[str, str]) -> Dict[str, bool]:
+        if not answers:
+            return {}
+
+        inputTypes = {field.fieldId: field.inputType for field in fields}
+        return self.driver.execute_script(scripts.applyApplicationFormAnswersScript,
+            [{"fieldId": fieldId, "inputType": inputTypes[fieldId], "value": value} for fieldId, value in answers.items()],
+            constants.formFieldIdAttribute,
+            constants.inputSingleLineTextCSS,
+            constants.inputTextAreaCSS,
+            constants.inputRadioCSS,
+            constants.selectDropdownCSS) or {}
@@ -0,0 +1,237 @@
+import json
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+import utils.logger as logger
+from utils.backendOutbox import BackendOutbox
+from utils.logger import MessageTypes
+
+
+# Client error statuses of calls that may still be accepted later
+RETRYABLE_CLIENT_STATUSES = {408, 425, 429}
+# Statuses of a backend that is down or behind a proxy that cannot reach it
+UNAVAILABLE_STATUSES = {502, 503, 504}
+
+
+# Errors of calls the backend will never accept, ex: a payload it rejects (HTTP 4xx) or an operation it does not know
+def isPermanentError(error: Exception) -> bool:
+    status = getattr(error, "status", None)
+    if isinstance(status, int):
+        return 400 <= status < 500 and status not in RETRYABLE_CLIENT_STATUSES
+    # A response that is not JSON says nothing about the call
+    return isinstance(error, (ValueError, TypeError, KeyError)) and not isinstance(error, json.JSONDecodeError)
+
+
+# Errors of a backend that cannot be reached, they are retried until it is back without counting against the calls
+def isUnavailableError(error: Exception) -> bool:
+    return isinstance(error, OSError) or getattr(error, "status", None) in UNAVAILABLE_STATUSES
+
+
+# Sends backend calls from a background thread so a slow backend never stalls the bot
+# Calls are collected for batchWindow seconds (or until flush is requested, ex: at the end of a search page)
+# and every operation is sent as one batch. An operation that fails stays queued and is retried with backoff,
+# so every call is delivered at least once, while the operations of the batch already delivered are not sent again.
+# The operations in firstOperations are sent before the others of a batch, ex: the job upserts the other calls refer to.
+# Calls the backend rejects (see isPermanentError) or that failed maxAttempts times while it was reachable are given up on:
+# they are moved to the dead letters of the outbox, so they do not block the calls queued after them.
+# With an outbox the calls also survive a restart: undelivered calls of the previous run are queued first.
+class BackendDispatcher:
+
+
+    def __init__(self, sendBatch: Callable[[str, List[Any]], None], batchWindow: float = 10, maxBatchSize: int = 50,
+            retryBackoff: float = 2, maxRetryBackoff: float = 60, outbox: Optional[BackendOutbox] = None, firstOperations: List[str] = (),
+            maxAttempts: int = 10):
+        self.sendBatch = sendBatch
+        self.firstOperations = list(firstOperations)
+        self.outbox = outbox
+        self.batchWindow = batchWindow
+        self.maxBatchSize = maxBatchSize
+        self.retryBackoff = retryBackoff
+        self.maxRetryBackoff = maxRetryBackoff
+        self.maxAttempts = maxAttempts
+
+        # Queued calls are [operation, payload, enqueuedAt, entryId, failedAttempts]
+        self.pending = []
+        if outbox is not None:
+            now = time.monotonic()
+            self.pending = [[operation, payload, now, entryId, 0] for entryId, operation, payload in outbox.getUndeliveredEntries()]
+            if self.pending:
+                logger.logDebugMessage(f"Replaying {len(self.pending)} backend updates from the previous run", MessageTypes.INFO)
+        self.condition = threading.Condition()
+        self.flushRequested = False
+        self.closed = False
+        self.metrics = {"submitted": len(self.pending), "delivered": 0, "batches": 0, "failedBatches": 0, "deadLetters": 0, "totalLatency": 0.0, "maxLatency": 0.0}
+
+        self.thread = threading.Thread(target=self.__run, name="BackendDispatcher", daemon=True)
+        self.thread.start()
+
+
+    def submit(self, operation: str, payload: Any):
+        entryId = self.outbox.record(operation, payload) if self.outbox is not None else None
+
+        with self.condition:
+            self.pending.append([operation, payload, time.monotonic(), entryId, 0])
+            self.metrics["submitted"] += 1
+            if len(self.pending) >= self.maxBatchSize:
+                self.condition.notify_all()
+
+
+    # Sends what is queued without waiting for the batch window, wait blocks until it is delivered or the timeout expires
+    def flush(self, wait: bool = False, timeout: float = 30) -> bool:
+        with self.condition:
+            self.flushRequested = True
+            self.condition.notify_all()
+            if wait:
+                return self.condition.wait_for(lambda : not self.pending, timeout)
+        return True
+
+
+    def close(self, timeout: float = 30):
+        delivered = self.flush(wait = True, timeout = timeout)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout = 1)
+
+        if not delivered:
+            replayText = ", they will be replayed on the next run" if self.outbox is not None else ""
+            logger.logDebugMessage(f"{self.getQueueDepth()} backend calls were not delivered{replayText}", MessageTypes.ERROR)
+
+        # A thread stuck in a slow backend call might still acknowledge its batch
+        if self.outbox is not None and not self.thread.is_alive():
+            self.outbox.close()
+
+
+    def getQueueDepth(self) -> int:
+        with self.condition:
+            return len(self.pending)
+
+
+    def getMetrics(self) -> dict:
+        with self.condition:
+            metrics = dict(self.metrics)
+            metrics["queueDepth"] = len(self.pending)
+        metrics["averageLatency"] = metrics["totalLatency"] / metrics["delivered"] if metrics["delivered"] else 0.0
+        return metrics
+
+
+    def __run(self):
+        backoff = 0.0
+
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda : self.pending or self.closed)
+                if self.closed and not self.pending:
+                    return
+
+                # Wait for the batch window to fill up unless a flush was requested or the batch is full
+                windowEnd = self.pending[0][2] + self.batchWindow
+                if backoff:
+                    windowEnd = max(windowEnd, time.monotonic() + backoff)
+                # After a failure the backoff is always waited for
+                self.condition.wait_for(lambda : self.closed or (not backoff and (self.flushRequested or len(self.pending) >= self.maxBatchSize)),
+                    max(0.0, windowEnd - time.monotonic()))
+                batch = self.pending[:self.maxBatchSize]
+                self.flushRequested = False
+
+            if self.__sendGrouped(batch):
+                backoff = 0.0
+                with self.condition:
+                    self.metrics["batches"] += 1
+            else:
+                backoff = min(max(backoff * 2, self.retryBackoff), self.maxRetryBackoff)
+                if self.closed:
+                    return
+
+
+    # Sends the batch one operation at a time and removes the calls of every operation that is done with from the queue,
+    # returns False when an operation has to be retried
+    def __sendGrouped(self, batch) -> bool:
+        callsByOperation = {operation: [] for operation in self.firstOperations}
+        for call in batch:
+            callsByOperation.setdefault(call[0], []).append(call)
+
+        for operation, calls in callsByOperation.items():
+            if not calls:
+                continue
+            try:
+                self.sendBatch(operation, [payload for _, payload, _, _, _ in calls])
+            except Exception as e:
+                with self.condition:
+                    self.metrics["failedBatches"] += 1
+                if not isPermanentError(e):
+                    self.__recordFailure(calls, e)
+                    # The next operations may refer to the calls of this one
+                    return False
+                if len(calls) == 1:
+                    self.__moveToDeadLetters(calls, e)
+                    continue
+                # Sent one by one only the rejected calls are given up on
+                logger.logDebugMessage(f"The backend rejected a {operation} batch, sending its calls one by one", MessageTypes.WARNING, e)
+                if not all(self.__sendOne(call) for call in calls):
+                    return False
+                continue
+            self.__remove(calls, delivered = True)
+
+        return True
+
+
+    # Returns False when the call has to be retried
+    def __sendOne(self, call) -> bool:
+        try:
+            self.sendBatch(call[0], [call[1]])
+        except Exception as e:
+            if not isPermanentError(e):
+                self.__recordFailure([call], e)
+                return False
+            self.__moveToDeadLetters([call], e)
+            return True
+        self.__remove([call], delivered = True)
+        return True
+
+
+    def __recordFailure(self, calls, error: Exception):
+        if isUnavailableError(error):
+            logger.logDebugMessage("The backend cannot be reached, the calls will be retried", MessageTypes.ERROR, error)
+            return
+
+        for call in calls:
+            call[4] += 1
+        givenUp = [call for call in calls if call[4] >= self.maxAttempts]
+        if givenUp:
+            self.__moveToDeadLetters(givenUp, error)
+        if len(givenUp) < len(calls):
+            logger.logDebugMessage("Error sending backend calls, they will be retried", MessageTypes.ERROR, error)
+
+
+    def __moveToDeadLetters(self, calls, error: Exception):
+        operation = calls[0][0]
+        logger.logDebugMessage(f"Giving up on {len(calls)} {operation} call(s)",
+            MessageTypes.ERROR, error, fields = {"payloads": [payload for _, payload, _, _, _ in calls]})
+        if self.outbox is not None:
+            self.outbox.moveToDeadLetters([(entryId, operation, payload) for _, payload, _, entryId, _ in calls], repr(error))
+        self.__remove(calls, delivered = False)
+
+
+    def __remove(self, calls, delivered: bool):
+        if delivered and self.outbox is not None:
+            self.outbox.acknowledge([entryId for _, _, _, entryId, _ in calls])
+
+        removed = {id(call) for call in calls}
+        with self.condition:
+            self.pending = [call for call in self.pending if id(call) not in removed]
+            if delivered:
+                self.__recordDelivery(calls)
+            else:
+                self.metrics["deadLetters"] += len(calls)
+            self.condition.notify_all()
+
+
+    def __recordDelivery(self, calls):
+        now = time.monotonic()
+        self.metrics["delivered"] += len(calls)
+        for _, _, enqueuedAt, _, _ in calls:
+            latency = now - enqueuedAt
+            self.metrics["totalLatency"] += latency
+            self.metrics["maxLatency"] = max(self.metrics["maxLatency"], latency)
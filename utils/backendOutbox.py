@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+
+# Write-ahead log of backend updates
+# Every update is written and fsynced before it is queued for sending, and acknowledged once it is delivered,
+# so updates that were not delivered (backend outage, crash, timeout when the bot stops) are replayed on the next start
+# Updates the backend will never accept are moved to the dead letter file instead, to be looked at by hand
+class BackendOutbox:
+
+
+    def __init__(self, path: str, deadLetterPath: Optional[str] = None):
+        self.path = path
+        self.deadLetterPath = deadLetterPath
+        self.lock = threading.Lock()
+        self.nextEntryId = 1
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.undeliveredEntries = self.__compact()
+        self.file = open(self.path, "a", encoding="utf-8")
+
+
+    # Updates that were recorded but never acknowledged, in the order they were recorded
+    def getUndeliveredEntries(self) -> List[Tuple[int, str, Any]]:
+        return list(self.undeliveredEntries)
+
+
+    def record(self, operation: str, payload: Any) -> int:
+        with self.lock:
+            entryId = self.nextEntryId
+            self.nextEntryId += 1
+            self.__write({"id": entryId, "operation": operation, "payload": payload})
+        return entryId
+
+
+    def acknowledge(self, entryIds: List[int]):
+        if not entryIds:
+            return
+
+        with self.lock:
+            self.__write({"ack": list(entryIds)})
+
+
+    # Takes (entryId, operation, payload) tuples, the entries are acknowledged once they are in the dead letter file
+    def moveToDeadLetters(self, entries: List[Tuple[int, str, Any]], error: str):
+        if not entries:
+            return
+
+        with self.lock:
+            if self.deadLetterPath:
+                os.makedirs(os.path.dirname(self.deadLetterPath) or ".", exist_ok=True)
+                failedAt = time.strftime("%Y-%m-%dT%H:%M:%S")
+                with open(self.deadLetterPath, "a", encoding="utf-8") as file:
+                    for _, operation, payload in entries:
+                        file.write(json.dumps({"operation": operation, "payload": payload, "error": error, "failedAt": failedAt}, ensure_ascii=False) + "\n")
+                    file.flush()
+                    os.fsync(file.fileno())
+            self.__write({"ack": [entryId for entryId, _, _ in entries]})
+
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+    def __write(self, entry: dict):
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+
+    # Reads the log and rewrites it with only the undelivered entries, renumbered from 1
+    def __compact(self) -> List[Tuple[int, str, Any]]:
+        entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # The last line is cut off when the process died while writing it
+                        continue
+                    if "ack" in entry:
+                        for entryId in entry["ack"]:
+                            entries.pop(entryId, None)
+                    else:
+                        entries[entry["id"]] = entry
+
+        undeliveredEntries = []
+        temporaryPath = self.path + ".tmp"
+        with open(temporaryPath, "w", encoding="utf-8") as file:
+            for entry in entries.values():
+                undeliveredEntries.append((self.nextEntryId, entry["operation"], entry["payload"]))
+                file.write(json.dumps({"id": self.nextEntryId, "operation": entry["operation"], "payload": entry["payload"]}, ensure_ascii=False) + "\n")
+                self.nextEntryId += 1
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporaryPath, self.path)
+
+        return undeliveredEntries
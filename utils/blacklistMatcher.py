@@ -0,0 +1,53 @@
+import re
+from typing import Iterable
+
+import config
+from utils.ahoCorasick import AhoCorasickAutomaton
+
+
+def normalize(text: str) -> str:
+    return text.strip().lower() if text else ""
+
+
+# Built once from the blacklists:
+# - companies are compared for equality with a set of normalized names
+# - titles are searched for blacklisted keywords with an Aho-Corasick automaton
+# - optional regular expressions are checked on top of both
+class BlacklistMatcher:
+
+
+    def __init__(self, companies: Iterable[str] = (), titles: Iterable[str] = (), companyPatterns: Iterable[str] = (), titlePatterns: Iterable[str] = ()):
+        self.companies = {normalize(company) for company in companies if normalize(company)}
+        self.titleAutomaton = AhoCorasickAutomaton(normalize(title) for title in titles)
+        self.companyPatterns = [re.compile(pattern, re.IGNORECASE) for pattern in companyPatterns]
+        self.titlePatterns = [re.compile(pattern, re.IGNORECASE) for pattern in titlePatterns]
+
+
+    def isCompanyBlacklisted(self, company: str) -> bool:
+        if normalize(company) in self.companies:
+            return True
+
+        return any(pattern.search(company or "") for pattern in self.companyPatterns)
+
+
+    def isTitleBlacklisted(self, title: str) -> bool:
+        if self.titleAutomaton.containsAny(normalize(title)):
+            return True
+
+        return any(pattern.search(title or "") for pattern in self.titlePatterns)
+
+
+__configMatcher = None
+
+
+# The matcher for the blacklists in config.py, built on the first use
+def getConfigMatcher() -> BlacklistMatcher:
+    global __configMatcher
+    if __configMatcher is None:
+        __configMatcher = BlacklistMatcher(
+            companies = config.blacklistCompanies,
+            titles = config.blackListTitles,
+            companyPatterns = getattr(config, "blacklistCompanyPatterns", []),
+            titlePatterns = getattr(config, "blackListTitlePatterns", []))
+
+    return __configMatcher
@@ -0,0 +1,43 @@
+from collections import Counter
+
+
+# Counts the WebDriver commands (HTTP round trips to chromedriver) sent by a driver
+# Every find_element, get_attribute, .text and execute_script call of the driver and its elements goes through driver.execute
+class DriverCommandCounter:
+
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.commands = Counter()
+        self.__originalExecute = None
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+    def start(self):
+        self.commands.clear()
+        self.__originalExecute = self.driver.execute
+
+        def countingExecute(driverCommand, params = None):
+            self.commands[driverCommand] += 1
+            return self.__originalExecute(driverCommand, params)
+
+        # Instance attribute shadows WebDriver.execute, WebElements call it through their parent driver
+        self.driver.execute = countingExecute
+
+
+    def stop(self):
+        if self.__originalExecute is not None:
+            del self.driver.execute
+            self.__originalExecute = None
+
+
+    def total(self) -> int:
+        return sum(self.commands.values())
@@ -1,51 +1,54 @@
-import time
 import os
 import logging
+from typing import Optional
 
+import constants
 import utils.logger as logger
 from utils.logger import MessageTypes
+import utils.sleeper as sleeper
+from utils.resultsJournal import ResultsJournal
 from selenium import webdriver
 
 
-def displayWriteResults(lineToWrite: str):
+__resultsJournal = ResultsJournal(fsyncInterval = constants.resultsFileSyncInterval)
+
+
+def displayWriteResults(lineToWrite: str, record: Optional[dict] = None):
     try:
         logger.logDebugMessage(lineToWrite, MessageTypes.WARNING)
-        __writeResultsIntoFile(lineToWrite)
+        # The line is shown right away, the file is written during the next pause
+        sleeper.runDuringNextPause(lambda : __writeResultsIntoFile(lineToWrite, record), "writing results")
     except Exception as e:
         logger.logDebugMessage("❌ Error in DisplayWriteResults", MessageTypes.ERROR, e) 
 
 
-def __writeResultsIntoFile(text: str):
-    timeStr = time.strftime("%Y%m%d")
-    directory = "data"
-    fileName = "Applied Jobs DATA - " + timeStr + ".txt"
-    filePath = os.path.join(directory, fileName)
-
+def __writeResultsIntoFile(text: str, record: Optional[dict] = None):
     try:
-        os.makedirs(directory, exist_ok=True)  # Ensure the 'data' directory exists.
-
-        # Open the file for reading and writing ('r+' opens the file for both)
-        with open(filePath, 'r+', encoding="utf-8") as file:
-            lines = []
-            for line in file:
-                if "----" not in line:
-                    lines.append(line)
-            file.seek(0)  # Go back to the start of the file
-            file.truncate()  # Clear the file
-            file.write("---- Applied Jobs Data ---- created at: " + timeStr + "\n")
-            file.write("---- Number | Job Title | Company | Location | Work Place | Posted Date | Applications | Result " + "\n")
-            for line in lines:
-                file.write(line)
-            file.write(text + "\n")
-    except FileNotFoundError:
-        with open(filePath, 'w', encoding="utf-8") as f:
-            f.write("---- Applied Jobs Data ---- created at: " + timeStr + "\n")
-            f.write("---- Number | Job Title | Company | Location | Work Place | Posted Date | Applications | Result " + "\n")
-            f.write(text + "\n")
+        __resultsJournal.append(text, record)
     except Exception as e:
         logger.logDebugMessage("Error in writeResults", logger.MessageTypes.ERROR, e)
 
 
+# Text table of the day's results (today by default) rendered from the structured results file
+def renderResults(day: Optional[str] = None) -> str:
+    return __resultsJournal.renderTable(day)
+
+
+# Writes the text results file of a day (today by default) from the structured results file and returns its path
+def writeResultsTable(day: Optional[str] = None) -> str:
+    return __resultsJournal.writeTable(day)
+
+
+# Renders the text results file of every day this run has results for, called when the run finishes
+def writeResultsTables():
+    for day in __resultsJournal.getDays():
+        try:
+            textPath = writeResultsTable(day)
+            logger.logDebugMessage(f"Results written to {textPath}", MessageTypes.INFO)
+        except Exception as e:
+            logger.logDebugMessage("Error in writeResultsTables", MessageTypes.ERROR, e)
+
+
 def createDirectory(path: str):
     if not os.path.exists(path):
         os.makedirs(path)
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import constants
+import models
+import utils.logger as logger
+from utils.answerEngine import getAnswersVersion, normalize
+from utils.logger import MessageTypes
+
+
+# What was resolved for a form step the last time it was seen
+# outcome becomes "blocked" when Linkedin still asked for answers after the step was filled in,
+# unansweredRequiredLabels are then the required questions that blocked it.
+# Without such a question the cause is not known (ex: a value in the wrong format), the outcome is then "unknown"
+# and the step is only skipped for the next remainingSkips times it is seen
+@dataclass
+class FormStepResult:
+    answers: Dict[str, str] = field(default_factory=dict)
+    unansweredRequiredLabels: List[str] = field(default_factory=list)
+    outcome: str = "completed"
+    remainingSkips: int = 0
+
+
+# Identifies a form step by its questions: the labels, input types and options of all fields in order
+def fingerprintForm(fields: List[models.FormField]) -> str:
+    schema = [[normalize(formField.label), formField.inputType, [normalize(option) for option in formField.options]] for formField in fields]
+    return hashlib.sha256(json.dumps(schema).encode("utf-8")).hexdigest()
+
+
+# Remembers the resolved answers of the form steps seen before, so the same question set from the same
+# employer is filled in (or rejected) without resolving every question again.
+# The least recently used steps are evicted above maxEntries, the cache is saved as JSON and discarded
+# when it was written for other answers (see answerEngine.getAnswersVersion).
+class FormFingerprintCache:
+
+
+    def __init__(self, path: str = None, maxEntries: int = 500, version: str = ""):
+        self.path = path
+        self.maxEntries = maxEntries
+        self.version = version
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.isDirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path:
+            self.__load()
+
+
+    def get(self, fingerprint: str) -> Optional[FormStepResult]:
+        with self.lock:
+            result = self.entries.get(fingerprint)
+            if result is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.entries.move_to_end(fingerprint)
+            return result
+
+
+    def put(self, fingerprint: str, result: FormStepResult):
+        with self.lock:
+            self.entries[fingerprint] = result
+            self.entries.move_to_end(fingerprint)
+            while len(self.entries) > self.maxEntries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            self.isDirty = True
+
+
+    # Forgets every step, ex: when new answers make the resolved ones outdated
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+            self.isDirty = True
+
+
+    def getStats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "evictions": self.evictions,
+            }
+
+
+    # Written to a temporary file and renamed, so a crash never leaves a partial cache
+    def save(self):
+        if not self.path:
+            return
+
+        with self.lock:
+            if not self.isDirty:
+                return
+            content = {"version": self.version, "entries": [[fingerprint, asdict(result)] for fingerprint, result in self.entries.items()]}
+            self.isDirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temporaryPath = self.path + ".tmp"
+            with open(temporaryPath, "w", encoding="utf-8") as file:
+                json.dump(content, file, ensure_ascii=False)
+            os.replace(temporaryPath, self.path)
+        except Exception as e:
+            logger.logDebugMessage("Could not save the form cache", MessageTypes.WARNING, e)
+
+
+    def __load(self):
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                content = json.load(file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.logDebugMessage("Could not read the form cache, starting with an empty one", MessageTypes.WARNING, e)
+            return
+
+        if content.get("version") != self.version:
+            logger.logDebugMessage("The answers changed since the form cache was saved, starting with an empty one", MessageTypes.INFO)
+            return
+
+        # Saved from the least to the most recently used
+        for fingerprint, result in content.get("entries", [])[-self.maxEntries:]:
+            self.entries[fingerprint] = FormStepResult(**result)
+
+
+__formCache = None
+
+
+def getFormCache() -> FormFingerprintCache:
+    global __formCache
+    if __formCache is None:
+        __formCache = FormFingerprintCache(constants.formCachePath, constants.formCacheMaxEntries, getAnswersVersion())
+    return __formCache
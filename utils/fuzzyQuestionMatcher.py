@@ -0,0 +1,76 @@
+import math
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+
+def characterNgrams(text: str, size: int) -> set:
+    ngrams = set()
+    for word in text.lower().split():
+        # Punctuation around the words is dropped, inside them it is kept, ex: "python?" and "c++"
+        word = word.strip("?!,;:()[]\"'").rstrip(".")
+        if not word:
+            continue
+        # Padding marks the start and end of the words, ex: " py" and "on " for "python"
+        paddedWord = f" {word} "
+        for start in range(max(len(paddedWord) - size + 1, 1)):
+            ngrams.add(paddedWord[start:start + size])
+    return ngrams
+
+
+# Scores a question label against every known question key at once with character n-grams weighted by TF-IDF.
+# The score of a key is the share of its (squared, L2 normalized) weight found in the label, so a key that
+# appears in a longer label with a typo, another word form or other words around it still scores high,
+# ex: "Python" in "How many years of work experience do you have with Pythons?".
+# The weights are stored as an inverted index (postings of every n-gram in numpy arrays), scoring a label is
+# one gather over the postings of its n-grams and one bincount over the keys, so memory and time grow with
+# the number of n-grams shared with the label rather than with keys x vocabulary.
+class FuzzyQuestionMatcher:
+
+
+    def __init__(self, keys: Iterable[str], ngramSize: int = 3):
+        self.ngramSize = ngramSize
+        keyNgrams = [characterNgrams(key, ngramSize) for key in keys]
+        self.numberOfKeys = len(keyNgrams)
+
+        documentFrequencies = {}
+        for ngrams in keyNgrams:
+            for ngram in ngrams:
+                documentFrequencies[ngram] = documentFrequencies.get(ngram, 0) + 1
+
+        self.vocabulary = {ngram: index for index, ngram in enumerate(documentFrequencies)}
+        inverseDocumentFrequencies = {ngram: math.log((1 + self.numberOfKeys) / (1 + frequency)) + 1 for ngram, frequency in documentFrequencies.items()}
+
+        postings = [[] for _ in self.vocabulary]
+        for keyIndex, ngrams in enumerate(keyNgrams):
+            norm = math.sqrt(sum(inverseDocumentFrequencies[ngram] ** 2 for ngram in ngrams)) or 1
+            for ngram in ngrams:
+                postings[self.vocabulary[ngram]].append((keyIndex, (inverseDocumentFrequencies[ngram] / norm) ** 2))
+
+        self.postingOffsets = np.zeros(len(postings) + 1, dtype=np.int64)
+        self.postingOffsets[1:] = np.cumsum([len(posting) for posting in postings])
+        self.postingKeys = np.array([keyIndex for posting in postings for keyIndex, _ in posting], dtype=np.int32)
+        self.postingWeights = np.array([weight for posting in postings for _, weight in posting], dtype=np.float32)
+
+
+    def getScores(self, label: str) -> np.ndarray:
+        ngramIndexes = np.array([self.vocabulary[ngram] for ngram in characterNgrams(label, self.ngramSize) if ngram in self.vocabulary], dtype=np.int64)
+        if self.numberOfKeys == 0 or ngramIndexes.size == 0:
+            return np.zeros(self.numberOfKeys, dtype=np.float32)
+
+        starts = self.postingOffsets[ngramIndexes]
+        lengths = self.postingOffsets[ngramIndexes + 1] - starts
+        # Positions of all postings of the label's n-grams, without a Python loop over the n-grams
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+        return np.bincount(self.postingKeys[positions], weights=self.postingWeights[positions], minlength=self.numberOfKeys)
+
+
+    # The index of the best key and its score, None when no key reaches the threshold
+    def getBestMatch(self, label: str, threshold: float) -> Optional[Tuple[int, float]]:
+        scores = self.getScores(label)
+        if scores.size == 0:
+            return None
+
+        bestIndex = int(np.argmax(scores))
+        return (bestIndex, float(scores[bestIndex])) if scores[bestIndex] >= threshold else None
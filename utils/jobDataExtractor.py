@@ -0,0 +1,70 @@
+from abc import ABC, abstractmethod
+
+from selenium import webdriver
+
+import constants
+import utils.linkedinScripts as scripts
+
+
+# Interface for reading raw job data from the current page
+# Every backend returns the same dictionaries so Linkedin parses them the same way:
+# - getRawJobCards: a list of {id, applied, title, company, workplaceType, footer}
+# - getRawJobPageDetails: {title, company, workplaceType, description, primaryDescription, location, primaryDescriptionSpans}
+# A value of None marks an element that was not found
+# A backend that misses one of the methods fails when it is instantiated, not in the middle of a run
+class JobDataExtractor(ABC):
+
+
+    @abstractmethod
+    def getRawJobCards(self) -> list[dict]:
+        pass
+
+
+    @abstractmethod
+    def getRawJobPageDetails(self) -> dict:
+        pass
+
+
+# Runs the lookups inside the live browser, one execute_script call per page
+class LiveJobDataExtractor(JobDataExtractor):
+
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+
+
+    def getRawJobCards(self) -> list[dict]:
+        return self.driver.execute_script(scripts.getJobCardsFromSearchPageScript,
+            constants.jobCardContainerCSS,
+            constants.jobCardIdAttribute,
+            constants.appliedTextXPATH,
+            constants.jobCardTitleLinkCSS,
+            constants.jobCardCompanyNameCSS,
+            constants.jobCardDescriptionCSS,
+            constants.spanCSS,
+            constants.jobCardFooterItemCSS) or []
+
+
+    def getRawJobPageDetails(self) -> dict:
+        return self.driver.execute_script(scripts.getJobPageDetailsScript,
+            constants.headerJobTitleCSS,
+            constants.divWithJobCompanyXPATH,
+            constants.jobWorkplaceTypeXPATH,
+            constants.jobDetailsID,
+            constants.divWithJobPagePrimaryDescriptionXPATH,
+            constants.jobLocationXPATH,
+            constants.numberOfApplicantsSpanXPATH) or {}
+
+
+def createJobDataExtractor(driver: webdriver.Chrome, backend: str = None) -> JobDataExtractor:
+    backend = backend or constants.extractionBackend
+
+    match backend:
+        case "live":
+            return LiveJobDataExtractor(driver)
+        case "snapshot":
+            # lxml is only needed when the snapshot backend is used
+            from utils.snapshotJobDataExtractor import SnapshotJobDataExtractor
+            return SnapshotJobDataExtractor(driver)
+        case _:
+            raise ValueError(f"Unknown extraction backend: {backend}")
@@ -0,0 +1,38 @@
+import base64
+import hashlib
+import zlib
+from dataclasses import asdict
+
+import models
+
+
+# Wire format of a job in a bulk upsert: the job fields plus the hash of the description.
+# The description is sent as is, zlib compressed and base64 encoded when it is large,
+# or left out when the backend already has it (same hash as the last upsert).
+def descriptionHash(description: str) -> str:
+    return hashlib.sha256((description or "").encode("utf-8")).hexdigest()
+
+
+def encodeJob(job: models.Job, includeDescription: bool = True, compressAbove: int = 0) -> dict:
+    payload = asdict(job)
+    description = payload.pop("description") or ""
+    payload["description_hash"] = descriptionHash(description)
+
+    if not includeDescription:
+        return payload
+
+    encodedDescription = description.encode("utf-8")
+    if compressAbove and len(encodedDescription) > compressAbove:
+        payload["description_zlib"] = base64.b64encode(zlib.compress(encodedDescription)).decode("ascii")
+    else:
+        payload["description"] = description
+
+    return payload
+
+
+# Returns the job fields, without "description" when it was left out as unchanged
+def decodeJob(payload: dict) -> dict:
+    fields = {key: value for key, value in payload.items() if key not in ("description_hash", "description_zlib")}
+    if "description_zlib" in payload:
+        fields["description"] = zlib.decompress(base64.b64decode(payload["description_zlib"])).decode("utf-8")
+    return fields
@@ -0,0 +1,64 @@
+import re
+from typing import List, Optional
+
+import config
+import constants
+import models
+
+
+HOURS_PER_UNIT = {"second": 1 / 3600, "minute": 1 / 60, "hour": 1, "day": 24, "week": 24 * 7, "month": 24 * 30, "year": 24 * 365}
+UNKNOWN_SCORE = 0.5
+
+
+# ex: "3 days ago" is 72, "Reposted 2 weeks ago" is 336, None when the text has no age
+def postedDateToHours(postedDate: str) -> Optional[float]:
+    match = re.search(r"(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago", postedDate.lower())
+    if match is None:
+        return None
+    return int(match.group(1)) * HOURS_PER_UNIT[match.group(2)]
+
+
+# ex: "Over 100 applicants" is 100, "Be an early applicant" is 0, None when the text has no number of applicants
+def applicantsToNumber(applicants: str) -> Optional[int]:
+    if "early applicant" in applicants.lower():
+        return 0
+    match = re.search(r"(\d[\d,]*)\s+(applicant|application)", applicants.lower())
+    return int(match.group(1).replace(",", "")) if match else None
+
+
+def getRecencyScore(job: models.JobForVerification) -> float:
+    hours = postedDateToHours(job.postedDate)
+    return UNKNOWN_SCORE if hours is None else 0.5 ** (hours / constants.jobPriorityRecencyHalfLife)
+
+
+def getApplicantsScore(job: models.JobForVerification) -> float:
+    applicants = applicantsToNumber(job.applicants)
+    return UNKNOWN_SCORE if applicants is None else 0.5 ** (applicants / constants.jobPriorityApplicantsHalfLife)
+
+
+def getWorkplaceTypeScore(job: models.JobForVerification) -> float:
+    return constants.jobPriorityWorkplaceTypes.get(job.workplaceType, UNKNOWN_SCORE)
+
+
+def getTitleMatchScore(job: models.JobForVerification, wantedTitles: List[str] = None) -> float:
+    wantedTitles = wantedTitles if wantedTitles is not None else config.jobTitles + config.keywords
+    titleWords = set(re.findall(r"\w+", job.title.lower()))
+
+    bestScore = 0.0
+    for wantedTitle in wantedTitles:
+        wantedWords = re.findall(r"\w+", wantedTitle.lower())
+        if wantedWords:
+            bestScore = max(bestScore, sum(1 for word in wantedWords if word in titleWords) / len(wantedWords))
+    return bestScore
+
+
+# From 0 to 1, higher is applied to first
+def getJobPriority(job: models.JobForVerification) -> float:
+    scores = {
+        "recency": getRecencyScore(job),
+        "applicants": getApplicantsScore(job),
+        "workplaceType": getWorkplaceTypeScore(job),
+        "titleMatch": getTitleMatchScore(job),
+    }
+    totalWeight = sum(constants.jobPriorityWeights.values()) or 1
+    return sum(constants.jobPriorityWeights.get(name, 0) * score for name, score in scores.items()) / totalWeight
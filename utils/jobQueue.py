@@ -0,0 +1,97 @@
+import heapq
+import itertools
+from dataclasses import asdict, replace
+from typing import Callable, Iterable, Optional
+
+import models
+
+
+# Jobs found by the searches of a run, waiting to be opened and applied to, the highest priority first
+# Every job id is queued once per run, a job found again by an overlapping search (or on a repeated page) is
+# counted as a duplicate instead, so each job page is visited once however many searches return it.
+# A queued job found again is updated with what the new card shows and moved if that changes its priority:
+# the new priority is pushed on the heap and the old entry is skipped when it comes up (lazy invalidation),
+# so adding and taking a job are both O(log n).
+class JobQueue:
+
+
+    # jobs and seenJobIds restore a queue saved with toDict
+    # Without a priority the jobs are taken in the order they were queued
+    def __init__(self, jobs: Iterable[models.JobForVerification] = (), seenJobIds: Iterable[str] = (),
+            priority: Callable[[models.JobForVerification], float] = None):
+        self.priority = priority or (lambda job : 0.0)
+        # Heap of (-priority, sequence, job id), the sequence keeps the queue order for equal priorities
+        self.heap = []
+        # Job id -> (sequence, priority, job) of the current heap entry of every queued job
+        self.queuedJobs = {}
+        self.sequence = itertools.count()
+        self.seenJobIds = set(seenJobIds)
+        self.duplicates = 0
+        self.reprioritized = 0
+
+        for job in jobs:
+            self.seenJobIds.add(job.linkedinJobId)
+            self.__push(job, self.priority(job))
+
+
+    # Returns whether the job was queued
+    def add(self, job: models.JobForVerification) -> bool:
+        queued = self.queuedJobs.get(job.linkedinJobId)
+        if queued is not None:
+            self.duplicates += 1
+            self.__update(queued, job)
+            return False
+
+        if job.linkedinJobId in self.seenJobIds:
+            self.duplicates += 1
+            return False
+
+        self.seenJobIds.add(job.linkedinJobId)
+        self.__push(job, self.priority(job))
+        return True
+
+
+    def addAll(self, jobs: Iterable[models.JobForVerification]) -> int:
+        return sum(1 for job in jobs if self.add(job))
+
+
+    def pop(self) -> Optional[models.JobForVerification]:
+        while self.heap:
+            _, sequence, linkedinJobId = heapq.heappop(self.heap)
+            queued = self.queuedJobs.get(linkedinJobId)
+            # Entries replaced by a newer priority are skipped
+            if queued is not None and queued[0] == sequence:
+                del self.queuedJobs[linkedinJobId]
+                return queued[2]
+
+        return None
+
+
+    def __len__(self) -> int:
+        return len(self.queuedJobs)
+
+
+    # The queued jobs and every id seen so far, for the run checkpoint
+    # The priorities are computed again when the queue is restored
+    def toDict(self) -> dict:
+        jobs = [job for _, _, job in sorted(self.queuedJobs.values(), key = lambda queued : queued[0])]
+        return {"jobs": [asdict(job) for job in jobs], "seenJobIds": sorted(self.seenJobIds)}
+
+
+    def __push(self, job: models.JobForVerification, priority: float):
+        sequence = next(self.sequence)
+        self.queuedJobs[job.linkedinJobId] = (sequence, priority, job)
+        heapq.heappush(self.heap, (-priority, sequence, job.linkedinJobId))
+
+
+    # Properties the new card does not show are kept from the queued job
+    def __update(self, queued: tuple, job: models.JobForVerification):
+        sequence, priority, queuedJob = queued
+        updatedJob = replace(queuedJob, **{name: value for name, value in asdict(job).items() if value})
+        updatedPriority = self.priority(updatedJob)
+
+        if updatedPriority == priority:
+            self.queuedJobs[job.linkedinJobId] = (sequence, priority, updatedJob)
+        else:
+            self.reprioritized += 1
+            self.__push(updatedJob, updatedPriority)
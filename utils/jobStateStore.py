@@ -0,0 +1,168 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+
+import models
+
+
+JOB_COLUMNS = ["title", "company", "location", "description", "workplace_type", "posted_date", "applicants_at_time_of_applying"]
+
+
+# Local memory of every job the bot has seen, keyed by the Linkedin job id
+# It keeps the job properties, when the job was first and last seen and the outcome of processing it,
+# so repeated runs only open the job pages of jobs without an outcome
+# With the outcome it keeps the version of the answers it was reached with (see answerEngine.getAnswersVersion),
+# so jobs skipped for unanswered questions are only opened again when the answers changed
+class JobStateStore:
+
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        # The store is used from the bot and from the background threads calling the backend
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    linkedin_job_id TEXT PRIMARY KEY,
+                    outcome TEXT,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    outcome_at REAL,
+                    answers_version TEXT,
+                    {", ".join(column + " TEXT NOT NULL DEFAULT ''" for column in JOB_COLUMNS)}
+                )""")
+            # Stores created before the answers version was kept
+            jobColumns = {row[1] for row in self.connection.execute("PRAGMA table_info(jobs)")}
+            if "answers_version" not in jobColumns:
+                self.connection.execute("ALTER TABLE jobs ADD COLUMN answers_version TEXT")
+            # Hash of the description last sent to the backend, unchanged descriptions are not sent again
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS sent_descriptions (
+                    linkedin_job_id TEXT PRIMARY KEY,
+                    description_hash TEXT NOT NULL
+                )""")
+            # Newest job id seen by each search sorted by date, older jobs were already seen in earlier runs
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS search_watermarks (
+                    search_url TEXT PRIMARY KEY,
+                    newest_job_id INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )""")
+
+
+    def markSeen(self, jobs: Iterable[models.JobForVerification]):
+        now = time.time()
+        rows = [(job.linkedinJobId, now, now, job.title, job.company, job.workplaceType) for job in jobs]
+
+        with self.lock, self.connection:
+            self.connection.executemany("""
+                INSERT INTO jobs (linkedin_job_id, first_seen, last_seen, title, company, workplace_type) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (linkedin_job_id) DO UPDATE SET last_seen = excluded.last_seen""", rows)
+
+
+    def saveJob(self, job: models.Job):
+        self.saveJobs([job])
+
+
+    # All jobs of a search page are written in one transaction
+    def saveJobs(self, jobs: Iterable[models.Job]):
+        now = time.time()
+        rows = [[job.linkedin_job_id, now, now] + [getattr(job, column) for column in JOB_COLUMNS] for job in jobs]
+
+        with self.lock, self.connection:
+            self.connection.executemany(f"""
+                INSERT INTO jobs (linkedin_job_id, first_seen, last_seen, {", ".join(JOB_COLUMNS)})
+                VALUES (?, ?, ?, {", ".join("?" for _ in JOB_COLUMNS)})
+                ON CONFLICT (linkedin_job_id) DO UPDATE SET last_seen = excluded.last_seen,
+                    {", ".join(f"{column} = excluded.{column}" for column in JOB_COLUMNS)}""", rows)
+
+
+    def setOutcome(self, linkedinJobId: str, outcome: models.JobOutcome, answersVersion: Optional[str] = None):
+        now = time.time()
+
+        with self.lock, self.connection:
+            self.connection.execute("""
+                INSERT INTO jobs (linkedin_job_id, outcome, first_seen, last_seen, outcome_at, answers_version) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (linkedin_job_id) DO UPDATE SET outcome = excluded.outcome, outcome_at = excluded.outcome_at,
+                    last_seen = excluded.last_seen, answers_version = excluded.answers_version""",
+                (linkedinJobId, models.JobOutcome(outcome).value, now, now, now, answersVersion))
+
+
+    def getOutcome(self, linkedinJobId: str) -> Optional[models.JobOutcome]:
+        with self.lock:
+            row = self.connection.execute("SELECT outcome FROM jobs WHERE linkedin_job_id = ?", (linkedinJobId,)).fetchone()
+
+        return models.JobOutcome(row[0]) if row and row[0] else None
+
+
+    # One indexed query for a whole search page
+    # With answersVersion, jobs skipped for unanswered questions only count when they were skipped with that version
+    def getJobIdsWithOutcome(self, linkedinJobIds: List[str], outcomes: Iterable[models.JobOutcome], answersVersion: Optional[str] = None) -> set:
+        linkedinJobIds = list(linkedinJobIds)
+        outcomes = [models.JobOutcome(outcome).value for outcome in outcomes]
+        if not linkedinJobIds or not outcomes:
+            return set()
+
+        answersVersionCondition, answersVersionParameters = "", []
+        if answersVersion is not None:
+            answersVersionCondition = "AND (outcome != ? OR answers_version = ?)"
+            answersVersionParameters = [models.JobOutcome.SKIPPED_UNANSWERED_QUESTIONS.value, answersVersion]
+
+        with self.lock:
+            rows = self.connection.execute(f"""
+                SELECT linkedin_job_id FROM jobs
+                WHERE linkedin_job_id IN ({", ".join("?" for _ in linkedinJobIds)})
+                AND outcome IN ({", ".join("?" for _ in outcomes)}) {answersVersionCondition}""",
+                linkedinJobIds + outcomes + answersVersionParameters).fetchall()
+
+        return {row[0] for row in rows}
+
+
+    def getSentDescriptionHashes(self, linkedinJobIds: List[str]) -> dict:
+        linkedinJobIds = list(linkedinJobIds)
+        if not linkedinJobIds:
+            return {}
+
+        with self.lock:
+            rows = self.connection.execute(f"""
+                SELECT linkedin_job_id, description_hash FROM sent_descriptions
+                WHERE linkedin_job_id IN ({", ".join("?" for _ in linkedinJobIds)})""", linkedinJobIds).fetchall()
+
+        return dict(rows)
+
+
+    def setSentDescriptionHashes(self, descriptionHashes: dict):
+        with self.lock, self.connection:
+            self.connection.executemany("""
+                INSERT INTO sent_descriptions (linkedin_job_id, description_hash) VALUES (?, ?)
+                ON CONFLICT (linkedin_job_id) DO UPDATE SET description_hash = excluded.description_hash""",
+                list(descriptionHashes.items()))
+
+
+    def getSearchWatermark(self, searchUrl: str) -> Optional[int]:
+        with self.lock:
+            row = self.connection.execute("SELECT newest_job_id FROM search_watermarks WHERE search_url = ?", (searchUrl,)).fetchone()
+
+        return row[0] if row else None
+
+
+    # The watermark never moves back to an older job
+    def setSearchWatermark(self, searchUrl: str, newestJobId: int):
+        with self.lock, self.connection:
+            self.connection.execute("""
+                INSERT INTO search_watermarks (search_url, newest_job_id, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (search_url) DO UPDATE SET newest_job_id = max(newest_job_id, excluded.newest_job_id),
+                    updated_at = excluded.updated_at""",
+                (searchUrl, newestJobId, time.time()))
+
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
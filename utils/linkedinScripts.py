@@ -0,0 +1,221 @@
+# JavaScript snippets executed in the page with driver.execute_script
+# Selectors are always passed in as arguments so constants.py stays the single source of truth
+
+
+# Collects the raw properties of every job card on the search results page in a single round trip
+# arguments: jobCardContainerCSS, jobCardIdAttribute, appliedTextXPATH, jobCardTitleLinkCSS,
+#            jobCardCompanyNameCSS, jobCardDescriptionCSS, spanCSS, jobCardFooterItemCSS
+getJobCardsFromSearchPageScript = """
+    var cards = document.querySelectorAll(arguments[0]);
+    var jobCards = [];
+
+    for (var i = 0; i < cards.length; i++) {
+        var card = cards[i];
+
+        var applied = document.evaluate(arguments[2], card, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;
+
+        var titleLink = card.querySelector(arguments[3]);
+        var title = titleLink ? titleLink.getAttribute('aria-label') : null;
+
+        var companyName = card.querySelector(arguments[4]);
+        var company = companyName ? companyName.innerText : null;
+
+        var workplaceType = null;
+        var description = card.querySelector(arguments[5]);
+        if (description) {
+            var descriptionSpan = description.querySelector(arguments[6]);
+            workplaceType = descriptionSpan ? descriptionSpan.innerText : null;
+        }
+
+        // When the job was posted and how many applied, when the card shows them
+        var footer = [];
+        var footerItems = card.querySelectorAll(arguments[7]);
+        for (var j = 0; j < footerItems.length; j++) {
+            footer.push(footerItems[j].innerText);
+        }
+
+        jobCards.push({
+            id: card.getAttribute(arguments[1]),
+            applied: applied,
+            title: title,
+            company: company,
+            workplaceType: workplaceType,
+            footer: footer
+        });
+    }
+
+    return jobCards;
+"""
+
+
+# Collects the raw properties of an opened job page in a single round trip, null marks a missing element
+# arguments: headerJobTitleCSS, divWithJobCompanyXPATH, jobWorkplaceTypeXPATH, jobDetailsID,
+#            divWithJobPagePrimaryDescriptionXPATH, jobLocationXPATH, numberOfApplicantsSpanXPATH
+getJobPageDetailsScript = """
+    function findByXPath(xpath, parent) {
+        return document.evaluate(xpath, parent, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+
+    function textOrNull(element) {
+        return element ? element.innerText : null;
+    }
+
+    var details = {
+        title: textOrNull(document.querySelector(arguments[0])),
+        company: textOrNull(findByXPath(arguments[1], document)),
+        workplaceType: textOrNull(findByXPath(arguments[2], document)),
+        description: textOrNull(document.getElementById(arguments[3])),
+        primaryDescription: null,
+        location: null,
+        primaryDescriptionSpans: null
+    };
+
+    var primaryDescription = findByXPath(arguments[4], document);
+    if (primaryDescription) {
+        details.primaryDescription = primaryDescription.innerText;
+        details.location = textOrNull(findByXPath(arguments[5], primaryDescription));
+
+        var spans = document.evaluate(arguments[6], primaryDescription, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        details.primaryDescriptionSpans = [];
+        for (var i = 0; i < spans.snapshotLength; i++) {
+            details.primaryDescriptionSpans.push(spans.snapshotItem(i).innerText);
+        }
+    }
+
+    return details;
+"""
+
+
+# Reads every question of the current application step in a single round trip
+# Each question group gets a data attribute with its index so the answers can be applied to it later
+# arguments: divWithQuestionsCSS, divWithQuestionGroupsCSS, labelQuestionCSS, legendQuestionCSS, inputSingleLineTextCSS,
+#            inputTextAreaCSS, inputRadioCSS, selectDropdownCSS, formFieldIdAttribute
+getApplicationFormSchemaScript = """
+    var container = document.querySelector(arguments[0]);
+    if (!container) {
+        return [];
+    }
+
+    function labelOf(radio) {
+        var label = radio.id ? document.querySelector('label[for="' + CSS.escape(radio.id) + '"]') : null;
+        if (!label && radio.nextElementSibling && radio.nextElementSibling.tagName === 'LABEL') {
+            label = radio.nextElementSibling;
+        }
+        return label ? label.innerText.trim() : radio.value;
+    }
+
+    var groups = container.querySelectorAll(arguments[1]);
+    var fields = [];
+
+    for (var i = 0; i < groups.length; i++) {
+        var group = groups[i];
+        group.setAttribute(arguments[8], String(i));
+
+        var labelElement = group.querySelector(arguments[2]) || group.querySelector(arguments[3]);
+        var field = {
+            fieldId: String(i),
+            label: labelElement ? labelElement.innerText.trim() : null,
+            inputType: null,
+            options: [],
+            value: '',
+            required: false
+        };
+
+        var input = group.querySelector(arguments[4]) || group.querySelector(arguments[5]);
+        var radios = group.querySelectorAll(arguments[6]);
+        var select = group.querySelector(arguments[7]);
+
+        if (input) {
+            field.inputType = input.tagName === 'TEXTAREA' ? 'textarea' : 'text';
+            field.value = input.value;
+            field.required = input.required || input.getAttribute('aria-required') === 'true';
+        } else if (radios.length) {
+            field.inputType = 'radio';
+            for (var j = 0; j < radios.length; j++) {
+                field.options.push(labelOf(radios[j]));
+                if (radios[j].checked) {
+                    field.value = labelOf(radios[j]);
+                }
+                field.required = field.required || radios[j].required || radios[j].getAttribute('aria-required') === 'true';
+            }
+        } else if (select) {
+            field.inputType = 'select';
+            for (var k = 0; k < select.options.length; k++) {
+                field.options.push(select.options[k].text.trim());
+            }
+            // The first option is the "Select an option" placeholder
+            field.value = select.selectedIndex > 0 ? select.options[select.selectedIndex].text.trim() : '';
+            field.required = select.required || select.getAttribute('aria-required') === 'true';
+        }
+
+        fields.push(field);
+    }
+
+    return fields;
+"""
+
+
+# Applies the answers to the fields read by getApplicationFormSchemaScript in a single round trip
+# Values are set through the native setters and followed by input and change events so the page's
+# framework picks them up as if they were typed or clicked
+# arguments: answers as a list of {fieldId, inputType, value}, formFieldIdAttribute, inputSingleLineTextCSS,
+#            inputTextAreaCSS, inputRadioCSS, selectDropdownCSS
+applyApplicationFormAnswersScript = """
+    function dispatch(element) {
+        element.dispatchEvent(new Event('input', { bubbles: true }));
+        element.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+
+    function labelOf(radio) {
+        var label = radio.id ? document.querySelector('label[for="' + CSS.escape(radio.id) + '"]') : null;
+        if (!label && radio.nextElementSibling && radio.nextElementSibling.tagName === 'LABEL') {
+            label = radio.nextElementSibling;
+        }
+        return label ? label.innerText.trim() : radio.value;
+    }
+
+    // The callback below has its own arguments
+    var args = arguments;
+    var results = {};
+
+    args[0].forEach(function (answer) {
+        var group = document.querySelector('[' + args[1] + '="' + answer.fieldId + '"]');
+        if (!group) {
+            results[answer.fieldId] = false;
+            return;
+        }
+
+        if (answer.inputType === 'text' || answer.inputType === 'textarea') {
+            var input = group.querySelector(args[2]) || group.querySelector(args[3]);
+            var prototype = input instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(prototype, 'value').set.call(input, answer.value);
+            dispatch(input);
+            input.dispatchEvent(new Event('blur'));
+            results[answer.fieldId] = true;
+        } else if (answer.inputType === 'radio') {
+            var radios = group.querySelectorAll(args[4]);
+            results[answer.fieldId] = false;
+            for (var i = 0; i < radios.length; i++) {
+                if (labelOf(radios[i]) === answer.value) {
+                    // A click checks the radio and fires the same events as the user's click
+                    radios[i].click();
+                    results[answer.fieldId] = radios[i].checked;
+                    break;
+                }
+            }
+        } else if (answer.inputType === 'select') {
+            var select = group.querySelector(args[5]);
+            results[answer.fieldId] = false;
+            for (var j = 0; j < select.options.length; j++) {
+                if (select.options[j].text.trim() === answer.value) {
+                    select.selectedIndex = j;
+                    dispatch(select);
+                    results[answer.fieldId] = true;
+                    break;
+                }
+            }
+        }
+    });
+
+    return results;
+"""
@@ -1,3 +1,4 @@
+import re
 from typing import List
 
 import config
@@ -20,6 +21,23 @@ def urlToKeywords(url: str) -> List[str]:
     return [keyword, location]
 
 
+# Every page is built from the search's own url, so a start parameter from an earlier page is never carried over
+def getSearchResultPageUrl(searchUrl: str, page: int) -> str:
+    baseUrl = re.sub(r"&start=\d*", "", searchUrl)
+    if page <= 0:
+        return baseUrl
+    return baseUrl + "&start=" + str(constants.jobsPerPage * page)
+
+
+# The search url without paging, the same search always has the same key
+def getCanonicalSearchUrl(searchUrl: str) -> str:
+    return getSearchResultPageUrl(searchUrl, 0)
+
+
+def isSortedByRecent(searchUrl: str) -> bool:
+    return "sortBy=DD" in searchUrl
+
+
 def generateSearchUrls():
     urls = []
     for location in config.location:
@@ -1,20 +1,50 @@
+from dataclasses import replace
+from enum import Enum
+from typing import Callable, List
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import Select
 
 import constants
 import config
 import models
 import repository_wrapper
+from utils.answerEngine import normalize
+from utils.applicationFormDriver import ANSWER_SECTIONS, ApplicationFormDriver, matchOption
+from utils.formFingerprintCache import FormStepResult, fingerprintForm, getFormCache
+from utils.jobDataExtractor import createJobDataExtractor
 import utils.sleeper as sleeper
 import utils.logger as logger
 from utils.logger import MessageTypes
 
 
+# Page states the bot waits for after an action instead of sleeping for a fixed time
+class PageConditions(Enum):
+    LOGGED_IN = 1
+    SEARCH_RESULTS_LOADED = 2
+    JOB_DETAIL_LOADED = 3
+    APPLICATION_MODAL_OPEN = 4
+    APPLICATION_STEP_CHANGED = 5
+    APPLICATION_SUBMITTED = 6
+    APPLICATION_MODAL_CLOSED = 7
+
+
 class WebDriverHelper:
     
     
-    def __init__(self, driver: webdriver):
+    def __init__(self, driver: webdriver, extractionBackend: str = None):
         self.driver = driver
+        self.extractor = createJobDataExtractor(driver, extractionBackend)
+        self.formDriver = ApplicationFormDriver(driver)
+        # (fingerprint, FormStepResult, fields) of the step filled in last
+        self.lastFormStep = None
+        # Lookups that found elements are memoized per (parent, by, value) until the page changes (navigation or click)
+        # Misses are not cached, since an element can still appear after typing or an asynchronous update
+        self.elementCache = {}
+        self.elementCacheHits = 0
+        self.elementCacheMisses = 0
 
 
     def checkIfLoggedIn(self):
@@ -26,7 +56,92 @@ class WebDriverHelper:
         
 
     def exists(self, parent, by, value):
-        return len(parent.find_elements(by, value)) > 0
+        return self.find(parent, by, value) is not None
+
+
+    # Returns the first matching element or None with a single find_elements call
+    def find(self, parent, by, value) -> WebElement | None:
+        elements = self.findAll(parent, by, value)
+        return elements[0] if elements else None
+
+
+    def findAll(self, parent, by, value) -> list[WebElement]:
+        parentKey = parent.id if isinstance(parent, WebElement) else None
+        cacheKey = (parentKey, by, value)
+
+        if cacheKey in self.elementCache:
+            self.elementCacheHits += 1
+            return self.elementCache[cacheKey]
+
+        self.elementCacheMisses += 1
+        elements = parent.find_elements(by, value)
+        if elements:
+            self.elementCache[cacheKey] = elements
+        return elements
+
+
+    def invalidateElementCache(self):
+        self.elementCache.clear()
+
+
+    # Every cache hit is one WebDriver round trip saved
+    def getElementCacheStats(self) -> dict:
+        lookups = self.elementCacheHits + self.elementCacheMisses
+        return {
+            "hits": self.elementCacheHits,
+            "misses": self.elementCacheMisses,
+            "hitRate": self.elementCacheHits / lookups if lookups else 0.0,
+        }
+
+
+    # Returns a check for the condition, polled by sleeper.interact
+    # Lookups bypass the element cache since the page is changing while the condition is polled
+    def getCondition(self, condition: PageConditions) -> Callable[[], bool]:
+        match condition:
+            case PageConditions.LOGGED_IN:
+                return lambda : self.__isPresent(By.CSS_SELECTOR, constants.profilePhotoCSS)
+            case PageConditions.SEARCH_RESULTS_LOADED:
+                return lambda : self.__isPresent(By.CSS_SELECTOR, constants.jobCardContainerCSS)
+            case PageConditions.JOB_DETAIL_LOADED:
+                return lambda : self.__isPresent(By.CSS_SELECTOR, constants.headerJobTitleCSS) and self.__isPresent(By.ID, constants.jobDetailsID)
+            case PageConditions.APPLICATION_MODAL_OPEN:
+                return lambda : self.__isPresent(By.XPATH, constants.jobApplicationHeaderXPATH)
+            case PageConditions.APPLICATION_STEP_CHANGED:
+                # The step changed when the progress moved, an error was shown or the modal was replaced by the submit step
+                initialStep = self.__getApplicationStepState()
+                return lambda : self.__getApplicationStepState() != initialStep or self.__isPresent(By.CSS_SELECTOR, constants.errorMessageForNecessaryFiledCSS)
+            case PageConditions.APPLICATION_SUBMITTED:
+                return lambda : self.__isPresent(By.CSS_SELECTOR, constants.dialogApplicationSubmittedCSS)
+            case PageConditions.APPLICATION_MODAL_CLOSED:
+                return lambda : not self.__isPresent(By.XPATH, constants.jobApplicationHeaderXPATH)
+
+
+    def __isPresent(self, by, value) -> bool:
+        return len(self.driver.find_elements(by, value)) > 0
+
+
+    def __getApplicationStepState(self):
+        progressElements = self.driver.find_elements(By.XPATH, constants.multiplePagePercentageXPATH)
+        progress = progressElements[0].get_attribute("value") if progressElements else None
+        return (progress, self.__isPresent(By.CSS_SELECTOR, constants.buttonSubmitApplicationCSS))
+
+
+    def __clickIfFound(self, by, selector, elementName: str, condition: PageConditions = None):
+        button = self.find(self.driver, by, selector)
+        if button is None:
+            logger.logDebugMessage(f"Could not find {elementName}", MessageTypes.WARNING)
+            return False
+
+        # The condition has to be created before the click, so it can capture the initial state of the page
+        waitCondition = self.getCondition(condition) if condition else None
+        sleeper.interact(lambda : self.clickButton(button), waitCondition)
+        return True
+
+
+    # Closes the application modal without saving the application, so the next job starts from a clean page
+    def discardApplication(self):
+        if self.__clickIfFound(By.CSS_SELECTOR, constants.buttonDismissCSS, "Dismiss button"):
+            self.__clickIfFound(By.CSS_SELECTOR, constants.buttonDiscardApplicationCSS, "Discard button", PageConditions.APPLICATION_MODAL_CLOSED)
 
 
     def isEasyApplyButtonDisplayed(self):
@@ -34,8 +149,9 @@ class WebDriverHelper:
 
 
     def clickEasyApplyButton(self):
-        button = self.driver.find_element(By.CSS_SELECTOR, constants.buttonEasyApplyCSS)
-        sleeper.interact(lambda : self.clickButton(button))
+        # Steps filled in for another job must not be marked as blocked by this one
+        self.lastFormStep = None
+        self.__clickIfFound(By.CSS_SELECTOR, constants.buttonEasyApplyCSS, "Easy Apply button", PageConditions.APPLICATION_MODAL_OPEN)
 
 
     def isApplicationPopupDisplayed(self):
@@ -53,7 +169,7 @@ class WebDriverHelper:
             sleeper.interact(lambda : self.__clickIfExists(By.CSS_SELECTOR, constants.buttonShowMoreDocumentsCSS))
 
             # Find all CV container elements
-            cv_containers = self.driver.find_elements(By.CSS_SELECTOR, constants.divWithResumeCSS)
+            cv_containers = self.findAll(self.driver, By.CSS_SELECTOR, constants.divWithResumeCSS)
 
             # Loop through the elements to find the desired CV
             for container in cv_containers:
@@ -74,8 +190,7 @@ class WebDriverHelper:
 
 
     def clickNextButton(self):
-        button = self.driver.find_element(By.CSS_SELECTOR, constants.buttonNextPageCSS)
-        sleeper.interact(lambda : self.clickButton(button))
+        self.__clickIfFound(By.CSS_SELECTOR, constants.buttonNextPageCSS, "Next button", PageConditions.APPLICATION_STEP_CHANGED)
 
 
     def isLastApplicationStepDisplayed(self):
@@ -83,11 +198,11 @@ class WebDriverHelper:
 
 
     def extract_percentage(self):
-        if not self.exists(self.driver, By.XPATH, constants.multiplePagePercentageXPATH):
+        percentageElement = self.find(self.driver, By.XPATH, constants.multiplePagePercentageXPATH)
+        if percentageElement is None:
             logger.logDebugMessage("Could not find percentage element", MessageTypes.WARNING)
             return None
 
-        percentageElement = self.driver.find_element(By.XPATH, constants.multiplePagePercentageXPATH)
         comPercentage = percentageElement.get_attribute("value")
         
         if not comPercentage or not comPercentage.replace('.', '').isdigit():
@@ -103,8 +218,7 @@ class WebDriverHelper:
     
 
     def clickReviewApplicationButton(self):
-        button = self.driver.find_element(By.CSS_SELECTOR, constants.buttonReviewApplicationCSS)
-        sleeper.interact(lambda : self.clickButton(button))
+        self.__clickIfFound(By.CSS_SELECTOR, constants.buttonReviewApplicationCSS, "Review button", PageConditions.APPLICATION_STEP_CHANGED)
 
 
     def isReviewApplicationStepDisplayed(self):
@@ -116,12 +230,14 @@ class WebDriverHelper:
 
 
     def clickSubmitApplicationButton(self):
-        button = self.driver.find_element(By.CSS_SELECTOR, constants.buttonSubmitApplicationCSS)
-        sleeper.interact(lambda : self.clickButton(button))
+        self.__clickIfFound(By.CSS_SELECTOR, constants.buttonSubmitApplicationCSS, "Submit application button", PageConditions.APPLICATION_SUBMITTED)
 
 
     def isApplicationSubmittedDialogDisplayed(self):
-        dialog = self.driver.find_element(By.CSS_SELECTOR, constants.dialogApplicationSubmittedCSS)
+        dialog = self.find(self.driver, By.CSS_SELECTOR, constants.dialogApplicationSubmittedCSS)
+        if dialog is None:
+            return False
+
         dismiss_button_present = self.exists(dialog, By.CSS_SELECTOR, constants.buttonDismissCSS)
         return dismiss_button_present
 
@@ -134,15 +250,25 @@ class WebDriverHelper:
         return self.driver.find_elements(By.CSS_SELECTOR, constants.jobCardContainerCSS)
 
 
-    def handleQuestions(self, jobProperties: models.Job):
-        if self.exists(self.driver, By.CSS_SELECTOR, constants.divWithQuestionsCSS):
-            # Locate the div that contains all the questions
-            questionsContainer = self.driver.find_element(By.CSS_SELECTOR, constants.divWithQuestionsCSS)
+    def getRawJobCardsFromSearchPage(self) -> list[dict]:
+        return self.extractor.getRawJobCards()
 
-            if self.exists(questionsContainer, By.CSS_SELECTOR, constants.divWithQuestionGroupsCSS):
-                # Find all question groups within that div
-                questionGroups = questionsContainer.find_elements(By.CSS_SELECTOR, constants.divWithQuestionGroupsCSS)
 
+    def getRawJobPageDetails(self) -> dict:
+        return self.extractor.getRawJobPageDetails()
+
+
+    # Returns the questions that block the application, only known for forms seen before with batchedFormFilling
+    def handleQuestions(self, jobProperties: models.Job) -> List[str]:
+        if constants.batchedFormFilling:
+            return self.__fillApplicationForm()
+
+        # Locate the div that contains all the questions
+        questionsContainer = self.find(self.driver, By.CSS_SELECTOR, constants.divWithQuestionsCSS)
+        if questionsContainer is not None:
+            # Find all question groups within that div
+            questionGroups = self.findAll(questionsContainer, By.CSS_SELECTOR, constants.divWithQuestionGroupsCSS)
+            if questionGroups:
                 # Iterate through each question group
                 for group in questionGroups:
                     # TODO Next commented code is to handle city selection and other dropdowns
@@ -164,9 +290,10 @@ class WebDriverHelper:
                         print("The div doesn't match either specified type")
                     """
 
-                    if self.exists(group, By.CSS_SELECTOR, constants.labelQuestionCSS):
+                    questionLabelElement = self.find(group, By.CSS_SELECTOR, constants.labelQuestionCSS)
+                    if questionLabelElement is not None:
                         # Find the label for the question within the group
-                        questionLabel = group.find_element(By.CSS_SELECTOR, constants.labelQuestionCSS).text
+                        questionLabel = questionLabelElement.text
                         
                         # Determine the type of question and call the appropriate handler
                         if self.exists(group, By.CSS_SELECTOR, constants.inputSingleLineTextCSS):
@@ -175,44 +302,201 @@ class WebDriverHelper:
                             self.__handleTextInput(group, questionLabel, By.CSS_SELECTOR, constants.inputTextAreaCSS)
                         elif self.exists(group, By.CSS_SELECTOR, constants.inputRadioCSS):
                             self.__handleRadioInput(group, questionLabel, By.CSS_SELECTOR, constants.inputRadioCSS)
+                        elif self.exists(group, By.CSS_SELECTOR, constants.selectDropdownCSS):
+                            self.__handleDropdownInput(group, questionLabel, By.CSS_SELECTOR, constants.selectDropdownCSS)
                         else:
                             self.__logUnhandledQuestion(questionLabel)
 
+        return []
+
+
+    # Reads the whole step, resolves the answers locally (or takes them from the form cache) and applies them,
+    # two round trips in total. Returns the questions that block this step, empty when it can be filled in.
+    def __fillApplicationForm(self) -> List[str]:
+        fields = self.formDriver.readFields()
+        # Steps without questions (ex: the resume or review step) all share one fingerprint, a failure there says nothing about a form
+        if not fields:
+            self.lastFormStep = None
+            return []
+
+        formCache = getFormCache()
+        fingerprint = fingerprintForm(fields)
+
+        # Someone harvesting answers may still fill in the questions the bot cannot answer, so the step is left open for them
+        abortEarly = not config.harvestAnswers
+
+        result = formCache.get(fingerprint)
+        if result is not None and result.outcome == "unknown" and abortEarly:
+            if result.remainingSkips > 0:
+                logger.logDebugMessage(f"This form failed before for an unknown reason, skipping it {result.remainingSkips} more time(s)", MessageTypes.INFO)
+                formCache.put(fingerprint, replace(result, remainingSkips = result.remainingSkips - 1))
+                return ["unknown question"]
+            result = None
+
+        if result is None:
+            result = self.__resolveAnswers(fields)
+            formCache.put(fingerprint, result)
+            sleeper.runDuringNextPause(formCache.save, "saving form cache")
+        elif result.outcome == "blocked" and abortEarly:
+            logger.logDebugMessage(f"This form was blocked before by: {', '.join(result.unansweredRequiredLabels)}", MessageTypes.INFO)
+            return result.unansweredRequiredLabels or ["unknown question"]
+        else:
+            logger.logDebugMessage("Filling in a form seen before", MessageTypes.DEBUG, fields = {"answers": len(result.answers)})
+
+        # Pre-scan: required questions that are empty and have no answer would only stop the application at the next click
+        unansweredRequiredLabels = [field.label or "unknown question" for field in fields
+            if field.required and not field.value and field.fieldId not in result.answers]
+        if unansweredRequiredLabels and constants.abortOnUnansweredRequiredQuestions and abortEarly:
+            logger.logDebugMessage(f"Required questions without an answer: {', '.join(unansweredRequiredLabels)}", MessageTypes.INFO)
+            formCache.put(fingerprint, FormStepResult(answers = result.answers, unansweredRequiredLabels = unansweredRequiredLabels, outcome = "blocked"))
+            return unansweredRequiredLabels
+
+        self.lastFormStep = (fingerprint, result, fields)
+
+        answers = {}
+        for field in fields:
+            if field.value:
+                logger.logDebugMessage(lambda : f"The input for '{field.label}' has the following value: {field.value}", MessageTypes.DEBUG)
+            elif field.fieldId in result.answers:
+                logger.logDebugMessage(f"Answering '{field.label}' with: {result.answers[field.fieldId]}", MessageTypes.INFO)
+                answers[field.fieldId] = result.answers[field.fieldId]
+            elif field.label and field.inputType is not None and config.displayWarnings:
+                logger.logDebugMessage(f"The input for '{field.label}' is empty.", MessageTypes.WARNING)
+
+        if answers:
+            results = sleeper.interact(lambda : self.formDriver.applyAnswers(fields, answers))
+            # The page changed under any element looked up before
+            self.invalidateElementCache()
+            for field in fields:
+                if field.fieldId in answers and not (results or {}).get(field.fieldId):
+                    logger.logDebugMessage(f"Could not fill in the answer for '{field.label}'", MessageTypes.WARNING)
+
+        return []
+
+
+    # Answers every question of the step that has one, whether or not the question is filled in already,
+    # so the result can be used for the next job with the same questions
+    def __resolveAnswers(self, fields: List[models.FormField]) -> FormStepResult:
+        result = FormStepResult()
+
+        for field in fields:
+            if not field.label or field.inputType is None:
+                self.__logUnhandledQuestion(field.label)
+                continue
+
+            answer = repository_wrapper.get_answer_by_question(field.label, ANSWER_SECTIONS[field.inputType])
+            if answer is not None and field.options:
+                option = matchOption(field.options, answer)
+                if option is None:
+                    logger.logDebugMessage(f"No option of '{field.label}' matches the answer: {answer}", MessageTypes.WARNING)
+                answer = option
+
+            if answer is not None:
+                result.answers[field.fieldId] = answer
+            else:
+                repository_wrapper.post_question(field.label, None, ANSWER_SECTIONS[field.inputType])
+                if field.required and not field.value:
+                    result.unansweredRequiredLabels.append(field.label)
+
+        return result
+
+
+    # Saves the values of the current step the bot did not fill in itself (typed by hand or pre-filled by Linkedin),
+    # called before leaving the step so the same questions are answered from then on
+    def harvestAnswers(self):
+        if not config.harvestAnswers or not constants.batchedFormFilling:
+            return
+
+        appliedAnswers = self.lastFormStep[1].answers if self.lastFormStep is not None else {}
+        newAnswers = []
+        for field in self.formDriver.readFields():
+            if not field.label or field.inputType is None or not field.value or appliedAnswers.get(field.fieldId) == field.value:
+                continue
+            if repository_wrapper.post_question(field.label, field.value, ANSWER_SECTIONS[field.inputType]):
+                newAnswers.append(field.label)
+
+        if newAnswers:
+            logger.logDebugMessage(f"Saved {len(newAnswers)} new answer(s)", MessageTypes.INFO, fields = {"questions": newAnswers})
+            # Cached steps were resolved without these answers
+            getFormCache().invalidate()
+
+
+    # Called when Linkedin still asks for answers after the last filled in step, the same form is not filled in again
+    # while the answers stay the same, or only for a few times when no required question was left empty
+    def markLastFormStepBlocked(self):
+        if self.lastFormStep is None:
+            return
+
+        fingerprint, result, fields = self.lastFormStep
+        blockingLabels = result.unansweredRequiredLabels or \
+            [field.label for field in fields if field.required and field.label and not field.value and field.fieldId not in result.answers]
+        formCache = getFormCache()
+        if blockingLabels:
+            formCache.put(fingerprint, FormStepResult(answers = result.answers, unansweredRequiredLabels = blockingLabels, outcome = "blocked"))
+        else:
+            formCache.put(fingerprint, FormStepResult(answers = result.answers, outcome = "unknown", remainingSkips = constants.formCacheUnknownFailureSkips))
+        sleeper.runDuringNextPause(formCache.save, "saving form cache")
+        self.lastFormStep = None
+
 
     def __handleTextInput(self, group, questionLabel, by, value):
         # Locate the input element  
-        inputElement = group.find_element(by, value)
+        inputElement = self.find(group, by, value)
 
         # Retrieve the value of the input element
         inputValue = inputElement.get_attribute('value')
 
         # Check if the input element is empty
         if inputValue == '':
-            # TODO Check the backend for answers
-
-            # TODO If there is an answer for this question, fill it in
-            # If you want to fill the input
-            # question_input.send_keys("Your answer here") then sleep
+            answer = repository_wrapper.get_answer_by_question(questionLabel, "inputField")
+            if answer is not None:
+                logger.logDebugMessage(f"Answering '{questionLabel}' with: {answer}", MessageTypes.INFO)
+                sleeper.interact(lambda : inputElement.send_keys(answer))
             # If no answers are found, move to the next step (backend should handle saving unanswered questions)
-            if config.displayWarnings:
+            elif config.displayWarnings:
                 logger.logDebugMessage(f"The input for '{questionLabel}' is empty.", MessageTypes.WARNING)
         else:
-            # TODO Save answers to the backend if they are not already saved
+            if config.harvestAnswers:
+                repository_wrapper.post_question(questionLabel, inputValue, "inputField")
             if config.displayWarnings:
                 logger.logDebugMessage(f"The input for '{questionLabel}' has the following value: {inputValue}", MessageTypes.WARNING)
 
 
     def __handleRadioInput(self, group, questionLabel, by, value):
         # Check if it's a radio selector question
-        radioInputs = group.find_elements(by, value)
+        radioInputs = self.findAll(group, by, value)
+        if any(radioInput.is_selected() for radioInput in radioInputs):
+            return
+
+        answer = repository_wrapper.get_answer_by_question(questionLabel, "radio")
+        if answer is None:
+            self.__logUnhandledQuestion(questionLabel)
+            return
+
         for radioInput in radioInputs:
             # Retrieve the associated label
             label = radioInput.find_element(By.XPATH, constants.labelRadioXPATH).text
-            # TODO Check the backend for answers. If there is an answer for this question, fill it in
-            # Check or uncheck based on some condition
-            # if "desired option" in label:
-            #     logger.logDebugMessage(f"Selecting option: {label}", MessageTypes.WARNING)
-            #     radio_input.click()  # Select the radio button if it's the desired option then sleep
+            if normalize(label) == normalize(answer):
+                logger.logDebugMessage(f"Selecting option '{label}' for '{questionLabel}'", MessageTypes.INFO)
+                sleeper.interact(lambda : self.clickButton(radioInput))
+                return
+
+        logger.logDebugMessage(f"No option of '{questionLabel}' matches the answer: {answer}", MessageTypes.WARNING)
+
+
+    def __handleDropdownInput(self, group, questionLabel, by, value):
+        dropdown = Select(self.find(group, by, value))
+        answer = repository_wrapper.get_answer_by_question(questionLabel, "dropdown")
+        if answer is None:
+            self.__logUnhandledQuestion(questionLabel)
+            return
+
+        option = matchOption([option.text for option in dropdown.options], answer)
+        if option is not None:
+            logger.logDebugMessage(f"Selecting option '{option}' for '{questionLabel}'", MessageTypes.INFO)
+            sleeper.interact(lambda : dropdown.select_by_visible_text(option))
+        else:
+            logger.logDebugMessage(f"No option of '{questionLabel}' matches the answer: {answer}", MessageTypes.WARNING)
 
 
     def __logUnhandledQuestion(self, questionLabel):
@@ -221,12 +505,14 @@ class WebDriverHelper:
 
 
     def __clickIfExists(self, by, selector):
-        if self.exists(self.driver, by, selector):
-            clickableElement = self.driver.find_element(by, selector)
+        clickableElement = self.find(self.driver, by, selector)
+        if clickableElement is not None:
             self.clickButton(clickableElement)
 
 
     def clickButton(self, button):
+        # A click can open, change or close the application modal, so cached lookups are no longer valid
+        self.invalidateElementCache()
         try:
             button.click()
         except Exception as e:
@@ -1,43 +1,191 @@
-import config
-import utils.utils as utils
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
 import traceback
 from enum import Enum
 
+import config
+import constants
+
 
 class MessageTypes(Enum):
     INFO = 1
     WARNING = 2
     ERROR = 3
     SUCCESS = 4
+    DEBUG = 5
+
+
+__levels = {
+    MessageTypes.DEBUG: logging.DEBUG,
+    MessageTypes.INFO: logging.INFO,
+    MessageTypes.SUCCESS: logging.INFO + 5,
+    MessageTypes.WARNING: logging.WARNING,
+    MessageTypes.ERROR: logging.ERROR,
+}
+
+
+# Messages are only built when they will be written by at least one sink and pass sampling,
+# so pass a callable (ex: lambda : f"... {job}") when building the message is expensive.
+# The sinks run on a background thread, the caller only puts the record on a queue.
+def logDebugMessage(message, messageType = MessageTypes.INFO, exception = Exception(), displayTraceback = False, fields: dict = None):
+    level = __levels[messageType]
+    if not __isEnabled(level) or not __isSampled(messageType):
+        return
+
+    if callable(message):
+        message = message()
+
+    extra = {
+        "messageType": messageType,
+        "exceptionText": str(exception),
+        "fields": {key: __truncate(value, constants.logFieldMaxLength) for key, value in (fields or {}).items()},
+    }
+    exceptionInfo = (type(exception), exception, exception.__traceback__) if displayTraceback else None
+
+    __logger.log(level, __truncate(message, constants.logMessageMaxLength), extra = extra, exc_info = exceptionInfo)
+
+
+# Blocks until every queued message is written, ex: before the process exits
+def flush():
+    __listener.stop()
+    __listener.start()
+
+
+def __isEnabled(level: int) -> bool:
+    consoleEnabled = config.displayWarnings and level >= __levels[MessageTypes[constants.consoleLogLevel]]
+    fileEnabled = constants.logFilePath and level >= __levels[MessageTypes[constants.fileLogLevel]]
+    return bool(consoleEnabled or fileEnabled)
+
+
+# A sample rate of 0.1 keeps every 10th message of that type
+def __isSampled(messageType: MessageTypes) -> bool:
+    sampleRate = constants.logSampleRates.get(messageType.name, 1.0)
+    if sampleRate >= 1:
+        return True
+    if sampleRate <= 0:
+        return False
+
+    __sampleCounters[messageType] = __sampleCounters.get(messageType, 0) + 1
+    return __sampleCounters[messageType] % round(1 / sampleRate) == 0
+
+
+def __truncate(value, maxLength: int) -> str:
+    text = str(value)
+    return text if len(text) <= maxLength else text[0:maxLength] + "…"
+
+
+class ConsoleFormatter(logging.Formatter):
 
 
-def logDebugMessage(message, messageType = MessageTypes.INFO, exception = Exception(), displayTraceback = False):
-    if (config.displayWarnings):
-        match messageType:
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.fields:
+            message += " | " + ", ".join(f"{key}={value}" for key, value in record.fields.items())
+
+        match record.messageType:
+            case MessageTypes.DEBUG:
+                text = f"\033[90m🔎 {message}\033[00m"
             case MessageTypes.INFO:
-                __prBlue(f"ℹ️ {message}")
+                text = f"\033[94mℹ️ {message}\033[00m"
             case MessageTypes.WARNING:
-                __prYellow(f"⚠️ Warning ⚠️ {message}: {str(exception)[0:100]}")
+                text = f"\033[93m⚠️ Warning ⚠️ {message}: {record.exceptionText[0:100]}\033[00m"
             case MessageTypes.ERROR:
-                __prRed(f"❌ Error ❌ {message}: {str(exception)[0:200]}")
+                text = f"\033[91m❌ Error ❌ {message}: {record.exceptionText[0:200]}\033[00m"
             case MessageTypes.SUCCESS:
-                __prGreen(f"✅ {message}")
+                text = f"\033[92m✅ {message}\033[00m"
+
+        if record.exc_text:
+            text += "\n" + record.exc_text
+
+        return text
+
+
+class JsonLinesFormatter(logging.Formatter):
+
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)),
+            "type": record.messageType.name,
+            "message": record.getMessage(),
+        }
+        if record.exceptionText:
+            entry["exception"] = record.exceptionText[0:constants.logFieldMaxLength]
+        if record.fields:
+            entry["fields"] = record.fields
+        if record.exc_text:
+            entry["traceback"] = record.exc_text
+
+        return json.dumps(entry, ensure_ascii=False)
+
+
+# Formats the traceback while the exception is still available, the record itself is formatted by the sinks
+class TracebackQueueHandler(logging.handlers.QueueHandler):
+
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+
+
+# Opens the rotating file at constants.logFilePath on the first record it writes,
+# so importing the logger does not create a file and a path configured after import is respected
+class LazyFileHandler(logging.Handler):
+
+
+    def __init__(self, levels: dict):
+        super().__init__()
+        self.levels = levels
+        self.path = None
+        self.fileHandler = None
+
+
+    def emit(self, record: logging.LogRecord):
+        if not constants.logFilePath or record.levelno < self.levels[MessageTypes[constants.fileLogLevel]]:
+            return
+
+        if self.fileHandler is None or self.path != constants.logFilePath:
+            self.close()
+            self.path = constants.logFilePath
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.fileHandler = logging.handlers.RotatingFileHandler(self.path, maxBytes = constants.logFileMaxBytes,
+                backupCount = constants.logFileBackupCount, encoding = "utf-8", delay = True)
+            self.fileHandler.setFormatter(JsonLinesFormatter())
+
+        self.fileHandler.emit(record)
 
-        if (displayTraceback):
-            traceback.print_exc()
 
+    def close(self):
+        if self.fileHandler is not None:
+            self.fileHandler.close()
+            self.fileHandler = None
+        super().close()
 
-def __prRed(prt):
-    print(f"\033[91m{prt}\033[00m")
 
+def __createListener(messages: queue.SimpleQueue) -> logging.handlers.QueueListener:
+    consoleHandler = logging.StreamHandler(sys.stdout)
+    consoleHandler.setLevel(__levels[MessageTypes[constants.consoleLogLevel]] if config.displayWarnings else logging.CRITICAL + 1)
+    consoleHandler.setFormatter(ConsoleFormatter())
 
-def __prGreen(prt):
-    print(f"\033[92m{prt}\033[00m")
+    return logging.handlers.QueueListener(messages, consoleHandler, LazyFileHandler(__levels), respect_handler_level = True)
 
 
-def __prYellow(prt):
-    print(f"\033[93m{prt}\033[00m")
+__sampleCounters = {}
+__messages = queue.SimpleQueue()
 
+__logger = logging.getLogger("EasyApplyJobsBot")
+__logger.setLevel(logging.DEBUG)
+__logger.propagate = False
+__logger.addHandler(TracebackQueueHandler(__messages))
 
-def __prBlue(prt):
-    print(f"\033[94m{prt}\033[00m")
+__listener = __createListener(__messages)
+__listener.start()
+atexit.register(__listener.stop)
@@ -0,0 +1,112 @@
+import atexit
+import json
+import os
+import time
+from typing import List, Optional
+
+
+HEADER_COLUMNS = "---- Number | Job Title | Company | Location | Work Place | Posted Date | Applications | Result "
+
+
+# Append-only daily results journal
+# - "Applied Jobs DATA - YYYYMMDD.jsonl" gets one structured record per result. The file stays open and is flushed
+#   and fsynced at most every fsyncInterval seconds, so writing a result costs the same no matter how many results
+#   the day already has
+# - "Applied Jobs DATA - YYYYMMDD.txt", the human readable table, is only rendered from it on demand (see writeTable)
+class ResultsJournal:
+
+
+    def __init__(self, directory: str = "data", fsyncInterval: float = 5):
+        self.directory = directory
+        self.fsyncInterval = fsyncInterval
+        self.day = None
+        self.jsonFile = None
+        self.lastSync = 0.0
+        # Days this journal appended results to
+        self.days = []
+        atexit.register(self.close)
+
+
+    def append(self, line: str, record: Optional[dict] = None):
+        self.__openFilesForToday()
+
+        record = dict(record or {})
+        record.setdefault("time", time.strftime("%Y-%m-%dT%H:%M:%S"))
+        record["line"] = line
+
+        self.jsonFile.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        if time.monotonic() - self.lastSync >= self.fsyncInterval:
+            self.sync()
+
+
+    def sync(self):
+        if self.jsonFile is not None:
+            self.jsonFile.flush()
+            os.fsync(self.jsonFile.fileno())
+        self.lastSync = time.monotonic()
+
+
+    def close(self):
+        self.sync()
+        if self.jsonFile is not None:
+            self.jsonFile.close()
+        self.jsonFile = None
+        self.day = None
+
+
+    def getDays(self) -> List[str]:
+        return list(self.days)
+
+
+    def getFilePath(self, day: str, extension: str) -> str:
+        return os.path.join(self.directory, "Applied Jobs DATA - " + day + extension)
+
+
+    # Renders the human readable table of a day from the structured journal
+    def renderTable(self, day: Optional[str] = None) -> str:
+        day = day or time.strftime("%Y%m%d")
+        if day == self.day:
+            self.sync()
+
+        lines = [self.__getHeader(day)]
+        jsonPath = self.getFilePath(day, ".jsonl")
+        if os.path.exists(jsonPath):
+            with open(jsonPath, encoding="utf-8") as file:
+                for recordLine in file:
+                    if recordLine.strip():
+                        lines.append(json.loads(recordLine)["line"])
+
+        return "\n".join(lines) + "\n"
+
+
+    # Writes the table of a day to its text file, replacing the one written before, and returns the path
+    def writeTable(self, day: Optional[str] = None) -> str:
+        day = day or time.strftime("%Y%m%d")
+        table = self.renderTable(day)
+
+        os.makedirs(self.directory, exist_ok=True)
+        textPath = self.getFilePath(day, ".txt")
+        temporaryPath = textPath + ".tmp"
+        with open(temporaryPath, "w", encoding="utf-8") as file:
+            file.write(table)
+        os.replace(temporaryPath, textPath)
+        return textPath
+
+
+    def __openFilesForToday(self):
+        day = time.strftime("%Y%m%d")
+        if day == self.day:
+            return
+
+        self.close()
+        os.makedirs(self.directory, exist_ok=True)  # Ensure the 'data' directory exists.
+
+        self.jsonFile = open(self.getFilePath(day, ".jsonl"), "a", encoding="utf-8")
+        self.day = day
+        if day not in self.days:
+            self.days.append(day)
+
+
+    def __getHeader(self, day: str) -> str:
+        return "---- Applied Jobs Data ---- created at: " + day + "\n" + HEADER_COLUMNS
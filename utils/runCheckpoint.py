@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Callable, Optional
+
+import models
+import utils.logger as logger
+from utils.jobQueue import JobQueue
+from utils.logger import MessageTypes
+
+
+HARVEST_PHASE = "harvest"
+APPLY_PHASE = "apply"
+
+
+# Where a run is. In the harvest phase: the search (index into urlHelper.generateSearchUrls) and its search result
+# page with the number of times it was started, and the newest job id of the search so far. In the apply phase: the jobs still queued and the job being
+# processed with the number of times it was started, so a job interrupted by a stop is not lost behind the watermarks.
+# The queue is a snapshot taken every few jobs, the jobs taken from it since are listed in takenJobIds.
+# The counters of the run and the newest job of every harvested search are kept in both phases.
+@dataclass
+class RunCursor:
+    phase: str = HARVEST_PHASE
+    searchIndex: int = 0
+    page: int = 0
+    pageAttempts: int = 0
+    newestJobId: Optional[int] = None
+    searchWatermarks: dict = field(default_factory=dict)
+    jobQueue: dict = field(default_factory=dict)
+    takenJobIds: list = field(default_factory=list)
+    currentJob: dict = field(default_factory=dict)
+    counters: dict = field(default_factory=dict)
+    updatedAt: float = 0.0
+
+
+    def getJobCounter(self) -> models.JobCounter:
+        knownCounters = {counter.name for counter in fields(models.JobCounter)}
+        return models.JobCounter(**{name: value for name, value in self.counters.items() if name in knownCounters})
+
+
+    def setJobCounter(self, jobCounter: models.JobCounter):
+        self.counters = asdict(jobCounter)
+
+
+    def getJobQueue(self, priority: Callable[[models.JobForVerification], float] = None) -> JobQueue:
+        takenJobIds = set(self.takenJobIds)
+        jobs = [models.JobForVerification(**job) for job in self.jobQueue.get("jobs", []) if job["linkedinJobId"] not in takenJobIds]
+        return JobQueue(jobs, self.jobQueue.get("seenJobIds", []), priority)
+
+
+    # Takes a new snapshot of the queue, O(n log n) so it is not done for every job taken
+    def setJobQueue(self, jobQueue: JobQueue):
+        self.jobQueue = jobQueue.toDict()
+        self.takenJobIds = []
+
+
+    def getQueuedJobCount(self) -> int:
+        return len(self.jobQueue.get("jobs", [])) - len(self.takenJobIds)
+
+
+    def getCurrentJob(self) -> Optional[models.JobForVerification]:
+        return models.JobForVerification(**self.currentJob["job"]) if self.currentJob else None
+
+
+    def getCurrentJobAttempts(self) -> int:
+        return self.currentJob.get("attempts", 0)
+
+
+    # Without a job nothing is being processed
+    def setCurrentJob(self, job: Optional[models.JobForVerification], attempts: int = 1):
+        self.currentJob = {"job": asdict(job), "attempts": attempts} if job is not None else {}
+
+
+# Identifies the config the run was started with, ex: the content of config.py
+def getConfigHash(configPath: str) -> str:
+    with open(configPath, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+# Saves the cursor of the run started with one config, so a crashed or stopped run is resumed
+# instead of starting again from the first search. Every config has its own files in the directory:
+# the cursor, saved after every job, and the queue snapshot, only written when the cursor has a new one.
+class RunCheckpoint:
+
+
+    def __init__(self, directory: str, configHash: str):
+        self.path = os.path.join(directory, configHash[0:16] + ".json") if directory else None
+        self.queuePath = os.path.join(directory, configHash[0:16] + ".queue.json") if directory else None
+        self.configHash = configHash
+        self.savedJobQueue = None
+
+
+    def load(self) -> Optional[RunCursor]:
+        if not self.path:
+            return None
+
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                content = json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.logDebugMessage("Could not read the run checkpoint, starting from the first search", MessageTypes.WARNING, e)
+            return None
+
+        if content.get("configHash") != self.configHash:
+            return None
+
+        # Checkpoints written by an older version may have other fields
+        knownFields = {cursorField.name for cursorField in fields(RunCursor)}
+        cursor = RunCursor(**{name: value for name, value in content["cursor"].items() if name in knownFields})
+        # Older checkpoints kept the queue in the cursor
+        if "jobQueue" not in content["cursor"]:
+            cursor.jobQueue = self.__loadJobQueue()
+        self.savedJobQueue = cursor.jobQueue
+        return cursor
+
+
+    def save(self, cursor: RunCursor):
+        if not self.path:
+            return
+
+        cursor.updatedAt = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Written before the cursor, which lists the jobs taken from this snapshot
+            if cursor.jobQueue is not self.savedJobQueue:
+                self.__write(self.queuePath, cursor.jobQueue)
+                self.savedJobQueue = cursor.jobQueue
+
+            cursorFields = {cursorField.name: getattr(cursor, cursorField.name) for cursorField in fields(RunCursor) if cursorField.name != "jobQueue"}
+            self.__write(self.path, {"configHash": self.configHash, "cursor": cursorFields})
+        except Exception as e:
+            logger.logDebugMessage("Could not save the run checkpoint", MessageTypes.WARNING, e)
+
+
+    # Called when the run went through all its searches, the next run starts from the first one
+    def clear(self):
+        for path in [self.path, self.queuePath]:
+            if path and os.path.exists(path):
+                os.remove(path)
+        self.savedJobQueue = None
+
+
+    def __loadJobQueue(self) -> dict:
+        try:
+            with open(self.queuePath, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.logDebugMessage("Could not read the queued jobs of the run checkpoint", MessageTypes.WARNING, e)
+            return {}
+
+
+    # Written to a temporary file and renamed, so a crash never leaves a partial file
+    def __write(self, path: str, content: dict):
+        temporaryPath = path + ".tmp"
+        with open(temporaryPath, "w", encoding="utf-8") as file:
+            json.dump(content, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporaryPath, path)
@@ -1,17 +1,105 @@
 import time
 import random
+from collections import deque
+from typing import Callable
 import constants
+import utils.logger as logger
+from utils.logger import MessageTypes
 
 
-def interact(action):
-    action()
-    __sleepInBetweenActions()
+# Work that doesn't need the browser (backend calls, writing results, ...) is queued here
+# and executed inside the next pause instead of blocking the bot in between pauses
+__pendingTasks = deque()
+__pauseStats = {"pauses": 0, "pausedSeconds": 0.0, "usedSeconds": 0.0, "tasks": 0}
+
+
+# Runs the action and waits until the page is ready for the next one
+# Without a condition the bot sleeps for the whole random pause in between actions
+# With a condition it continues as soon as the condition is met, but never sooner than the minimum pacing floor
+# Returns what the action returned
+def interact(action, condition: Callable[[], bool] = None):
+    result = action()
+    if condition is None:
+        __sleepInBetweenActions()
+    else:
+        waitUntil(condition)
+    return result
+
+
+def waitUntil(condition: Callable[[], bool], timeout: float = constants.botWaitForConditionTimeout, bottom: float = constants.botMinimumPacingBottom, top: float = constants.botMinimumPacingTop) -> bool:
+    start = time.monotonic()
+    pacingFloor = random.uniform(bottom, top)
+
+    conditionMet = __isConditionMet(condition)
+    while not conditionMet and time.monotonic() - start < timeout:
+        time.sleep(constants.botConditionPollInterval)
+        conditionMet = __isConditionMet(condition)
+
+    remainingPacing = pacingFloor - (time.monotonic() - start)
+    if remainingPacing > 0:
+        __pause(remainingPacing)
+
+    return conditionMet
+
+
+def __isConditionMet(condition: Callable[[], bool]) -> bool:
+    try:
+        return bool(condition())
+    except Exception:
+        # The page might be in the middle of rendering, try again on the next poll
+        return False
 
 
 def __sleepInBetweenActions(bottom: int = constants.botSleepInBetweenActionsBottom, top: int = constants.botSleepInBetweenActionsTop):
-    time.sleep(random.uniform(bottom, top))
+    __pause(random.uniform(bottom, top))
 
 
 def sleepInBetweenBatches(currentBatch: int, bottom: int = constants.botSleepInBetweenBatchesBottom, top: int = constants.botSleepInBetweenBatchesTop):
     if (currentBatch % constants.batchSize == 0):
-        time.sleep(random.uniform(bottom, top))
\ No newline at end of file
+        __pause(random.uniform(bottom, top))
+
+
+def runDuringNextPause(task: Callable[[], None], taskName: str = "background task"):
+    __pendingTasks.append((taskName, task))
+
+
+# Runs whatever is still queued, used when the bot stops and there is no next pause
+def runPendingTasks():
+    while __pendingTasks:
+        __runTask(*__pendingTasks.popleft())
+
+
+def getPauseStats() -> dict:
+    return dict(__pauseStats)
+
+
+# Sleeps for exactly the given time, running queued tasks first while there is time left in the pause
+# A task is never interrupted, so a long task can extend the pause but never shorten it
+def __pause(seconds: float):
+    start = time.monotonic()
+    deadline = start + seconds
+    tasksRun = 0
+
+    while __pendingTasks and time.monotonic() < deadline:
+        __runTask(*__pendingTasks.popleft())
+        tasksRun += 1
+
+    usedSeconds = time.monotonic() - start
+    remainingSeconds = deadline - time.monotonic()
+    if remainingSeconds > 0:
+        time.sleep(remainingSeconds)
+
+    __pauseStats["pauses"] += 1
+    __pauseStats["pausedSeconds"] += max(seconds, usedSeconds)
+    __pauseStats["usedSeconds"] += usedSeconds
+    __pauseStats["tasks"] += tasksRun
+
+    if tasksRun > 0:
+        logger.logDebugMessage(f"Used {usedSeconds:.2f}s of {seconds:.2f}s pause for {tasksRun} background task(s)", MessageTypes.INFO)
+
+
+def __runTask(taskName: str, task: Callable[[], None]):
+    try:
+        task()
+    except Exception as e:
+        logger.logDebugMessage(f"Error in {taskName}", MessageTypes.ERROR, e)
@@ -0,0 +1,120 @@
+from typing import Optional
+import re
+
+import lxml.html
+
+import constants
+from utils.jobDataExtractor import JobDataExtractor
+
+
+# Elements after which the browser's innerText starts a new line
+BLOCK_TAGS = {"address", "article", "br", "dd", "div", "dl", "dt", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "footer", "hr", "li", "ol", "p", "pre", "section", "table", "tr", "ul"}
+IGNORED_TAGS = {"script", "style", "template", "noscript"}
+
+
+# Runs the lookups locally with lxml over a single page_source snapshot
+# Without a driver it works on the html passed to loadSnapshot, which allows testing the extraction without a browser
+class SnapshotJobDataExtractor(JobDataExtractor):
+
+
+    def __init__(self, driver = None):
+        self.driver = driver
+        self.html = None
+
+
+    def loadSnapshot(self, html: str):
+        self.html = html
+
+
+    def getRawJobCards(self) -> list[dict]:
+        document = self.__getDocument()
+        jobCards = []
+
+        for card in document.cssselect(constants.jobCardContainerCSS):
+            titleLink = self.__findByCss(card, constants.jobCardTitleLinkCSS)
+            companyName = self.__findByCss(card, constants.jobCardCompanyNameCSS)
+
+            workplaceType = None
+            description = self.__findByCss(card, constants.jobCardDescriptionCSS)
+            if description is not None:
+                workplaceType = self.__textOrNone(self.__findByCss(description, constants.spanCSS))
+
+            jobCards.append({
+                "id": card.get(constants.jobCardIdAttribute),
+                "applied": len(card.xpath(constants.appliedTextXPATH)) > 0,
+                "title": titleLink.get("aria-label") if titleLink is not None else None,
+                "company": self.__textOrNone(companyName),
+                "workplaceType": workplaceType,
+                "footer": [innerText(footerItem) for footerItem in card.cssselect(constants.jobCardFooterItemCSS)],
+            })
+
+        return jobCards
+
+
+    def getRawJobPageDetails(self) -> dict:
+        document = self.__getDocument()
+
+        details = {
+            "title": self.__textOrNone(self.__findByCss(document, constants.headerJobTitleCSS)),
+            "company": self.__textOrNone(self.__findByXPath(document, constants.divWithJobCompanyXPATH)),
+            "workplaceType": self.__textOrNone(self.__findByXPath(document, constants.jobWorkplaceTypeXPATH)),
+            "description": self.__textOrNone(self.__findByXPath(document, f"//*[@id='{constants.jobDetailsID}']")),
+            "primaryDescription": None,
+            "location": None,
+            "primaryDescriptionSpans": None,
+        }
+
+        primaryDescription = self.__findByXPath(document, constants.divWithJobPagePrimaryDescriptionXPATH)
+        if primaryDescription is not None:
+            details["primaryDescription"] = innerText(primaryDescription)
+            details["location"] = self.__textOrNone(self.__findByXPath(primaryDescription, constants.jobLocationXPATH))
+            details["primaryDescriptionSpans"] = [innerText(span) for span in primaryDescription.xpath(constants.numberOfApplicantsSpanXPATH)]
+
+        return details
+
+
+    def __getDocument(self):
+        if self.driver is not None:
+            self.html = self.driver.page_source
+
+        return lxml.html.fromstring(self.html or "<html></html>")
+
+
+    def __findByCss(self, parent, selector):
+        elements = parent.cssselect(selector)
+        return elements[0] if elements else None
+
+
+    def __findByXPath(self, parent, xpath):
+        elements = parent.xpath(xpath)
+        return elements[0] if elements else None
+
+
+    def __textOrNone(self, element) -> Optional[str]:
+        return innerText(element) if element is not None else None
+
+
+# Approximates the browser's innerText: text of block elements on separate lines, whitespace collapsed
+def innerText(element) -> str:
+    parts = []
+    __collectText(element, parts)
+    lines = [re.sub(r"\s+", " ", line).strip() for line in "".join(parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def __collectText(element, parts: list):
+    tag = element.tag if isinstance(element.tag, str) else ""
+
+    if tag not in IGNORED_TAGS:
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            __collectText(child, parts)
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+
+    if element.tail:
+        parts.append(element.tail)
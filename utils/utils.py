@@ -1,6 +1,7 @@
 import math
 import os
 import re
+from typing import List, Optional
 from selenium import webdriver
 
 import config
@@ -50,6 +51,20 @@ def jobsToPages(numOfJobs: str) -> int:
   return number_of_pages
 
 
+# Linkedin job ids grow over time, so on a search sorted by date a smaller id is an older job
+def jobIdToNumber(jobId: str) -> Optional[int]:
+    return int(jobId) if jobId and jobId.isdigit() else None
+
+
+# A page sorted by date has reached the watermark when most of its jobs were seen in an earlier run.
+# Reposted or promoted jobs keep their older ids wherever they are shown, so a few of them do not end the search.
+def reachedJobIdWatermark(jobIds: List[str], watermark: int) -> bool:
+    jobNumbers = [jobIdToNumber(jobId) for jobId in jobIds]
+    jobNumbers = [jobNumber for jobNumber in jobNumbers if jobNumber is not None]
+    seenJobs = sum(1 for jobNumber in jobNumbers if jobNumber <= watermark)
+    return seenJobs * 2 > len(jobNumbers)
+
+
 def extractTextWithinParentheses(text):
     # Pattern to match text within parentheses
     pattern = r"\((.*?)\)"
@@ -62,6 +77,31 @@ def extractTextWithinParentheses(text):
         return ""
 
 
+def extractPostedDate(text: str) -> str:
+    # Regex pattern to find patterns like '6 hours ago', '2 days ago', etc.
+    match = re.search(r'\b\d+\s+(seconds?|minutes?|hours?|days?|weeks?|months?)\s+ago\b', text)
+    if match:
+        return match.group(0)  # The whole matched text is the date
+    
+    return ""
+
+
+def extractNumberOfApplicants(spanTexts: List[str]) -> str:
+    # Loop through all spans in reverse order because the number of applicants is usually the last one
+    for spanText in reversed(spanTexts):
+        spanText = spanText.strip()
+        # Check if the text contains the keyword 'appl' (from 'applicants' or 'applications') and a number 
+        if 'appl' in spanText.lower() and any(char.isdigit() for char in spanText):
+            return spanText
+
+    return ""
+
+
+# The footer of a job card shows ex: "25 applicants", "Over 100 applicants" or "Be an early applicant"
+def extractJobCardApplicants(footerTexts: List[str]) -> str:
+    return next((text.strip() for text in footerTexts if "applicant" in text.lower()), "")
+
+
 def getFirstStringBeforeSeparators(text: str, separators=['·', '(', '-', '|']) -> str:
     if not text:
         return ""